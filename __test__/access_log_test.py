@@ -0,0 +1,60 @@
+import pytest
+from starlette.requests import Request
+
+from app.config import Settings
+from app.main import _request_headers, _should_log_request
+
+
+def _settings(**values: str) -> Settings:
+    return Settings.model_validate(values)
+
+
+def _request(headers: dict[str, str]) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/todos",
+            "headers": [
+                (name.encode(), value.encode()) for name, value in headers.items()
+            ],
+        }
+    )
+
+
+def test_requests_are_logged_by_default():
+    assert _should_log_request(_settings(), 200, 1.0)
+
+
+def test_sampled_out_requests_are_skipped():
+    settings = _settings(ACCESS_LOG_SAMPLE_RATE="0")
+
+    assert not _should_log_request(settings, 200, 1.0)
+
+
+@pytest.mark.parametrize(
+    ("status_code", "duration_ms"),
+    [(500, 1.0), (200, 250.0)],
+)
+def test_errors_and_slow_requests_bypass_sampling(status_code: int, duration_ms: float):
+    settings = _settings(ACCESS_LOG_SAMPLE_RATE="0", ACCESS_LOG_SLOW_MS="250")
+
+    assert _should_log_request(settings, status_code, duration_ms)
+
+
+def test_errors_can_be_sampled_too():
+    settings = _settings(ACCESS_LOG_SAMPLE_RATE="0", ACCESS_LOG_ERRORS="false")
+
+    assert not _should_log_request(settings, 500, 1.0)
+
+
+def test_headers_are_filtered_by_allow_list():
+    request = _request({"user-agent": "test", "authorization": "secret"})
+
+    assert _request_headers(_settings(), request) == {
+        "user-agent": "test",
+        "authorization": "secret",
+    }
+    assert _request_headers(
+        _settings(ACCESS_LOG_HEADERS="User-Agent, X-Request-Id"), request
+    ) == {"user-agent": "test"}
@@ -0,0 +1,113 @@
+import logging
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from app.logger import RedisStreamHandler
+
+
+def _record(msg: str) -> logging.LogRecord:
+    return logging.LogRecord("app", logging.INFO, __file__, 1, msg, None, None)
+
+
+class StalledSender:
+    """Stands in for `_send`, holding up the worker until released"""
+
+    def __init__(self) -> None:
+        self.sending = threading.Event()
+        self.release = threading.Event()
+        self.sent: list[str] = []
+
+    def __call__(self, batch: list[dict[str, str]]) -> None:
+        self.sending.set()
+        self.release.wait(5)
+        self.sent.extend(payload["msg"] for payload in batch)
+
+
+@pytest.fixture
+def sender() -> Iterator[StalledSender]:
+    sender = StalledSender()
+    yield sender
+    sender.release.set()
+
+
+def _full_handler(sender: StalledSender, **kwargs) -> RedisStreamHandler:
+    handler = RedisStreamHandler(queue_size=1, batch_size=1, **kwargs)
+    # The worker looks `_send` up per batch and sends nothing before an emit.
+    handler._send = sender  # type: ignore[method-assign]
+    handler.emit(_record("sending"))
+    assert sender.sending.wait(5)
+    handler.emit(_record("queued"))
+    return handler
+
+
+def _queued(handler: RedisStreamHandler) -> list[str]:
+    return [entry["msg"] for entry in list(handler.queue.queue) if entry]
+
+
+def test_drop_newest_keeps_the_queued_record(sender: StalledSender):
+    handler = _full_handler(sender, overflow="drop_newest")
+    handler.emit(_record("overflow"))
+
+    assert handler.dropped == 1
+    assert _queued(handler) == ["queued"]
+
+    sender.release.set()
+    handler.close()
+    assert sender.sent == ["sending", "queued"]
+
+
+def test_drop_oldest_replaces_the_queued_record(sender: StalledSender):
+    handler = _full_handler(sender, overflow="drop_oldest")
+    handler.emit(_record("overflow"))
+
+    assert handler.dropped == 1
+    assert _queued(handler) == ["overflow"]
+
+    sender.release.set()
+    handler.close()
+    assert sender.sent == ["sending", "overflow"]
+
+
+def test_block_drops_the_record_after_the_timeout(sender: StalledSender):
+    handler = _full_handler(sender, overflow="block", block_timeout=0.05)
+    handler.emit(_record("overflow"))
+
+    assert handler.dropped == 1
+    assert _queued(handler) == ["queued"]
+
+    sender.release.set()
+    handler.close()
+
+
+def test_block_waits_for_room(sender: StalledSender):
+    handler = _full_handler(sender, overflow="block", block_timeout=5)
+    threading.Timer(0.05, sender.release.set).start()
+    handler.emit(_record("overflow"))
+
+    assert handler.dropped == 0
+
+    handler.close()
+    assert sender.sent == ["sending", "queued", "overflow"]
+
+
+def test_dropped_count_is_exact_across_threads(sender: StalledSender):
+    handler = _full_handler(sender, overflow="drop_newest")
+
+    def emit_many() -> None:
+        for index in range(500):
+            handler.emit(_record(f"overflow {index}"))
+
+    threads = [threading.Thread(target=emit_many) for _ in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert handler.dropped == 2000
+
+    sender.release.set()
+    handler.close()
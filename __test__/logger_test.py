@@ -0,0 +1,44 @@
+import logging
+
+import pytest
+
+from app.config import get_settings
+from app.logger import RedisStreamHandler
+from app.redis import get_sync_client
+
+settings = get_settings()
+redis = get_sync_client()
+stream_key = f"{settings.log_stream_key}:test"
+
+
+def _record(msg: str) -> logging.LogRecord:
+    return logging.LogRecord("app", logging.INFO, __file__, 1, msg, None, None)
+
+
+@pytest.fixture
+def handler():
+    redis.delete(stream_key)
+    handler = RedisStreamHandler(batch_size=10)
+    handler.stream_key = stream_key
+    yield handler
+    handler.close()
+    redis.delete(stream_key)
+
+
+def test_stream_handler_ships_records_in_batches(handler: RedisStreamHandler):
+    for index in range(25):
+        handler.emit(_record(f"message {index}"))
+
+    handler.flush()
+
+    assert redis.xlen(stream_key) == 25
+
+
+def test_stream_handler_flushes_on_close(handler: RedisStreamHandler):
+    handler.emit(_record("before close"))
+    handler.close()
+    handler.emit(_record("after close"))
+
+    entries = redis.xrange(stream_key)
+
+    assert [entry[1]["msg"] for entry in entries] == ["before close"]
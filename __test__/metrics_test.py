@@ -0,0 +1,52 @@
+from app.metrics import Counter, Gauge, Histogram, Registry
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), (0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.1, "/a")
+    histogram.observe(5, "/a")
+
+    assert list(histogram.samples()) == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2.0',
+        'latency_seconds_bucket{route="/a",le="1.0"} 2.0',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3.0',
+        'latency_seconds_sum{route="/a"} 5.15',
+        'latency_seconds_count{route="/a"} 3.0',
+    ]
+
+
+def test_counter_and_gauge_render_with_help_and_type():
+    registry = Registry()
+    counter = Counter("errors_total", "Errors.", ("command",))
+    gauge = Gauge("in_flight", "In flight.")
+    registry.register(counter)
+    registry.register(gauge)
+
+    counter.inc("GET")
+    counter.inc("GET")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    assert registry.render() == (
+        "# HELP errors_total Errors.\n"
+        "# TYPE errors_total counter\n"
+        'errors_total{command="GET"} 2\n'
+        "# HELP in_flight In flight.\n"
+        "# TYPE in_flight gauge\n"
+        "in_flight 1\n"
+    )
+
+
+def test_gauge_collects_values_at_render_time():
+    gauge = Gauge("pool", "Pool.", ("state",), collect=lambda: [(("in_use",), 3)])
+
+    assert list(gauge.samples()) == ['pool{state="in_use"} 3']
+
+
+def test_label_values_are_escaped():
+    counter = Counter("requests_total", "Requests.", ("path",))
+    counter.inc('/a"b')
+
+    assert list(counter.samples()) == ['requests_total{path="/a\\"b"} 1']
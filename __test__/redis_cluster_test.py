@@ -0,0 +1,53 @@
+import pytest
+from redis.crc import key_slot
+
+from app.components.todos.store import TodoStore
+from app.config import Settings
+from app.errors import ClientError
+from app.redis import (
+    InstrumentedClusterPipeline,
+    InstrumentedRedisCluster,
+    create_cluster_client,
+    sharded_keys,
+)
+
+CLUSTER_URL = "redis://localhost:7000"
+
+
+def _cluster_store() -> TodoStore:
+    settings = Settings.model_validate({"REDIS_CLUSTER": "true"})
+    return TodoStore(create_cluster_client(CLUSTER_URL, settings), cache_size=10)
+
+
+def test_cluster_client_is_instrumented():
+    client = create_cluster_client(CLUSTER_URL, Settings.model_validate({}))
+
+    assert isinstance(client, InstrumentedRedisCluster)
+    assert isinstance(client.pipeline(), InstrumentedClusterPipeline)
+
+
+def test_sharded_keys_use_distinct_hash_tags():
+    assert sharded_keys("logs", 1) == ["logs"]
+
+    keys = sharded_keys("logs", 4)
+
+    assert keys == ["logs:{0}", "logs:{1}", "logs:{2}", "logs:{3}"]
+    assert len({key_slot(key.encode()) for key in keys}) == 4
+
+
+def test_cluster_store_disables_the_cache():
+    store = _cluster_store()
+
+    assert store.cluster
+    assert store.cache is None
+
+
+def test_atomic_cluster_batches_must_share_a_slot():
+    store = _cluster_store()
+
+    store.check_atomic_batch(["todos:{list-1}a", "todos:{list-1}b"])
+
+    with pytest.raises(ClientError) as exc_info:
+        store.check_atomic_batch(["todos:a", "todos:b", "todos:c"])
+
+    assert exc_info.value.status == 400
@@ -0,0 +1,46 @@
+from redis.asyncio.connection import BlockingConnectionPool, ConnectionPool
+
+from app.config import Settings
+from app.redis import create_connection_pool
+
+REDIS_URL = "redis://localhost:6379"
+
+
+def _settings(**values: str) -> Settings:
+    return Settings.model_validate(values)
+
+
+def test_pool_is_unbounded_by_default():
+    pool = create_connection_pool(REDIS_URL, _settings())
+
+    assert type(pool) is ConnectionPool
+    assert pool.connection_kwargs["socket_keepalive"] is True
+    assert pool.connection_kwargs["health_check_interval"] == 30
+
+
+def test_pool_size_makes_the_pool_blocking():
+    pool = create_connection_pool(
+        REDIS_URL,
+        _settings(REDIS_POOL_SIZE="8", REDIS_POOL_TIMEOUT="0.5"),
+    )
+
+    assert isinstance(pool, BlockingConnectionPool)
+    assert pool.max_connections == 8
+    assert pool.timeout == 0.5
+
+
+def test_socket_settings_are_passed_to_connections():
+    pool = create_connection_pool(
+        REDIS_URL,
+        _settings(
+            REDIS_SOCKET_TIMEOUT="2",
+            REDIS_SOCKET_CONNECT_TIMEOUT="1",
+            REDIS_SOCKET_KEEPALIVE="false",
+            REDIS_HEALTH_CHECK_INTERVAL="0",
+        ),
+    )
+
+    assert pool.connection_kwargs["socket_timeout"] == 2
+    assert pool.connection_kwargs["socket_connect_timeout"] == 1
+    assert pool.connection_kwargs["socket_keepalive"] is False
+    assert pool.connection_kwargs["health_check_interval"] == 0
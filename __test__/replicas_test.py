@@ -0,0 +1,97 @@
+from time import time
+
+from redis.exceptions import ConnectionError
+from starlette.requests import Request
+
+from app.config import Settings
+from app.main import LAST_WRITE_COOKIE, _wrote_recently
+from app.redis import InstrumentedRedis
+from app.replicas import LATENCY_PROBE_INTERVAL, ReplicaSet, read_from_primary
+from app.resilience import CircuitBreaker
+
+
+def _client(latency: float = 0.0) -> InstrumentedRedis:
+    client = InstrumentedRedis()
+    client.latency = latency
+    return client
+
+
+def _request(cookies: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/todos",
+            "headers": [(b"cookie", cookies.encode())],
+        }
+    )
+
+
+def test_reads_use_the_primary_without_replicas():
+    primary = _client()
+
+    assert ReplicaSet(primary).reader() is primary
+
+
+def test_round_robin_rotates_through_replicas():
+    replicas = [_client(), _client()]
+    readers = ReplicaSet(_client(), replicas)
+
+    assert [readers.reader() for _ in range(4)] == [*replicas, *replicas]
+
+
+def test_least_latency_picks_the_fastest_replica():
+    slow, fast = _client(0.02), _client(0.001)
+    readers = ReplicaSet(_client(), [slow, fast], "least_latency")
+
+    assert readers.reader() is fast
+
+
+def test_least_latency_probes_a_replica_that_had_one_slow_sample():
+    spiked, steady = _client(0.5), _client(0.01)
+    readers = ReplicaSet(_client(), [spiked, steady], "least_latency")
+    picked = []
+
+    for _ in range(LATENCY_PROBE_INTERVAL * 2):
+        reader = readers.reader()
+        picked.append(reader)
+
+        # A probe re-measures the spiked replica, which has since recovered.
+        if reader is spiked:
+            spiked.latency = 0.001
+
+    assert picked[: LATENCY_PROBE_INTERVAL - 1] == [steady] * (
+        LATENCY_PROBE_INTERVAL - 1
+    )
+    assert picked[LATENCY_PROBE_INTERVAL - 1] is spiked
+    assert picked[LATENCY_PROBE_INTERVAL] is spiked
+
+
+def test_replicas_with_an_open_breaker_are_skipped():
+    primary, broken = _client(), _client()
+    broken.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    broken.breaker.record_failure(ConnectionError())
+
+    assert ReplicaSet(primary, [broken]).reader() is primary
+
+
+def test_recent_writers_read_from_the_primary():
+    primary = _client()
+    readers = ReplicaSet(primary, [_client()])
+    token = read_from_primary.set(True)
+
+    try:
+        assert readers.reader() is primary
+    finally:
+        read_from_primary.reset(token)
+
+
+def test_last_write_cookie_expires_after_the_window():
+    settings = Settings.model_validate(
+        {"READ_YOUR_WRITES_WINDOW": "2", "REDIS_READ_URLS": "redis://replica:6379"}
+    )
+
+    assert _wrote_recently(settings, _request(f"{LAST_WRITE_COOKIE}={time()}"))
+    assert not _wrote_recently(settings, _request(f"{LAST_WRITE_COOKIE}={time() - 5}"))
+    assert not _wrote_recently(settings, _request(f"{LAST_WRITE_COOKIE}=nope"))
+    assert not _wrote_recently(settings, _request(""))
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+from redis.asyncio.retry import Retry
+from redis.backoff import NoBackoff
+from redis.exceptions import ConnectionError, ResponseError, TimeoutError
+
+from app.errors import ServiceUnavailableError
+from app.redis import guarded_call
+from app.resilience import (
+    BudgetedRetry,
+    CircuitBreaker,
+    RetryBudget,
+    request_deadline,
+    set_request_deadline,
+)
+
+
+class Flaky:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+
+        if self.calls <= self.failures:
+            raise ConnectionError("connection refused")
+
+        return "OK"
+
+
+async def _noop(_: Exception) -> None:
+    pass
+
+
+@pytest.fixture(autouse=True)
+def clear_deadline():
+    token = request_deadline.set(None)
+    yield
+    request_deadline.reset(token)
+
+
+async def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    flaky = Flaky(failures=10)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await breaker.call(flaky)
+
+    with pytest.raises(ServiceUnavailableError) as exc_info:
+        await breaker.call(flaky)
+
+    assert breaker.state == "open"
+    assert flaky.calls == 2
+    assert 0 < exc_info.value.retry_after <= 60
+
+
+async def test_breaker_half_opens_and_closes_on_success():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    flaky = Flaky(failures=1)
+
+    with pytest.raises(ConnectionError):
+        await breaker.call(flaky)
+
+    await asyncio.sleep(0.02)
+
+    assert await breaker.call(flaky) == "OK"
+    assert breaker.state == "closed"
+
+
+async def test_breaker_reopens_when_the_trial_fails():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.01)
+    breaker.record_failure(ConnectionError())
+    breaker.record_failure(ConnectionError())
+    breaker.record_failure(ConnectionError())
+    await asyncio.sleep(0.02)
+
+    with pytest.raises(ConnectionError):
+        await breaker.call(Flaky(failures=1))
+
+    assert breaker.state == "open"
+
+
+async def test_breaker_ignores_errors_redis_replied_with():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+
+    async def bad_query() -> None:
+        raise ResponseError("Syntax error")
+
+    with pytest.raises(ResponseError):
+        await breaker.call(bad_query)
+
+    assert breaker.state == "closed"
+
+
+def test_retry_budget_is_bounded_by_its_reserve():
+    budget = RetryBudget(ratio=0.5, reserve=1)
+
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    budget.deposit()
+    budget.deposit()
+    budget.deposit()
+
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+
+async def test_retries_stop_when_the_budget_runs_out():
+    budget = RetryBudget(ratio=0, reserve=1)
+    retry = BudgetedRetry(NoBackoff(), 5, budget)
+    flaky = Flaky(failures=10)
+
+    with pytest.raises(ConnectionError):
+        await retry.call_with_retry(flaky, _noop)
+
+    assert flaky.calls == 2
+
+
+async def test_budgeted_retry_retries_within_budget():
+    retry = BudgetedRetry(NoBackoff(), 5, RetryBudget(ratio=0.1))
+    flaky = Flaky(failures=2)
+
+    assert await retry.call_with_retry(flaky, _noop) == "OK"
+    assert isinstance(retry, Retry)
+
+
+async def test_guarded_call_enforces_the_request_deadline():
+    set_request_deadline(0.01)
+
+    with pytest.raises(TimeoutError):
+        await guarded_call(None, lambda: asyncio.sleep(1))
+
+
+async def test_guarded_call_fails_fast_after_the_deadline():
+    set_request_deadline(0.01)
+    await asyncio.sleep(0.02)
+    flaky = Flaky(failures=0)
+
+    with pytest.raises(TimeoutError):
+        await guarded_call(None, flaky)
+
+    assert flaky.calls == 0
@@ -1,9 +1,12 @@
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from redis.exceptions import ResponseError
 
 from app.components.todos.store import TODOS_INDEX, TODOS_PREFIX, reset_todos_store
 from app.config import get_settings
+from app.logger import flush_logging
 from app.main import app
 from app.redis import get_sync_client
 
@@ -20,7 +23,8 @@ def _reset_redis_state() -> None:
     redis.delete(settings.log_stream_key)
 
     try:
-        redis.ft(TODOS_INDEX).dropindex()
+        index_name = redis.ft(TODOS_INDEX).info()["index_name"]
+        redis.ft(index_name).dropindex()
     except ResponseError as exc:
         if "Unknown index name" not in str(exc) and "no such index" not in str(exc):
             raise
@@ -99,6 +103,87 @@ def test_create_and_read_multiple_todos(client: TestClient):
         assert todo["value"]["name"] in todo_names
 
 
+def test_list_todos_with_limit_and_cursor(client: TestClient):
+    for index in range(3):
+        client.post("/api/todos", json={"name": f"Todo {index}"})
+
+    first_page = client.get("/api/todos", params={"limit": 2}).json()
+    second_page = client.get(
+        "/api/todos",
+        params={"limit": 2, "cursor": first_page["cursor"]},
+    ).json()
+
+    assert first_page["total"] == 3
+    assert len(first_page["documents"]) == 2
+    assert len(second_page["documents"]) == 1
+    assert second_page["cursor"] is None
+
+
+def test_export_streams_ndjson(client: TestClient):
+    for index in range(3):
+        client.post("/api/todos", json={"name": f"Todo {index}"})
+
+    response = client.get("/api/todos/export")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert sorted(line["value"]["name"] for line in lines) == [
+        "Todo 0",
+        "Todo 1",
+        "Todo 2",
+    ]
+
+
+def test_batch_endpoints_return_per_item_results(client: TestClient):
+    create_response = client.post(
+        "/api/todos/batch",
+        json=[{"name": "One"}, {"id": "two", "name": "Two"}],
+    )
+    created = create_response.json()["results"]
+
+    assert create_response.status_code == 200
+    assert [result["status"] for result in created] == [200, 200]
+    assert created[1]["value"]["name"] == "Two"
+
+    update_response = client.patch(
+        "/api/todos/batch",
+        params={"atomic": "true"},
+        json=[
+            {"id": "two", "status": "complete"},
+            {"id": "missing", "status": "complete"},
+        ],
+    )
+    updated = update_response.json()["results"]
+
+    assert updated[0]["value"]["status"] == "complete"
+    assert updated[1] == {
+        "id": "todos:missing",
+        "status": 404,
+        "value": None,
+        "message": "Not Found",
+    }
+
+    delete_response = client.request(
+        "DELETE",
+        "/api/todos/batch",
+        json=[created[0]["id"], "two"],
+    )
+
+    assert [result["status"] for result in delete_response.json()["results"]] == [
+        200,
+        200,
+    ]
+    assert client.get("/api/todos").json()["total"] == 0
+
+
+def test_invalid_batch_create_returns_validation_error(client: TestClient):
+    response = client.post("/api/todos/batch", json=[{"name": "One"}, {"name": ""}])
+
+    assert response.status_code == 400
+    assert response.json() == {"status": 400, "message": "Todo must have a name"}
+
+
 def test_search_by_name_and_status(client: TestClient):
     client.post("/api/todos", json={"name": "Buy groceries"})
     second = client.post("/api/todos", json={"name": "Clean kitchen"}).json()
@@ -116,6 +201,84 @@ def test_search_by_name_and_status(client: TestClient):
     assert search_by_status["documents"][0]["value"]["status"] == "complete"
 
 
+def test_get_todos_by_ids(client: TestClient):
+    created = client.post("/api/todos", json={"name": "Board item"}).json()
+
+    response = client.get("/api/todos", params={"ids": f"{created['id']},missing"})
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()["results"]] == [200, 404]
+    assert response.json()["results"][0]["value"]["name"] == "Board item"
+
+
+def test_search_sorts_and_pages_by_date(client: TestClient):
+    first = client.post("/api/todos", json={"name": "First"}).json()
+    client.post("/api/todos", json={"name": "Second"})
+    client.post("/api/todos", json={"name": "Third"})
+
+    page = client.get(
+        "/api/todos/search",
+        params={"sort_by": "createdDate", "order": "desc", "limit": 2},
+    ).json()
+    next_page = client.get(
+        "/api/todos/search",
+        params={
+            "sort_by": "createdDate",
+            "order": "desc",
+            "limit": 2,
+            "cursor": page["cursor"],
+        },
+    ).json()
+    after_first = client.get(
+        "/api/todos/search",
+        params={"created_after": first["value"]["createdDate"]},
+    ).json()
+
+    assert [todo["value"]["name"] for todo in page["documents"]] == [
+        "Third",
+        "Second",
+    ]
+    assert [todo["value"]["name"] for todo in next_page["documents"]] == ["First"]
+    assert next_page["cursor"] is None
+    assert after_first["total"] == 2
+
+
+def test_search_rejects_backwards_date_ranges(client: TestClient):
+    response = client.get(
+        "/api/todos/search",
+        params={"created_after": "2024-02-01", "created_before": "2024-01-01"},
+    )
+
+    assert response.status_code == 400
+    assert response.json() == {
+        "status": 400,
+        "message": "Date ranges must end after they start",
+    }
+
+
+def test_stats_count_todos_per_status(client: TestClient):
+    created = client.post("/api/todos", json={"name": "Walk the dog"}).json()
+    client.post("/api/todos", json={"name": "Buy groceries"})
+    client.patch(f"/api/todos/{created['id']}", json={"status": "complete"})
+
+    stats = client.get("/api/todos/stats").json()
+    by_month = client.get("/api/todos/stats", params={"bucket": "month"}).json()
+
+    assert stats == {
+        "total": 2,
+        "counts": {"todo": 1, "in progress": 0, "complete": 1},
+        "buckets": None,
+    }
+    assert len(by_month["buckets"]) == 1
+    assert by_month["buckets"][0]["total"] == 2
+
+
+def test_stats_rejects_unknown_bucket(client: TestClient):
+    response = client.get("/api/todos/stats", params={"bucket": "fortnight"})
+
+    assert response.status_code == 400
+
+
 def test_missing_todo_returns_not_found(client: TestClient):
     response = client.get("/api/todos/missing")
 
@@ -141,8 +304,23 @@ def test_invalid_update_returns_validation_error(client: TestClient):
     )
 
 
+def test_metrics_endpoint_reports_routes_and_redis_commands(client: TestClient):
+    client.get("/api/todos")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/todos",status="200"}'
+        in response.text
+    )
+    assert 'redis_command_duration_seconds_count{command="FT.SEARCH"}' in response.text
+    assert "redis_pool_connections{" in response.text
+
+
 def test_request_logging_writes_to_redis_stream(client: TestClient):
     response = client.get("/api/todos")
+    flush_logging()
 
     assert response.status_code == 200
     assert redis.xlen(settings.log_stream_key) >= 1
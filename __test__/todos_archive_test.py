@@ -0,0 +1,47 @@
+from datetime import UTC, datetime, timedelta
+
+from app.components.todos.archive import TodoArchiver, pack, unpack
+from app.components.todos.memory_store import MemoryTodoStore
+from app.components.todos.store import TodoStatus
+
+
+def test_pack_round_trips_and_compresses():
+    payload = b'{"name":"Laundry","status":"complete"}' * 100
+
+    assert unpack(pack(payload)) == payload
+    assert len(pack(payload)) < len(payload) / 10
+
+
+async def test_archiver_archives_todos_older_than_the_cutoff():
+    cutoffs: list[datetime] = []
+
+    async def archive(cutoff: datetime) -> int:
+        cutoffs.append(cutoff)
+        return 3
+
+    archiver = TodoArchiver(archive, timedelta(days=30))
+
+    assert await archiver.run_once() == 3
+    assert datetime.now(UTC) - cutoffs[0] >= timedelta(days=30)
+
+
+async def test_memory_store_archives_and_pages_through_batches():
+    todos = MemoryTodoStore(archive_batch_size=2)
+    created = await todos.create_many([(None, f"Chore {i}") for i in range(6)])
+    ids = [result.id for result in created.results]
+    await todos.update_many([(todo_id, TodoStatus.complete) for todo_id in ids[:5]])
+
+    assert await todos.archive_completed(datetime.now(UTC) + timedelta(seconds=1)) == 5
+    assert (await todos.search("chore", None)).total == 1
+
+    first = await todos.archived(batches=2)
+    rest = await todos.archived(first.cursor, batches=2)
+
+    # Oldest first, though todos updated in the same millisecond may swap.
+    assert sorted(todo.id for todo in first.documents + rest.documents) == sorted(
+        ids[:5]
+    )
+    assert len(first.documents) == 4
+    assert first.cursor is not None
+    assert rest.cursor is None
+    assert await todos.archive_completed(datetime.now(UTC)) == 0
@@ -0,0 +1,153 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.components.todos.cache import INVALIDATE_CHANNEL, TodoCache
+from app.components.todos.store import Todo, TodoStatus, TodoStore
+from app.redis import get_client
+
+
+def _todo(name: str) -> Todo:
+    return Todo(name=name, status=TodoStatus.todo)
+
+
+class FakeConnection:
+    """Answers the tracking handshake, then one invalidation once delivered"""
+
+    def __init__(self, deliver: asyncio.Event) -> None:
+        self.deliver = deliver
+        self.replies: list[Any] = [7, "OK", ["subscribe", INVALIDATE_CHANNEL, 1]]
+        self.connected = False
+
+    async def connect(self) -> None:
+        self.connected = True
+
+    async def disconnect(self) -> None:
+        self.connected = False
+
+    async def send_command(self, *args: Any) -> None:
+        return None
+
+    async def read_response(self, timeout: float | None = None) -> Any:
+        if len(self.replies) > 0:
+            return self.replies.pop(0)
+
+        await self.deliver.wait()
+        self.deliver.clear()
+        return ["message", INVALIDATE_CHANNEL, ["todos:1"]]
+
+
+class FakePool:
+    def __init__(self, protocol: str | None = None) -> None:
+        self.connection_kwargs = {"protocol": protocol}
+        self.deliver = asyncio.Event()
+        self.connections: list[FakeConnection] = []
+
+    def make_connection(self) -> FakeConnection:
+        self.connections.append(FakeConnection(self.deliver))
+        return self.connections[-1]
+
+    async def get_connection(self) -> None:
+        raise AssertionError("the listener must not hold a pooled connection")
+
+
+class FakeRedis:
+    def __init__(self, pool: FakePool) -> None:
+        self.connection_pool = pool
+
+
+@pytest.fixture
+def cache() -> TodoCache:
+    cache = TodoCache(get_client(), "todos:", max_size=2)
+    cache.tracking = True
+    return cache
+
+
+def test_cache_evicts_least_recently_used(cache: TodoCache):
+    cache.set("todos:1", _todo("One"), cache.epoch)
+    cache.set("todos:2", _todo("Two"), cache.epoch)
+    cache.get("todos:1")
+    cache.set("todos:3", _todo("Three"), cache.epoch)
+
+    assert list(cache.entries) == ["todos:1", "todos:3"]
+
+
+def test_cache_skips_values_read_before_an_invalidation(cache: TodoCache):
+    epoch = cache.epoch
+    cache.invalidate(["todos:1"])
+    cache.set("todos:1", _todo("Stale"), epoch)
+
+    assert cache.get("todos:1") is None
+
+
+def test_cache_is_bypassed_while_not_tracking(cache: TodoCache):
+    cache.set("todos:1", _todo("One"), cache.epoch)
+    cache.tracking = False
+
+    assert cache.get("todos:1") is None
+
+
+async def test_cache_is_invalidated_by_other_writers():
+    todos = TodoStore(get_client(), cache_size=10)
+    await todos.initialize()
+
+    try:
+        for _ in range(50):
+            if todos.cache is not None and todos.cache.tracking:
+                break
+            await asyncio.sleep(0.05)
+
+        created = await todos.create(None, "Cached todo")
+        await todos.one(created.id)
+
+        assert todos.cache is not None
+        assert todos.cache.get(created.id) is not None
+
+        # Write through a separate store, as another process would.
+        await TodoStore(get_client()).update(created.id, TodoStatus.complete)
+
+        for _ in range(50):
+            if todos.cache.get(created.id) is None:
+                break
+            await asyncio.sleep(0.05)
+
+        assert (await todos.one(created.id)).status == TodoStatus.complete
+
+        await todos.delete(created.id)
+    finally:
+        await todos.close()
+
+
+async def test_listener_evicts_on_its_own_connection():
+    pool = FakePool()
+    cache = TodoCache(FakeRedis(pool), "todos:", max_size=2)  # type: ignore[arg-type]
+    await cache.start()
+
+    for _ in range(50):
+        if cache.tracking:
+            break
+        await asyncio.sleep(0.01)
+
+    cache.set("todos:1", _todo("One"), cache.epoch)
+    pool.deliver.set()
+
+    for _ in range(50):
+        if cache.get("todos:1") is None:
+            break
+        await asyncio.sleep(0.01)
+
+    assert cache.get("todos:1") is None
+    assert pool.connections[0].connected
+
+    await cache.stop()
+
+    assert not pool.connections[0].connected
+
+
+async def test_cache_is_disabled_for_resp3():
+    cache = TodoCache(FakeRedis(FakePool("3")), "todos:", max_size=2)  # type: ignore[arg-type]
+    await cache.start()
+
+    assert cache._task is None
+    assert not cache.tracking
@@ -0,0 +1,113 @@
+import asyncio
+
+from app.components.todos.changes import (
+    SUBSCRIBER_QUEUE_SIZE,
+    ChangeFeed,
+    Subscription,
+    TodoChange,
+    _stream_entries,
+    create_change_feed,
+    encode_event,
+)
+from app.config import Settings
+from app.redis import get_client
+
+
+def test_changes_are_stored_as_compact_fields():
+    change = TodoChange(op="update", id="todos:1", status="complete", timestamp=5)
+    fields = change.fields()
+
+    assert fields == {"op": "update", "ts": 5, "id": "todos:1", "status": "complete"}
+    assert TodoChange.from_fields({k: str(v) for k, v in fields.items()}) == change
+    assert TodoChange(op="clear", timestamp=5).fields() == {"op": "clear", "ts": 5}
+
+
+def test_stream_replies_are_read_from_both_protocols():
+    entries = [("1-0", {"op": "clear", "ts": "1"})]
+
+    assert _stream_entries([["todos-changes", entries]]) == entries
+    assert _stream_entries({"todos-changes": [entries]}) == entries
+
+
+def test_events_resume_from_their_stream_id():
+    change = TodoChange(op="delete", id="todos:1", timestamp=5)
+
+    assert encode_event(("7-1", change)) == (
+        'id: 7-1\nevent: delete\ndata: {"op":"delete","id":"todos:1","timestamp":5}\n\n'
+    )
+
+
+async def test_subscribers_that_fall_behind_are_dropped():
+    feed = ChangeFeed(get_client(), max_length=10)
+    slow = Subscription()
+    feed.subscriptions.add(slow)
+    change = TodoChange(op="clear", timestamp=1)
+
+    for index in range(SUBSCRIBER_QUEUE_SIZE + 1):
+        feed.publish((f"{index}-0", change))
+
+    assert slow.closed
+    assert slow not in feed.subscriptions
+    assert slow.queue.qsize() == SUBSCRIBER_QUEUE_SIZE
+
+
+def test_blocking_reads_finish_within_the_socket_timeout():
+    assert create_change_feed(Settings(), get_client()) is None
+
+    feed = create_change_feed(
+        Settings(TODOS_CHANGES=True, REDIS_SOCKET_TIMEOUT=2), get_client()
+    )
+
+    assert feed is not None
+    assert feed.block_ms == 1000
+
+
+async def test_feed_without_a_task_stops_cleanly():
+    feed = ChangeFeed(get_client(), max_length=10)
+    await asyncio.wait_for(feed.stop(), 1)
+
+
+class FakeStream:
+    def __init__(self, count: int) -> None:
+        self.entries = [(f"{i}-0", {"op": "clear", "ts": str(i)}) for i in range(count)]
+
+    async def xrange(self, key: str, min: str, count: int) -> list:
+        after = int(min.lstrip("(").partition("-")[0])
+        return [entry for entry in self.entries if int(entry[0][:-2]) > after][:count]
+
+    def append(self, feed: ChangeFeed) -> None:
+        entry_id = f"{len(self.entries)}-0"
+        self.entries.append((entry_id, {"op": "clear", "ts": "0"}))
+        feed.publish((entry_id, TodoChange.from_fields(self.entries[-1][1])))
+
+
+async def test_resuming_from_a_long_backlog_does_not_drop_the_subscriber():
+    stream = FakeStream(SUBSCRIBER_QUEUE_SIZE + 500)
+    feed = ChangeFeed(stream, max_length=10_000, block_ms=10)  # type: ignore[arg-type]
+    # Pretend the shared reader is already following the stream.
+    feed._task = asyncio.create_task(asyncio.sleep(0))
+    feed.ready.set()
+    received: list[str] = []
+    wrote_live = False
+    entries = await feed.subscribe("0-0")
+
+    async for entry in entries:
+        # The history is drained and the subscriber is idle: write live.
+        if entry is None and not wrote_live:
+            stream.append(feed)
+            wrote_live = True
+        elif entry is not None:
+            received.append(entry[0])
+
+            # Keep writing while the history is replayed.
+            if len(received) < SUBSCRIBER_QUEUE_SIZE + 200:
+                stream.append(feed)
+
+        if wrote_live and len(received) == len(stream.entries) - 1:
+            break
+
+    await entries.aclose()  # type: ignore[attr-defined]
+
+    assert wrote_live
+    assert received == [entry_id for entry_id, _ in stream.entries[1:]]
+    assert feed.subscriptions == set()
@@ -0,0 +1,73 @@
+from datetime import UTC, datetime
+
+import pytest
+from redis.commands.search.document import Document
+
+from app.components.todos.encoding import (
+    HashEncoding,
+    JsonEncoding,
+    TodoEncoding,
+    create_encoding,
+)
+from app.components.todos.store import Todo, TodoStatus
+
+NOW = datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=UTC)
+TODO = Todo(name="Buy milk", status=TodoStatus.todo, created_date=NOW, updated_date=NOW)
+
+
+def test_json_documents_carry_numeric_dates():
+    payload = JsonEncoding().serialize(TODO)
+
+    assert payload["createdDate"] == "2024-01-02T03:04:05.678000Z"
+    assert payload["createdTimestamp"] == 1704164645678
+    assert Todo.model_validate(payload) == TODO
+
+
+def test_hashes_use_short_fields_and_epoch_dates():
+    encoding = HashEncoding()
+    fields = encoding.serialize(TODO)
+
+    assert fields == {
+        "n": "Buy milk",
+        "s": "todo",
+        "c": 1704164645678,
+        "u": 1704164645678,
+    }
+    stored = {field: str(value) for field, value in fields.items()}
+    assert Todo.model_validate(encoding.decode(stored)) == TODO
+    assert encoding.decode({}) is None
+
+
+def test_hash_search_results_encode_like_json_documents():
+    encoding = HashEncoding()
+    stored = {field: str(value) for field, value in encoding.serialize(TODO).items()}
+    document = Document("todos:1", **stored)
+
+    assert Todo.model_validate_json(encoding.document_json(document)) == TODO
+    assert encoding.document_json(document) == TODO.model_dump_json()
+
+
+def test_hash_updates_decode_script_replies():
+    encoding = HashEncoding()
+    reply = ["n", "Buy milk", "s", "complete", "c", "1704164645678", "u", "1"]
+    todo = Todo.model_validate(encoding.decode_update(reply))
+
+    assert todo.status == TodoStatus.complete
+    assert todo.updated_date == datetime.fromtimestamp(0.001, UTC)
+
+
+def test_encodings_index_the_same_field_names():
+    names = {
+        name: [field.as_name for field in create_encoding(name).schema()]
+        for name in ("json", "hash")
+    }
+
+    assert names["json"] == names["hash"]
+
+
+def test_incomplete_encodings_cannot_be_created():
+    class Partial(TodoEncoding):
+        name = "json"
+
+    with pytest.raises(TypeError):
+        Partial()  # type: ignore[abstract]
@@ -0,0 +1,42 @@
+from redis.exceptions import ResponseError
+
+from app.components.todos.store import TodoStore
+
+
+class FakeSearch:
+    def __init__(self, redis: "FakeRedis", name: str) -> None:
+        self.redis = redis
+        self.name = name
+
+    async def aliasupdate(self, alias: str) -> None:
+        self.redis.aliases[alias] = self.name
+
+    async def dropindex(self) -> None:
+        if self.name not in self.redis.indexes:
+            raise ResponseError("Unknown index name")
+
+        self.redis.indexes.remove(self.name)
+
+
+class FakeRedis:
+    def __init__(self, indexes: set[str]) -> None:
+        self.indexes = indexes
+        self.aliases: dict[str, str] = {}
+
+    def register_script(self, script: str) -> None:
+        return None
+
+    def ft(self, name: str) -> FakeSearch:
+        return FakeSearch(self, name)
+
+
+async def test_concurrent_migrations_both_swap_the_alias():
+    redis = FakeRedis({"todos-idx-v1", "todos-idx-v2"})
+    first = TodoStore(redis)  # type: ignore[arg-type]
+    second = TodoStore(redis)  # type: ignore[arg-type]
+
+    await first.swap_alias("todos-idx-v2", "todos-idx-v1")
+    await second.swap_alias("todos-idx-v2", "todos-idx-v1")
+
+    assert redis.aliases == {"todos-idx": "todos-idx-v2"}
+    assert redis.indexes == {"todos-idx-v2"}
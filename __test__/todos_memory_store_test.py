@@ -0,0 +1,144 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.components.todos import memory_store
+from app.components.todos.memory_store import MemoryTodoStore, within_one_edit
+from app.components.todos.query import SearchFilters
+from app.components.todos.store import TodoStatus
+from app.errors import ClientError
+
+
+async def test_crud_for_single_todo():
+    todos = MemoryTodoStore()
+    created = await todos.create("first", "First todo")
+
+    assert created.id == "todos:first"
+    assert (await todos.one("first")).name == "First todo"
+
+    updated = await todos.update("first", TodoStatus.complete)
+
+    assert updated.status == TodoStatus.complete
+    assert updated.updated_date is not None
+    assert updated.updated_date >= updated.created_date  # type: ignore[operator]
+
+    await todos.delete("first")
+
+    with pytest.raises(ClientError):
+        await todos.one("first")
+
+    with pytest.raises(ClientError):
+        await todos.update("first", TodoStatus.todo)
+
+
+async def test_search_match_modes_status_and_count_only():
+    todos = MemoryTodoStore()
+    await todos.create(None, "Buy groceries")
+    await todos.create(None, "Buy (more) groceries!")
+    await todos.create("dog", "Walk the dog")
+    await todos.update("dog", TodoStatus.in_progress)
+
+    assert (await todos.search("groc", None, "prefix")).total == 2
+    assert (await todos.search("grocerie", None, "fuzzy")).total == 2
+    assert (await todos.search("more groceries", None, "exact")).total == 1
+    assert (await todos.search("groceries more", None, "exact")).total == 0
+    assert (await todos.search("-dog | *", None)).total == 1
+    assert (await todos.search("BUY", TodoStatus.in_progress)).total == 0
+    assert (await todos.search(None, TodoStatus.in_progress)).total == 1
+
+    counted = await todos.search("buy", None, limit=0)
+
+    assert counted.total == 2
+    assert counted.documents == []
+    assert counted.cursor is None
+
+
+async def test_search_filters_and_sorts_by_date():
+    todos = MemoryTodoStore()
+
+    for i in range(5):
+        await todos.create(str(i), f"Todo {i}")
+
+    # Updating moves a todo's updatedDate, and its place in write order.
+    await asyncio.sleep(0.01)
+    await todos.update("1", TodoStatus.complete)
+    start = (await todos.one("0")).created_date
+    assert start is not None
+
+    newest = await todos.search(
+        None, None, filters=SearchFilters(sort_by="updatedDate", order="desc")
+    )
+    assert newest.documents[0].id == "todos:1"
+
+    ranged = await todos.search(
+        "todo",
+        None,
+        filters=SearchFilters(created_after=start - timedelta(seconds=1)),
+    )
+    assert ranged.total == 5
+    assert ranged.documents[-1].id == "todos:1"
+
+    empty = await todos.search(
+        None, None, filters=SearchFilters(created_before=start - timedelta(days=1))
+    )
+    assert empty.total == 0
+
+
+async def test_pages_stats_and_batches():
+    todos = MemoryTodoStore()
+    created = await todos.create_many([(None, f"Todo {i}") for i in range(5)])
+    ids = [result.id for result in created.results]
+
+    first = await todos.all(limit=3)
+    second = await todos.all(limit=3, cursor=int(first.cursor or 0))
+
+    assert first.total == 5
+    assert [doc.id for doc in first.documents + second.documents] == ids
+    assert second.cursor is None
+
+    updated = await todos.update_many(
+        [(ids[0], TodoStatus.complete), ("missing", TodoStatus.complete)]
+    )
+    assert [result.status for result in updated.results] == [200, 404]
+
+    stats = await todos.stats(bucket="month")
+    assert stats.counts[TodoStatus.complete] == 1
+    assert stats.buckets is not None
+    assert stats.buckets[0].start == datetime.now(UTC).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+
+    deleted = await todos.delete_many([ids[0], ids[0]])
+    assert [result.status for result in deleted.results] == [200, 404]
+
+    batch = await todos.many([ids[1], "missing"])
+    assert [result.status for result in batch.results] == [200, 404]
+
+    exported = [doc.id async for doc in todos.stream_all(batch_size=2)]
+    assert exported == ids[1:]
+
+    assert await todos.delete_all() == 4
+    assert (await todos.search("todo", None, "prefix")).total == 0
+    assert todos.vocabulary == []
+
+
+async def test_stats_refuses_too_many_buckets(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(memory_store, "MAX_STATS_GROUPS", 1)
+    todos = MemoryTodoStore()
+    await todos.create("first", "First todo")
+    await todos.create("second", "Second todo")
+    await todos.update("second", TodoStatus.complete)
+
+    assert (await todos.stats()).total == 2
+
+    with pytest.raises(ClientError):
+        await todos.stats(bucket="month")
+
+
+def test_within_one_edit():
+    assert within_one_edit("groceries", "grocerie")
+    assert within_one_edit("groceries", "grocerias")
+    assert within_one_edit("dog", "dogs")
+    assert not within_one_edit("groceries", "grocer")
+    assert not within_one_edit("groceries", "gorceries")
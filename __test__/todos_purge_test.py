@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from app.components.todos.store import TodoPurge
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+
+    async def unlink(self, *keys: str) -> int:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        if "fail" in keys:
+            raise RuntimeError("UNLINK failed")
+
+        return len(keys)
+
+
+async def test_purge_counts_batches_with_bounded_concurrency():
+    redis = FakeRedis()
+    progress: list[int] = []
+    purge = TodoPurge(redis, 2, progress.append)  # type: ignore[arg-type]
+
+    for batch in range(6):
+        await purge.submit([f"todos:{batch}:{key}" for key in range(10)])
+
+    await purge.wait()
+
+    assert purge.deleted == 60
+    assert progress == [10, 20, 30, 40, 50, 60]
+    assert redis.peak == 2
+
+
+async def test_purge_stops_after_a_failed_batch():
+    purge = TodoPurge(FakeRedis(), 2)  # type: ignore[arg-type]
+    await purge.submit(["fail"])
+    await asyncio.sleep(0.02)
+
+    with pytest.raises(RuntimeError):
+        await purge.submit(["todos:1"])
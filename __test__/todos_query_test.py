@@ -0,0 +1,92 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from app.components.todos.query import (
+    MAX_QUERY_TERMS,
+    SearchFilters,
+    build_search_query,
+    escape_term,
+    query_words,
+)
+
+
+def _query(*args, **kwargs) -> str:
+    return build_search_query(*args, **kwargs).query_string()
+
+
+def test_empty_search_matches_everything():
+    assert _query(None, None) == "*"
+
+
+def test_special_characters_cannot_change_the_query():
+    assert _query("-milk | *eggs* @status:{x}", None) == "@name:(milk eggs status x)"
+
+
+def test_status_tags_are_escaped():
+    assert _query(None, "in progress") == "@status:{in\\ progress}"
+    assert escape_term("a-b") == "a\\-b"
+
+
+def test_non_ascii_words_are_not_escaped():
+    assert _query("café déjà", None) == "@name:(café déjà)"
+    assert _query("日本語", None, "prefix") == "@name:(日本語*)"
+    assert escape_term("é-è") == "é\\-è"
+
+
+@pytest.mark.parametrize(
+    ("match", "expected"),
+    [
+        ("all", "@name:(buy groceries)"),
+        ("exact", '@name:"buy groceries"'),
+        ("prefix", "@name:(buy* groceries*)"),
+        ("fuzzy", "@name:(buy %groceries%)"),
+    ],
+)
+def test_match_modes(match: str, expected: str):
+    assert _query("buy groceries", None, match) == expected
+
+
+def test_short_words_are_not_expanded():
+    assert _query("a list", None, "prefix") == "@name:(a list*)"
+    assert _query("cat", None, "fuzzy") == "@name:(cat)"
+
+
+def test_query_terms_are_capped():
+    words = " ".join(f"word{i}" for i in range(MAX_QUERY_TERMS * 2))
+
+    assert len(query_words(words)) == MAX_QUERY_TERMS
+
+
+def test_count_only_searches_skip_content():
+    args = build_search_query("milk", None, "all", 0).get_args()
+
+    assert "NOCONTENT" in args
+    assert args[-3:] == ["LIMIT", 0, 0]
+
+
+def test_compiled_queries_are_memoized():
+    build_search_query.cache_clear()
+    first = build_search_query("milk", "todo", "prefix", 10)
+
+    assert build_search_query("milk", "todo", "prefix", 10) is first
+    assert build_search_query.cache_info().hits == 1
+
+
+def test_date_ranges_are_exclusive_numeric_filters():
+    filters = SearchFilters(
+        created_after=datetime(2024, 1, 1, tzinfo=UTC),
+        updated_before=datetime(2024, 1, 2, tzinfo=UTC),
+    )
+
+    assert _query(None, None, filters=filters) == (
+        "@createdDate:[(1704067200000 +inf] @updatedDate:[-inf (1704153600000]"
+    )
+
+
+def test_sorted_searches_page_server_side():
+    filters = SearchFilters(sort_by="createdDate", order="desc")
+    args = build_search_query("milk", None, "all", 10, 20, filters).get_args()
+
+    assert args[1:4] == ["SORTBY", "createdDate", "DESC"]
+    assert args[-3:] == ["LIMIT", 20, 10]
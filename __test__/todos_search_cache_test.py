@@ -0,0 +1,91 @@
+from app.components.todos.search_cache import (
+    SEARCH_CACHE_PREFIX,
+    MemorySearchCache,
+    RedisSearchCache,
+)
+from app.components.todos.store import TodoStore
+from app.metrics import todos_search_cache_requests
+from app.redis import get_client
+
+
+async def test_memory_cache_evicts_least_recently_used():
+    cache = MemorySearchCache(max_size=2)
+    await cache.set(0, "one", b"1")
+    await cache.set(0, "two", b"2")
+    await cache.get(0, "one")
+    await cache.set(0, "three", b"3")
+
+    assert list(cache.entries) == ["one", "three"]
+
+
+async def test_memory_cache_drops_pages_from_older_generations():
+    cache = MemorySearchCache(max_size=10)
+    await cache.set(1, "page", b"old")
+
+    assert await cache.get(2, "page") is None
+    assert len(cache.entries) == 0
+
+
+async def test_memory_cache_skips_pages_read_before_a_write():
+    cache = MemorySearchCache(max_size=10)
+    await cache.get(3, "page")
+    await cache.set(2, "page", b"stale")
+
+    assert await cache.get(3, "page") is None
+
+
+async def test_lookup_counts_hits_and_misses():
+    cache = MemorySearchCache(max_size=10)
+    hits = todos_search_cache_requests.values.get(("hit",), 0)
+    misses = todos_search_cache_requests.values.get(("miss",), 0)
+
+    await cache.lookup(0, "page")
+    await cache.set(0, "page", b"page")
+    await cache.lookup(0, "page")
+
+    assert todos_search_cache_requests.values[("hit",)] == hits + 1
+    assert todos_search_cache_requests.values[("miss",)] == misses + 1
+
+
+def test_redis_cache_keys_include_the_generation():
+    cache = RedisSearchCache(get_client(), ttl=60)
+    key = ("search", "@name:(milk)", 10)
+
+    assert cache.cache_key(4, key).startswith(f"{SEARCH_CACHE_PREFIX}4:")
+    assert cache.cache_key(4, key) == cache.cache_key(4, key)
+    assert cache.cache_key(4, key) != cache.cache_key(5, key)
+
+
+class FailingPipeline:
+    def incr(self, key: str) -> None:
+        pass
+
+    async def execute(self) -> list[int]:
+        raise ConnectionError("Redis went away")
+
+
+class WriteOnlyRedis:
+    """Accepts todo writes, but fails every generation bump"""
+
+    def register_script(self, script: str) -> None:
+        return None
+
+    def json(self) -> "WriteOnlyRedis":
+        return self
+
+    async def set(self, key: str, path: str, value: object) -> bool:
+        return True
+
+    def pipeline(self, transaction: bool = True) -> FailingPipeline:
+        return FailingPipeline()
+
+
+async def test_failed_generation_bump_does_not_fail_the_write():
+    cache = MemorySearchCache(max_size=10)
+    await cache.set(0, "page", b"stale")
+    store = TodoStore(WriteOnlyRedis(), search_cache=cache)  # type: ignore[arg-type]
+
+    created = await store.create(None, "Written anyway")
+
+    assert created.value.name == "Written anyway"
+    assert len(cache.entries) == 0
@@ -0,0 +1,75 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from app.components.todos import store
+from app.components.todos.store import TodoStatus, TodoStore
+from app.errors import ClientError
+
+DAY = 86_400
+STATUS_ROWS = [
+    ["status", "todo", "count", "3"],
+    ["status", "complete", "count", "3"],
+]
+# Ordered by bucket, as SORTBY returns them. One complete todo has no date,
+# and one has fallen outside the groups that were returned.
+BUCKET_ROWS = [
+    ["bucket", str(DAY), "status", "todo", "count", "1"],
+    ["bucket", str(DAY), "status", "complete", "count", "1"],
+    ["bucket", str(2 * DAY), "status", "todo", "count", "2"],
+    ["bucket", "", "status", "complete", "count", "1"],
+]
+
+
+class FakeSearch:
+    def __init__(self, requests: list[list[Any]]) -> None:
+        self.requests = requests
+
+    async def aggregate(self, request: Any) -> SimpleNamespace:
+        args = request.build_args()
+        self.requests.append(args)
+        return SimpleNamespace(rows=BUCKET_ROWS if "APPLY" in args else STATUS_ROWS)
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.requests: list[list[Any]] = []
+
+    def register_script(self, script: str) -> None:
+        return None
+
+    def ft(self, name: str) -> FakeSearch:
+        return FakeSearch(self.requests)
+
+
+async def test_counts_come_from_the_unbucketed_aggregate():
+    redis = FakeRedis()
+    todos = TodoStore(redis)  # type: ignore[arg-type]
+
+    stats = await todos.stats(bucket="day")
+
+    assert stats.total == 6
+    assert stats.counts == {
+        TodoStatus.todo: 3,
+        TodoStatus.in_progress: 0,
+        TodoStatus.complete: 3,
+    }
+    assert stats.buckets is not None
+    assert [bucket.start for bucket in stats.buckets] == [
+        datetime.fromtimestamp(DAY, UTC),
+        datetime.fromtimestamp(2 * DAY, UTC),
+    ]
+    assert [bucket.total for bucket in stats.buckets] == [2, 2]
+    assert "SORTBY" in redis.requests[1]
+
+
+async def test_too_many_buckets_is_an_error(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(store, "MAX_STATS_GROUPS", 2)
+    todos = TodoStore(FakeRedis())  # type: ignore[arg-type]
+
+    assert (await todos.stats()).total == 6
+
+    with pytest.raises(ClientError):
+        await todos.stats(bucket="day")
@@ -1,8 +1,22 @@
 import asyncio
+import json
+from datetime import UTC, datetime
 
 import pytest
+from redis.commands.search.field import TextField
+from redis.commands.search.index_definition import IndexDefinition, IndexType
 
-from app.components.todos.store import TodoStatus, get_todos_store
+from app.components.todos.archive import TODOS_ARCHIVE_KEY
+from app.components.todos.changes import ChangeFeed
+from app.components.todos.encoding import HashEncoding
+from app.components.todos.search_cache import MemorySearchCache
+from app.components.todos.store import (
+    TODOS_PREFIX,
+    TodoStatus,
+    TodoStore,
+    get_todos_store,
+)
+from app.errors import ClientError
 
 todos = get_todos_store()
 
@@ -38,6 +52,90 @@ async def test_crud_for_single_todo():
     await todos.delete(todo_id)
 
 
+async def test_update_missing_todo_does_not_create_it():
+    with pytest.raises(ClientError) as exc_info:
+        await todos.update("missing", TodoStatus.complete)
+
+    assert exc_info.value.status == 404
+    assert await todos.redis.exists("todos:missing") == 0
+
+
+async def test_concurrent_updates_only_touch_status_fields():
+    created_todo = await todos.create(None, "Take out the trash")
+
+    await asyncio.gather(
+        todos.update(created_todo.id, TodoStatus.in_progress),
+        todos.update(created_todo.id, TodoStatus.complete),
+    )
+    read_todo = await todos.one(created_todo.id)
+
+    assert read_todo.name == "Take out the trash"
+    assert read_todo.created_date == created_todo.value.created_date
+    assert read_todo.status in {TodoStatus.in_progress, TodoStatus.complete}
+
+
+async def test_index_alias_points_at_versioned_index():
+    info = await todos.index_info(todos.index)
+
+    assert info is not None
+    assert info["index_name"] == todos.versioned_index
+
+
+async def test_search_by_status_tag():
+    await todos.create("first", "First")
+    await todos.create("second", "Second")
+    await todos.update("second", TodoStatus.in_progress)
+
+    result = await todos.search(None, TodoStatus.in_progress)
+
+    assert result.total == 1
+    assert result.documents[0].id == "todos:second"
+
+
+async def test_search_match_modes_and_count_only():
+    await todos.create(None, "Buy groceries")
+    await todos.create(None, "Buy (more) groceries!")
+    await todos.create(None, "Walk the dog")
+
+    assert (await todos.search("groc", None, "prefix")).total == 2
+    assert (await todos.search("grocerie", None, "fuzzy")).total == 2
+    assert (await todos.search("more groceries", None, "exact")).total == 1
+    assert (await todos.search("-dog | *", None)).total == 1
+
+    counted = await todos.search("buy", None, limit=0)
+
+    assert counted.total == 2
+    assert counted.documents == []
+
+
+async def test_migrates_unversioned_index_and_backfills_timestamps():
+    await todos.drop_index()
+    await todos.redis.ft(todos.index).create_index(
+        [TextField("$.name", as_name="name"), TextField("$.status", as_name="status")],
+        definition=IndexDefinition(prefix=[TODOS_PREFIX], index_type=IndexType.JSON),
+    )
+    await todos.redis.json().set(
+        "todos:legacy",
+        "$",
+        {
+            "name": "Legacy",
+            "status": "todo",
+            "createdDate": "2024-01-01T00:00:00Z",
+            "updatedDate": "2024-01-02T00:00:00Z",
+        },
+    )
+
+    await todos.initialize()
+    info = await todos.index_info(todos.index)
+    legacy = await todos.redis.json().get("todos:legacy")
+
+    assert info is not None
+    assert info["index_name"] == todos.versioned_index
+    assert legacy["createdTimestamp"] == 1704067200000
+    assert legacy["updatedTimestamp"] == 1704153600000
+    assert (await todos.all()).total == 1
+
+
 async def test_crud_for_multiple_todos():
     all_todo_names = [
         "Take out the trash",
@@ -57,3 +155,227 @@ async def test_crud_for_multiple_todos():
 
     for todo in all_todos.documents:
         assert todo.value.name in all_todo_names
+
+
+async def test_page_through_all_todos():
+    await asyncio.gather(*(todos.create(None, f"Todo {i}") for i in range(5)))
+
+    first_page = await todos.all(limit=3)
+
+    assert first_page.total == 5
+    assert len(first_page.documents) == 3
+    assert first_page.cursor is not None
+
+    second_page = await todos.all(limit=3, cursor=int(first_page.cursor))
+
+    assert len(second_page.documents) == 2
+    assert second_page.cursor is None
+
+    ids = {todo.id for todo in first_page.documents + second_page.documents}
+
+    assert len(ids) == 5
+
+
+async def test_stream_all_todos_in_batches():
+    await asyncio.gather(*(todos.create(None, f"Todo {i}") for i in range(5)))
+
+    streamed = [todo async for todo in todos.stream_all(batch_size=2)]
+
+    assert len(streamed) == 5
+    assert {todo.value.name for todo in streamed} == {f"Todo {i}" for i in range(5)}
+
+
+async def test_batch_create_update_and_delete():
+    created = await todos.create_many([(None, "One"), ("two", "Two")])
+
+    assert [result.status for result in created.results] == [200, 200]
+    assert created.results[1].id == "todos:two"
+
+    updated = await todos.update_many(
+        [("two", TodoStatus.complete), ("missing", TodoStatus.complete)],
+        atomic=True,
+    )
+
+    assert updated.results[0].status == 200
+    assert updated.results[0].value is not None
+    assert updated.results[0].value.status == TodoStatus.complete
+    assert updated.results[1].status == 404
+    assert await todos.redis.exists("todos:missing") == 0
+
+    deleted = await todos.delete_many([created.results[0].id, "two", "missing"])
+
+    assert [result.status for result in deleted.results] == [200, 200, 404]
+
+
+async def test_raw_json_pages_match_validated_pages():
+    await asyncio.gather(*(todos.create(None, f"Todo {i}") for i in range(3)))
+
+    validated = await todos.all(limit=2)
+    raw = json.loads(await todos.all_json(limit=2))
+
+    assert raw["total"] == validated.total
+    assert raw["cursor"] == validated.cursor
+    assert [todo["id"] for todo in raw["documents"]] == [
+        todo.id for todo in validated.documents
+    ]
+    assert [todo["value"]["name"] for todo in raw["documents"]] == [
+        todo.value.name for todo in validated.documents
+    ]
+
+
+async def test_stats_count_todos_per_status_and_day():
+    created = await asyncio.gather(*(todos.create(None, f"Todo {i}") for i in range(4)))
+    await todos.update(created[0].id, TodoStatus.complete)
+    await todos.update(created[1].id, TodoStatus.in_progress)
+
+    stats = await todos.stats()
+
+    assert stats.total == 4
+    assert stats.counts == {
+        TodoStatus.todo: 2,
+        TodoStatus.in_progress: 1,
+        TodoStatus.complete: 1,
+    }
+    assert stats.buckets is None
+
+    by_day = await todos.stats(bucket="day", date_field="updatedDate")
+
+    assert by_day.buckets is not None
+    assert len(by_day.buckets) == 1
+    assert by_day.buckets[0].total == 4
+    assert by_day.buckets[0].counts == stats.counts
+    assert by_day.buckets[0].start.hour == 0
+
+
+async def test_search_cache_is_invalidated_by_writes():
+    todos.search_cache = MemorySearchCache(max_size=10)
+
+    try:
+        await todos.create(None, "Buy milk")
+        first = json.loads(await todos.search_json("milk", None))
+        assert json.loads(await todos.search_json("milk", None)) == first
+
+        await todos.create(None, "Buy more milk")
+
+        assert json.loads(await todos.search_json("milk", None))["total"] == 2
+    finally:
+        todos.search_cache = None
+
+
+async def test_change_feed_streams_and_resumes_writes():
+    todos.changes = ChangeFeed(todos.redis, max_length=100, block_ms=100)
+
+    try:
+        events = await todos.changes.subscribe()
+        created = await todos.create(None, "Walk the dog")
+        await todos.update(created.id, TodoStatus.complete)
+
+        first = await anext(events)
+        second = await anext(events)
+        await events.aclose()
+
+        assert first is not None and second is not None
+        assert (first[1].op, first[1].id, first[1].status) == (
+            "create",
+            created.id,
+            "todo",
+        )
+        assert (second[1].op, second[1].status) == ("update", "complete")
+
+        resumed = await todos.changes.subscribe(first[0])
+        replayed = await anext(resumed)
+        await resumed.aclose()
+
+        assert replayed is not None
+        assert replayed[0] == second[0]
+    finally:
+        await todos.changes.stop()
+        await todos.redis.delete(todos.changes.key)
+        todos.changes = None
+
+
+async def test_many_gets_todos_and_reports_missing_ones():
+    first = await todos.create(None, "One")
+    second = await todos.create(None, "Two")
+
+    batch = await todos.many(
+        [second.id, "missing", first.id.removeprefix(TODOS_PREFIX)]
+    )
+
+    assert [result.status for result in batch.results] == [200, 404, 200]
+    assert batch.results[0].value == second.value
+    assert batch.results[1].id == f"{TODOS_PREFIX}missing"
+    assert batch.results[2].value == first.value
+
+
+async def test_delete_all_purges_in_batches():
+    await todos.create_many([(None, f"Todo {i}") for i in range(25)])
+    batch_size, concurrency = todos.purge_batch_size, todos.purge_concurrency
+    todos.purge_batch_size, todos.purge_concurrency = 10, 2
+    progress: list[int] = []
+
+    try:
+        deleted = await todos.delete_all(progress.append)
+    finally:
+        todos.purge_batch_size, todos.purge_concurrency = batch_size, concurrency
+
+    assert deleted == 25
+    assert progress[-1] == 25
+    assert (await todos.all()).total == 0
+
+
+async def test_hash_encoding_supports_the_same_operations():
+    store = TodoStore(todos.redis, encoding=HashEncoding())
+    store.prefix = "todos-hash-test:"
+    store.index = "todos-hash-test-idx"
+    await store.initialize()
+
+    try:
+        created = await store.create(None, "Feed the cat")
+        await store.update(created.id, TodoStatus.complete)
+
+        read = await store.one(created.id)
+        found = await store.search("cat", TodoStatus.complete)
+        exported = [todo async for todo in store.stream_all()]
+        batch = await store.many([created.id, "missing"])
+
+        assert read.name == "Feed the cat"
+        assert read.status == TodoStatus.complete
+        assert found.total == 1
+        assert found.documents[0].value == read
+        assert [todo.id for todo in exported] == [created.id]
+        assert [result.status for result in batch.results] == [200, 404]
+
+        await store.delete(created.id)
+
+        with pytest.raises(ClientError):
+            await store.one(created.id)
+    finally:
+        await store.delete_all()
+        await store.drop_index()
+
+
+async def test_archive_moves_old_completed_todos_out_of_the_index():
+    old = await todos.create(None, "Old chore")
+    recent = await todos.create(None, "Recent chore")
+    await todos.create(None, "Open chore")
+    await todos.update(old.id, TodoStatus.complete)
+    await asyncio.sleep(0.01)
+    cutoff = datetime.now(UTC)
+    await asyncio.sleep(0.01)
+    await todos.update(recent.id, TodoStatus.complete)
+
+    try:
+        assert await todos.archive_completed(cutoff) == 1
+
+        archived = await todos.archived()
+
+        assert [todo.id for todo in archived.documents] == [old.id]
+        assert archived.documents[0].value.status == TodoStatus.complete
+        assert archived.cursor is None
+        assert (await todos.search("chore", None)).total == 2
+
+        with pytest.raises(ClientError):
+            await todos.one(old.id)
+    finally:
+        await todos.redis.delete(TODOS_ARCHIVE_KEY)
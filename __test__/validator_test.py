@@ -2,10 +2,18 @@ import pytest
 from pydantic import ValidationError
 
 from app.components.todos.validator import (
+    ArchivedTodosQuery,
+    BatchTodosQuery,
     CreateTodoBody,
+    CreateTodosBody,
+    DeleteTodosBody,
+    ListTodosQuery,
+    MultiGetTodosQuery,
     SearchTodosQuery,
     TodoIdParams,
+    TodoStatsQuery,
     UpdateTodoBody,
+    UpdateTodosBody,
 )
 
 
@@ -51,6 +59,26 @@ def test_update_todo_body_rejects_invalid_status():
         UpdateTodoBody.model_validate({"status": "invalid"})
 
 
+def test_list_todos_query_defaults_to_first_page():
+    result = ListTodosQuery.model_validate({})
+
+    assert result.limit == 10
+    assert result.cursor == 0
+
+
+def test_list_todos_query_parses_string_params():
+    result = ListTodosQuery.model_validate({"limit": "25", "cursor": "50"})
+
+    assert result.limit == 25
+    assert result.cursor == 50
+
+
+@pytest.mark.parametrize("query", [{"limit": "0"}, {"limit": "5000"}, {"cursor": "-1"}])
+def test_list_todos_query_rejects_out_of_range_params(query: dict[str, str]):
+    with pytest.raises(ValidationError):
+        ListTodosQuery.model_validate(query)
+
+
 def test_search_todos_query_accepts_empty_query():
     result = SearchTodosQuery.model_validate({})
 
@@ -66,3 +94,119 @@ def test_todo_id_params_rejects_empty_id():
 def test_todo_id_params_rejects_missing_id():
     with pytest.raises(ValidationError):
         TodoIdParams.model_validate({})
+
+
+def test_create_todos_body_validates_every_item():
+    result = CreateTodosBody.model_validate([{"name": "One"}, {"name": "Two"}])
+
+    assert [todo.name for todo in result.root] == ["One", "Two"]
+
+    with pytest.raises(ValidationError, match="Todo must have a name"):
+        CreateTodosBody.model_validate([{"name": "One"}, {"name": ""}])
+
+
+def test_create_todos_body_rejects_empty_batch():
+    with pytest.raises(ValidationError):
+        CreateTodosBody.model_validate([])
+
+
+def test_update_todos_body_requires_id_and_status():
+    result = UpdateTodosBody.model_validate([{"id": "abc", "status": "complete"}])
+
+    assert result.root[0].id == "abc"
+    assert result.root[0].status.value == "complete"
+
+    with pytest.raises(ValidationError):
+        UpdateTodosBody.model_validate([{"status": "complete"}])
+
+
+def test_delete_todos_body_rejects_empty_ids():
+    with pytest.raises(ValidationError):
+        DeleteTodosBody.model_validate(["abc", ""])
+
+
+def test_batch_todos_query_parses_atomic_flag():
+    assert BatchTodosQuery.model_validate({}).atomic is False
+    assert BatchTodosQuery.model_validate({"atomic": "true"}).atomic is True
+
+
+def test_todo_stats_query_defaults_to_no_buckets_on_created_date():
+    parsed = TodoStatsQuery.model_validate({})
+
+    assert parsed.bucket is None
+    assert parsed.date == "createdDate"
+
+
+def test_todo_stats_query_rejects_unknown_date_field():
+    with pytest.raises(ValidationError):
+        TodoStatsQuery.model_validate({"bucket": "day", "date": "dueDate"})
+
+
+def test_search_todos_query_rejects_names_without_words():
+    with pytest.raises(ValidationError):
+        SearchTodosQuery.model_validate({"name": "*-|"})
+
+
+def test_search_todos_query_parses_match_and_limit():
+    parsed = SearchTodosQuery.model_validate({"match": "prefix", "limit": "0"})
+
+    assert parsed.match == "prefix"
+    assert parsed.limit == 0
+
+
+def test_search_todos_query_parses_sorting_and_dates():
+    parsed = SearchTodosQuery.model_validate(
+        {
+            "sort_by": "updatedDate",
+            "order": "desc",
+            "cursor": "20",
+            "created_after": "2024-01-01T00:00:00",
+        }
+    )
+    filters = parsed.filters()
+
+    assert parsed.cursor == 20
+    assert filters.sort_by == "updatedDate"
+    assert filters.order == "desc"
+    assert filters.created_after is not None
+    assert filters.created_after.utcoffset() is not None
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"sort_by": "name"},
+        {"order": "up"},
+        {"created_after": "2024-02-01", "created_before": "2024-01-01"},
+        {"updated_after": "2024-01-01", "updated_before": "2024-01-01"},
+    ],
+)
+def test_search_todos_query_rejects_invalid_sorting_and_dates(
+    query: dict[str, str],
+):
+    with pytest.raises(ValidationError):
+        SearchTodosQuery.model_validate(query)
+
+
+def test_multi_get_todos_query_splits_ids():
+    parsed = MultiGetTodosQuery.model_validate({"ids": "a, b,,todos:c"})
+
+    assert parsed.ids == ["a", "b", "todos:c"]
+
+
+def test_multi_get_todos_query_rejects_empty_ids():
+    with pytest.raises(ValidationError):
+        MultiGetTodosQuery.model_validate({"ids": ","})
+
+
+def test_archived_todos_query_parses_cursor_and_batches():
+    parsed = ArchivedTodosQuery.model_validate({"cursor": "1718000000000-3"})
+
+    assert parsed.cursor == "1718000000000-3"
+    assert parsed.batches == 1
+
+    with pytest.raises(ValidationError):
+        ArchivedTodosQuery.model_validate({"cursor": "-"})
+
+    with pytest.raises(ValidationError):
+        ArchivedTodosQuery.model_validate({"batches": 0})
@@ -0,0 +1,405 @@
+"""HTTP load generator for the todos API.
+
+Seeds a dataset through the batch endpoint, then runs a weighted mix of
+create/one/update/search/all/delete requests from concurrent workers and prints
+per-operation throughput and latency percentiles as JSON. By default requests go
+to the app in-process (ASGI transport) against `REDIS_URL`; pass `--url` to load
+a running server instead.
+
+The run seeds and then deletes todos wherever `REDIS_URL` points, so it refuses
+a Redis that is not on this machine unless `--force` is passed. With
+`--redis-server` it starts a throwaway `redis-stack-server` on a free local
+port and stops it afterwards.
+
+    PYTHONPATH=src python bench/load.py --redis-server --todos 10000
+    PYTHONPATH=src python bench/load.py --baseline bench_baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from time import monotonic, perf_counter, sleep
+from typing import Any
+from urllib.parse import urlparse
+
+import httpx
+
+OPERATIONS = ("create", "one", "update", "search", "all", "delete")
+DEFAULT_MIX = "create=1,one=10,update=2,search=4,all=2,delete=1"
+WORDS = ("laundry", "dishes", "groceries", "taxes", "garden", "garage", "email")
+STATUSES = ("todo", "in progress", "complete")
+SEED_BATCH_SIZE = 1000
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+REDIS_SERVER_START_TIMEOUT = 10.0
+
+
+@dataclass
+class OperationStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+
+        return {
+            "count": len(latencies),
+            "errors": self.errors,
+            "rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+        }
+
+
+def _percentile(latencies: list[float], percent: float) -> float | None:
+    if len(latencies) == 0:
+        return None
+
+    rank = max(0, math.ceil(percent / 100 * len(latencies)) - 1)
+    return round(latencies[rank] * 1000, 3)
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix: dict[str, int] = {}
+
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation {name!r}")
+
+        mix[name] = int(weight or 1)
+
+    if sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("The mix needs at least one positive weight")
+
+    return mix
+
+
+def is_local_redis(url: str) -> bool:
+    parsed = urlparse(url)
+    return parsed.scheme == "unix" or parsed.hostname in LOCAL_HOSTS
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@contextmanager
+def local_redis_server() -> Iterator[str]:
+    """Runs a throwaway redis-stack-server without persistence, yielding its URL"""
+    executable = shutil.which("redis-stack-server")
+
+    if executable is None:
+        raise SystemExit("--redis-server needs redis-stack-server on the PATH")
+
+    port = _free_port()
+
+    with tempfile.TemporaryDirectory() as directory:
+        process = subprocess.Popen(
+            [
+                executable,
+                *("--bind", "127.0.0.1", "--port", str(port), "--dir", directory),
+                *("--save", "", "--appendonly", "no"),
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+
+        try:
+            deadline = monotonic() + REDIS_SERVER_START_TIMEOUT
+
+            while True:
+                if process.poll() is not None:
+                    raise SystemExit("redis-stack-server exited on startup")
+
+                try:
+                    socket.create_connection(("127.0.0.1", port), 0.1).close()
+                    break
+                except OSError:
+                    if monotonic() > deadline:
+                        raise SystemExit("redis-stack-server did not start") from None
+
+                    sleep(0.05)
+
+            yield f"redis://127.0.0.1:{port}"
+        finally:
+            process.terminate()
+            process.wait(REDIS_SERVER_START_TIMEOUT)
+
+
+@asynccontextmanager
+async def open_client(url: str | None) -> AsyncIterator[httpx.AsyncClient]:
+    if url is not None:
+        async with httpx.AsyncClient(base_url=url, timeout=30) as client:
+            yield client
+        return
+
+    # Keep access logs from dominating the run when the app is in-process.
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://bench",
+            timeout=30,
+        ) as client:
+            yield client
+
+
+class LoadRun:
+    def __init__(self, client: httpx.AsyncClient, args: argparse.Namespace):
+        self.client = client
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.ids: list[str] = []
+        self.created = 0
+        self.stats = {name: OperationStats() for name in OPERATIONS}
+
+    def _name(self) -> str:
+        self.created += 1
+        return f"{self.random.choice(WORDS)} bench {self.created}"
+
+    async def seed(self) -> None:
+        for start in range(0, self.args.todos, SEED_BATCH_SIZE):
+            count = min(SEED_BATCH_SIZE, self.args.todos - start)
+            response = await self.client.post(
+                "/api/todos/batch",
+                json=[{"name": self._name()} for _ in range(count)],
+            )
+            response.raise_for_status()
+            self.ids.extend(result["id"] for result in response.json()["results"])
+
+    async def cleanup(self) -> None:
+        for start in range(0, len(self.ids), SEED_BATCH_SIZE):
+            await self.client.request(
+                "DELETE",
+                "/api/todos/batch",
+                json=self.ids[start : start + SEED_BATCH_SIZE],
+            )
+
+    def _request(self, operation: str) -> tuple[str, str, dict[str, Any]] | None:
+        if operation == "create":
+            return "POST", "/api/todos", {"json": {"name": self._name()}}
+
+        if operation == "search":
+            params = (
+                {"name": self.random.choice(WORDS)}
+                if self.random.random() < 0.5
+                else {"status": self.random.choice(STATUSES)}
+            )
+            return "GET", "/api/todos/search", {"params": params}
+
+        if operation == "all":
+            return "GET", "/api/todos", {"params": {"limit": self.args.page_size}}
+
+        if len(self.ids) == 0:
+            return None
+
+        if operation == "delete":
+            todo_id = self.ids.pop(self.random.randrange(len(self.ids)))
+            return "DELETE", f"/api/todos/{todo_id}", {}
+
+        todo_id = self.random.choice(self.ids)
+
+        if operation == "update":
+            body = {"status": self.random.choice(STATUSES)}
+            return "PATCH", f"/api/todos/{todo_id}", {"json": body}
+
+        return "GET", f"/api/todos/{todo_id}", {}
+
+    async def worker(self, deadline: float, operations: list[str]) -> None:
+        weights = [self.args.mix[name] for name in operations]
+
+        while perf_counter() < deadline:
+            operation = self.random.choices(operations, weights)[0]
+            request = self._request(operation)
+
+            if request is None:
+                await asyncio.sleep(0)
+                continue
+
+            method, path, options = request
+            stats = self.stats[operation]
+            start = perf_counter()
+
+            try:
+                response = await self.client.request(method, path, **options)
+            except httpx.HTTPError:
+                stats.errors += 1
+                continue
+
+            # A todo deleted by another worker is a 404, not a server failure.
+            if response.status_code >= 500:
+                stats.errors += 1
+                continue
+
+            stats.latencies.append(perf_counter() - start)
+
+            if operation == "create" and response.status_code == 200:
+                self.ids.append(response.json()["id"])
+
+    async def run(self) -> dict[str, Any]:
+        operations = [name for name, weight in self.args.mix.items() if weight > 0]
+        start = perf_counter()
+        deadline = start + self.args.duration
+        await asyncio.gather(
+            *(self.worker(deadline, operations) for _ in range(self.args.concurrency))
+        )
+        elapsed = perf_counter() - start
+        summaries = {
+            name: self.stats[name].summary(elapsed)
+            for name in operations
+            if len(self.stats[name].latencies) > 0 or self.stats[name].errors > 0
+        }
+        total = OperationStats(
+            latencies=[
+                latency for stats in self.stats.values() for latency in stats.latencies
+            ],
+            errors=sum(stats.errors for stats in self.stats.values()),
+        )
+
+        return {
+            "config": {
+                "todos": self.args.todos,
+                "concurrency": self.args.concurrency,
+                "duration": self.args.duration,
+                "mix": self.args.mix,
+                "target": self.args.url or "in-process",
+            },
+            "operations": summaries,
+            "total": total.summary(elapsed),
+        }
+
+
+def find_regressions(
+    report: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+    """Lists operations whose p95/p99 grew, or whose req/s fell, past threshold"""
+    regressions: list[str] = []
+
+    for name, current in {"total": report["total"], **report["operations"]}.items():
+        previous = (
+            baseline["total"] if name == "total" else baseline["operations"].get(name)
+        )
+
+        if previous is None:
+            continue
+
+        for metric in ("p95", "p99"):
+            if current[metric] is None or previous[metric] is None:
+                continue
+
+            if current[metric] > previous[metric] * (1 + threshold):
+                regressions.append(
+                    f"{name} {metric} {current[metric]}ms > {previous[metric]}ms"
+                )
+
+        if current["rps"] < previous["rps"] * (1 - threshold):
+            regressions.append(f"{name} rps {current['rps']} < {previous['rps']}")
+
+    return regressions
+
+
+async def benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    async with open_client(args.url) as client:
+        load = LoadRun(client, args)
+        await load.seed()
+
+        try:
+            return await load.run()
+        finally:
+            if not args.keep:
+                await load.cleanup()
+
+
+async def main(args: argparse.Namespace) -> int:
+    if args.url is None and args.redis_server:
+        with local_redis_server() as redis_url:
+            os.environ["REDIS_URL"] = redis_url
+            report = await benchmark(args)
+    else:
+        if args.url is None and not args.force:
+            from app.config import get_settings
+
+            settings = get_settings()
+
+            if settings.todos_backend == "redis" and not is_local_redis(
+                settings.redis_url
+            ):
+                print(
+                    f"Refusing to seed and delete todos on {settings.redis_url}; "
+                    "use --redis-server, or --force if that Redis is disposable",
+                    file=sys.stderr,
+                )
+                return 2
+
+        report = await benchmark(args)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            file.write(output)
+
+    if args.baseline is None:
+        return 0
+
+    with open(args.baseline) as file:
+        regressions = find_regressions(report, json.load(file), args.max_regression)
+
+    for regression in regressions:
+        print(f"Regression: {regression}", file=sys.stderr)
+
+    return 1 if len(regressions) > 0 else 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Load a running server instead of the app")
+    parser.add_argument(
+        "--redis-server",
+        action="store_true",
+        help="Run the app against a throwaway local redis-stack-server",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Allow a REDIS_URL that is not on this machine",
+    )
+    parser.add_argument("--todos", type=int, default=1000, help="Todos to seed")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="Keep seeded todos")
+    parser.add_argument("--output", help="Also write the JSON report here")
+    parser.add_argument("--baseline", help="Report to compare against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Allowed fractional slowdown against the baseline",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,146 @@
+"""Measures the cost of encoding a page of todos into an HTTP response.
+
+Compares FastAPI's response-model path (validate + encode the returned model)
+with the pre-serialized path the list and search routes use, and with the raw
+JSON path enabled by TODOS_RAW_JSON. No Redis server is needed.
+
+    PYTHONPATH=src python bench/serialization.py --documents 1000
+"""
+
+import argparse
+import json
+from datetime import UTC, datetime
+from time import perf_counter
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from redis.commands.search.document import Document
+from redis.commands.search.result import Result
+
+from app.components.todos.encoding import JsonEncoding
+from app.components.todos.store import (
+    Todo,
+    TodoDocument,
+    Todos,
+    TodoStatus,
+    TodoStore,
+)
+from app.redis import get_client
+
+
+def _documents(count: int) -> list[Document]:
+    now = datetime.now(UTC)
+    encoding = JsonEncoding()
+
+    return [
+        Document(
+            f"todos:{index}",
+            json=json.dumps(
+                encoding.serialize(
+                    Todo(
+                        name=f"Todo {index}",
+                        status=TodoStatus.todo,
+                        created_date=now,
+                        updated_date=now,
+                    )
+                )
+            ),
+        )
+        for index in range(count)
+    ]
+
+
+def _app(count: int) -> FastAPI:
+    store = TodoStore(get_client())
+    docs = _documents(count)
+    result = Result.__new__(Result)
+    result.total = count
+    result.docs = docs
+    todos = Todos(total=count, documents=store.deserialize_todo_documents(docs))
+    app = FastAPI()
+
+    @app.get("/baseline")
+    async def baseline() -> Response:
+        return Response(b"{}", media_type="application/json")
+
+    @app.get("/response-model")
+    async def response_model() -> Todos:
+        return todos
+
+    @app.get("/pre-serialized", response_model=Todos)
+    async def pre_serialized() -> Response:
+        return Response(todos.model_dump_json().encode(), media_type="application/json")
+
+    @app.get("/raw-json", response_model=Todos)
+    async def raw_json() -> Response:
+        return Response(store.encode_todos(result), media_type="application/json")
+
+    @app.get("/per-document-decode", response_model=Todos)
+    async def per_document_decode() -> Response:
+        decoded = Todos(
+            total=count,
+            documents=[
+                TodoDocument(id=doc.id, value=Todo.model_validate_json(doc.json))
+                for doc in docs
+            ],
+        )
+        return Response(
+            decoded.model_dump_json().encode(), media_type="application/json"
+        )
+
+    @app.get("/batched-decode", response_model=Todos)
+    async def batched_decode() -> Response:
+        decoded = Todos(total=count, documents=store.deserialize_todo_documents(docs))
+        return Response(
+            decoded.model_dump_json().encode(), media_type="application/json"
+        )
+
+    return app
+
+
+def run(documents: int, iterations: int) -> dict[str, object]:
+    results: dict[str, object] = {"documents": documents, "iterations": iterations}
+
+    with TestClient(_app(documents)) as client:
+        baseline = 0.0
+
+        for path in (
+            "/baseline",
+            "/response-model",
+            "/pre-serialized",
+            "/raw-json",
+            "/per-document-decode",
+            "/batched-decode",
+        ):
+            client.get(path)
+            start = perf_counter()
+
+            for _ in range(iterations):
+                client.get(path).raise_for_status()
+
+            ms_per_request = (perf_counter() - start) * 1000 / iterations
+
+            if path == "/baseline":
+                baseline = ms_per_request
+
+            # Subtract the cost of an empty request to isolate the payload work.
+            results[path.strip("/")] = {
+                "msPerRequest": round(ms_per_request, 3),
+                "msPer1kDocuments": round(
+                    (ms_per_request - baseline) * 1000 / documents, 3
+                ),
+            }
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.documents, args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Compares the JSON and HASH todo encodings on a live Redis.
+
+For each encoding it seeds `--todos` todos into its own prefix and index,
+then reports `MEMORY USAGE` per todo (averaged over `--samples` keys), index
+memory from `FT.INFO`, seeding and indexing time, and the latency of
+create/one/update/search/delete through `TodoStore`. Everything it writes is
+deleted afterwards.
+
+    PYTHONPATH=src python bench/storage.py --todos 100000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from time import perf_counter
+from typing import Any
+
+from load import OperationStats
+
+from app.components.todos.encoding import ENCODINGS, create_encoding
+from app.components.todos.store import MAX_BATCH_SIZE, TodoStatus, TodoStore
+from app.redis import get_client
+
+OPERATIONS = ("create", "one", "update", "search", "delete")
+WORDS = ("laundry", "dishes", "groceries", "taxes", "garden", "garage", "email")
+# FT.INFO sizes, in megabytes, that together make up the index's memory.
+INDEX_SIZE_FIELDS = (
+    "inverted_sz_mb",
+    "offset_vectors_sz_mb",
+    "doc_table_size_mb",
+    "sortable_values_size_mb",
+    "key_table_size_mb",
+)
+
+
+class StorageRun:
+    def __init__(self, encoding: str, args: argparse.Namespace):
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.store = TodoStore(get_client(), encoding=create_encoding(encoding))
+        # Keep each encoding, and the app's own todos, in separate keyspaces.
+        self.store.prefix = f"bench-{encoding}:"
+        self.store.index = f"bench-{encoding}-idx"
+        self.ids: list[str] = []
+
+    def _name(self) -> str:
+        return f"{self.random.choice(WORDS)} bench {len(self.ids)}"
+
+    async def seed(self) -> dict[str, float]:
+        start = perf_counter()
+
+        for offset in range(0, self.args.todos, MAX_BATCH_SIZE):
+            count = min(MAX_BATCH_SIZE, self.args.todos - offset)
+            batch = await self.store.create_many(
+                [(None, self._name()) for _ in range(count)]
+            )
+            self.ids.extend(result.id for result in batch.results)
+
+        written = perf_counter() - start
+        await self.store.wait_for_indexing(self.store.versioned_index)
+
+        return {
+            "seedSeconds": round(written, 3),
+            "indexedSeconds": round(perf_counter() - start, 3),
+        }
+
+    async def memory(self) -> dict[str, Any]:
+        sample = self.random.sample(self.ids, min(self.args.samples, len(self.ids)))
+        pipeline = self.store.redis.pipeline(transaction=False)
+
+        for key in sample:
+            pipeline.memory_usage(key, samples=0)
+
+        usages = [usage for usage in await pipeline.execute() if usage is not None]
+        info = await self.store.index_info(self.store.index) or {}
+        index_mb = sum(float(info.get(field, 0)) for field in INDEX_SIZE_FIELDS)
+
+        return {
+            "bytesPerTodo": round(sum(usages) / len(usages), 1) if usages else None,
+            "indexMb": round(index_mb, 3),
+            "indexBytesPerTodo": round(index_mb * 1024 * 1024 / len(self.ids), 1),
+        }
+
+    async def operation(self, name: str) -> None:
+        if name == "create":
+            created = await self.store.create(None, self._name())
+            self.ids.append(created.id)
+        elif name == "one":
+            await self.store.one(self.random.choice(self.ids))
+        elif name == "update":
+            status = self.random.choice(list(TodoStatus))
+            await self.store.update(self.random.choice(self.ids), status)
+        elif name == "search":
+            await self.store.search(self.random.choice(WORDS), None)
+        elif name == "delete":
+            await self.store.delete(self.ids.pop(self.random.randrange(len(self.ids))))
+
+    async def latencies(self) -> dict[str, Any]:
+        summaries: dict[str, Any] = {}
+
+        for name in OPERATIONS:
+            stats = OperationStats()
+            start = perf_counter()
+
+            for _ in range(self.args.operations):
+                operation_start = perf_counter()
+                await self.operation(name)
+                stats.latencies.append(perf_counter() - operation_start)
+
+            summaries[name] = stats.summary(perf_counter() - start)
+
+        return summaries
+
+    async def run(self) -> dict[str, Any]:
+        await self.store.initialize()
+
+        try:
+            seeded = await self.seed()
+            return {
+                **seeded,
+                **await self.memory(),
+                "operations": await self.latencies(),
+            }
+        finally:
+            await self.store.delete_all()
+            await self.store.drop_index()
+
+
+async def main(args: argparse.Namespace) -> None:
+    report: dict[str, Any] = {
+        "config": {
+            "todos": args.todos,
+            "samples": args.samples,
+            "operations": args.operations,
+        },
+    }
+
+    for encoding in args.encodings:
+        report[encoding] = await StorageRun(encoding, args).run()
+
+    output = json.dumps(report, indent=2)
+    print(output)
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            file.write(output)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--todos", type=int, default=10000, help="Todos to seed")
+    parser.add_argument("--samples", type=int, default=500, help="Keys to measure")
+    parser.add_argument("--operations", type=int, default=200, help="Per operation")
+    parser.add_argument(
+        "--encodings",
+        type=lambda value: value.split(","),
+        default=list(ENCODINGS),
+        help="Comma-separated encodings to compare",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report here")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,87 @@
+"""Cold storage for todos completed long ago.
+
+`TodoArchiver` periodically moves todos that were completed more than
+`older_than` ago out of the live keyspace and search index. Each run writes
+them in batches to the `todos-archive` stream, one entry per batch. An
+entry holds the batch as zlib-compressed JSON, base64-encoded because
+clients decode replies as text. Archived todos are never indexed; they can
+only be paged through in the order they were archived.
+"""
+
+import asyncio
+import zlib
+from base64 import b64decode, b64encode
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+from app.logger import get_component_logger
+from app.resilience import set_request_deadline
+
+TODOS_ARCHIVE_KEY = "todos-archive"
+ARCHIVE_INTERVAL = 3600.0
+ARCHIVE_BATCH_SIZE = 500
+MAX_ARCHIVE_PAGE_BATCHES = 10
+# Archives are written once and read rarely, so favour size over speed.
+COMPRESSION_LEVEL = 9
+logger = get_component_logger("todos")
+
+
+def pack(payload: bytes) -> str:
+    return b64encode(zlib.compress(payload, COMPRESSION_LEVEL)).decode()
+
+
+def unpack(blob: str) -> bytes:
+    return zlib.decompress(b64decode(blob))
+
+
+class TodoArchiver:
+    """Runs `archive(cutoff)` every `interval` seconds in the background,
+    where `cutoff` is `older_than` ago"""
+
+    def __init__(
+        self,
+        archive: Callable[[datetime], Awaitable[int]],
+        older_than: timedelta,
+        interval: float = ARCHIVE_INTERVAL,
+    ):
+        self.archive = archive
+        self.older_than = older_than
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    async def run_once(self) -> int:
+        archived = await self.archive(datetime.now(UTC) - self.older_than)
+
+        if archived > 0:
+            logger.info(f"Archived {archived} completed todos")
+
+        return archived
+
+    async def _run(self) -> None:
+        # The task inherits the context of whatever started it.
+        set_request_deadline(None)
+
+        while True:
+            try:
+                await self.run_once()
+            except Exception as exc:
+                logger.warning(f"Archiving todos failed: {exc}")
+
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
@@ -0,0 +1,139 @@
+import asyncio
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from redis.asyncio import Redis
+from redis.asyncio.connection import AbstractConnection
+
+from app.logger import get_component_logger
+
+if TYPE_CHECKING:
+    from app.components.todos.store import Todo
+
+INVALIDATE_CHANNEL = "__redis__:invalidate"
+RECONNECT_DELAY = 1.0
+logger = get_component_logger("todos")
+
+
+class TodoCache:
+    """Bounded LRU of todos kept fresh by Redis client tracking.
+
+    A dedicated connection enables `CLIENT TRACKING ... BCAST PREFIX <prefix>`,
+    redirected to itself, and subscribes to the invalidation channel, so any
+    client writing a tracked key evicts it here. While that connection is down
+    the cache is emptied and bypassed.
+
+    The connection is opened outside the client's pool, so it never takes one
+    of the pool's connections away from requests. Only RESP2 is supported,
+    since redis-py consumes RESP3 invalidation pushes without returning them.
+    """
+
+    def __init__(self, redis: Redis, prefix: str, max_size: int):
+        self.redis = redis
+        self.prefix = prefix
+        self.max_size = max_size
+        self.entries: OrderedDict[str, Todo] = OrderedDict()
+        self.epoch = 0
+        self.tracking = False
+        self._task: asyncio.Task[None] | None = None
+
+    def get(self, key: str) -> "Todo | None":
+        if not self.tracking:
+            return None
+
+        todo = self.entries.get(key)
+
+        if todo is not None:
+            self.entries.move_to_end(key)
+
+        return todo
+
+    def set(self, key: str, todo: "Todo", epoch: int) -> None:
+        # Skip values read before an invalidation that may have made them stale.
+        if not self.tracking or epoch != self.epoch:
+            return
+
+        self.entries[key] = todo
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, keys: list[str] | None = None) -> None:
+        self.epoch += 1
+
+        if keys is None:
+            self.entries.clear()
+            return
+
+        for key in keys:
+            self.entries.pop(key, None)
+
+    async def start(self) -> None:
+        if str(self.redis.connection_pool.connection_kwargs.get("protocol")) == "3":
+            logger.warning("The todo cache needs RESP2 connections; it is disabled")
+            return
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+    async def _subscribe(self, connection: AbstractConnection) -> None:
+        await connection.send_command("CLIENT", "ID")
+        client_id = await connection.read_response()
+        await connection.send_command(
+            "CLIENT",
+            "TRACKING",
+            "ON",
+            "REDIRECT",
+            client_id,
+            "BCAST",
+            "PREFIX",
+            self.prefix,
+        )
+        await connection.read_response()
+        await connection.send_command("SUBSCRIBE", INVALIDATE_CHANNEL)
+        await connection.read_response()
+
+    def _handle(self, message: Any) -> None:
+        if not isinstance(message, list) or len(message) == 0:
+            return
+
+        if message[0] == "message" and message[1] == INVALIDATE_CHANNEL:
+            self.invalidate(message[2])
+
+    async def _listen(self) -> None:
+        pool = self.redis.connection_pool
+
+        while True:
+            connection = pool.make_connection()
+
+            try:
+                await connection.connect()
+                await self._subscribe(connection)
+                self.invalidate()
+                self.tracking = True
+                logger.debug(f"Tracking {self.prefix}* for the todo cache")
+
+                while True:
+                    self._handle(await connection.read_response(timeout=None))
+            except Exception as exc:
+                logger.warning(f"Todo cache invalidation stream failed: {exc}")
+            finally:
+                self.tracking = False
+                self.invalidate()
+                await connection.disconnect()
+
+            await asyncio.sleep(RECONNECT_DELAY)
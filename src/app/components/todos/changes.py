@@ -0,0 +1,280 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel
+
+from app.config import Settings
+from app.errors import ServiceUnavailableError
+from app.logger import get_component_logger
+from app.redis import RedisClient, parse_stream_id
+from app.resilience import set_request_deadline
+
+TODOS_CHANGES_KEY = "todos-changes"
+# Longest a shared XREAD waits for new entries before it is reissued.
+CHANGES_BLOCK_MS = 5000
+CHANGES_READ_COUNT = 100
+SUBSCRIBER_QUEUE_SIZE = 1000
+RECONNECT_DELAY = 1.0
+logger = get_component_logger("todos")
+
+ChangeOp = Literal["create", "update", "delete", "archive", "clear"]
+
+
+class TodoChange(BaseModel):
+    op: ChangeOp
+    id: str | None = None
+    status: str | None = None
+    timestamp: int
+
+    @classmethod
+    def now(
+        cls, op: ChangeOp, todo_id: str | None = None, status: str | None = None
+    ) -> "TodoChange":
+        timestamp = int(datetime.now(UTC).timestamp() * 1000)
+        return cls(op=op, id=todo_id, status=status, timestamp=timestamp)
+
+    def fields(self) -> dict[str, str | int]:
+        """Compact stream entry fields, leaving out the ones that are unset"""
+        fields: dict[str, str | int] = {"op": self.op, "ts": self.timestamp}
+
+        if self.id is not None:
+            fields["id"] = self.id
+
+        if self.status is not None:
+            fields["status"] = self.status
+
+        return fields
+
+    @classmethod
+    def from_fields(cls, fields: dict[str, str]) -> "TodoChange":
+        return cls.model_validate(
+            {
+                "op": fields["op"],
+                "id": fields.get("id"),
+                "status": fields.get("status"),
+                "timestamp": fields["ts"],
+            }
+        )
+
+
+StreamEntry = tuple[str, TodoChange]
+
+
+def _stream_entries(reply: Any) -> list[tuple[str, dict[str, str]]]:
+    # RESP2 replies are [[key, entries]], RESP3 replies are {key: [entries]}.
+    streams = reply.values() if isinstance(reply, dict) else (s[1] for s in reply)
+    entries: list[tuple[str, dict[str, str]]] = []
+
+    for stream in streams:
+        # RESP3 nests a stream's entries in one more list.
+        if len(stream) > 0 and isinstance(stream[0], list):
+            stream = stream[0]
+
+        entries.extend(stream)
+
+    return entries
+
+
+class Subscription:
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[StreamEntry] = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        # Set when the subscriber fell too far behind and was dropped.
+        self.closed = False
+
+
+class ChangeFeed:
+    """Todo mutations appended to a Redis stream and fanned out in process.
+
+    One background task per process follows the stream with a blocking XREAD
+    and copies every entry into each subscriber's bounded queue, so Redis sees
+    one reader no matter how many clients are subscribed. A subscriber that
+    cannot keep up is dropped rather than buffered without limit. It can
+    resume from the last ID it received.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        max_length: int,
+        block_ms: int = CHANGES_BLOCK_MS,
+        key: str = TODOS_CHANGES_KEY,
+    ):
+        self.redis = redis
+        self.key = key
+        self.max_length = max_length
+        self.block_ms = block_ms
+        self.subscriptions: set[Subscription] = set()
+        self.ready = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def entry_args(self, change: TodoChange) -> dict[str, Any]:
+        return {
+            "name": self.key,
+            "fields": change.fields(),
+            "maxlen": self.max_length,
+            "approximate": True,
+        }
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+        self.ready.clear()
+
+    def publish(self, entry: StreamEntry) -> None:
+        for subscription in list(self.subscriptions):
+            try:
+                subscription.queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                logger.warning("Dropping a todo change subscriber that fell behind")
+                subscription.closed = True
+                self.subscriptions.discard(subscription)
+
+    async def _latest_id(self) -> str:
+        entries = await self.redis.xrevrange(self.key, count=1)
+        return entries[0][0] if len(entries) > 0 else "0-0"
+
+    async def _listen(self) -> None:
+        # The task inherits the context of the request that started it.
+        set_request_deadline(None)
+        last_id: str | None = None
+
+        while True:
+            try:
+                if last_id is None:
+                    last_id = await self._latest_id()
+                    self.ready.set()
+
+                reply = await self.redis.xread(
+                    {self.key: last_id},
+                    count=CHANGES_READ_COUNT,
+                    block=self.block_ms,
+                )
+            except Exception as exc:
+                logger.warning(f"Todo change feed read failed: {exc}")
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+
+            for entry_id, fields in _stream_entries(reply or []):
+                last_id = entry_id
+                self.publish((entry_id, TodoChange.from_fields(fields)))
+
+    async def _start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+        try:
+            await asyncio.wait_for(self.ready.wait(), self.block_ms / 1000)
+        except TimeoutError:
+            raise ServiceUnavailableError(
+                "Service Unavailable", RECONNECT_DELAY
+            ) from None
+
+    async def _history(self, after: str) -> AsyncIterator[StreamEntry]:
+        start = f"({after}"
+
+        while True:
+            entries = await self.redis.xrange(
+                self.key, min=start, count=CHANGES_READ_COUNT
+            )
+
+            for entry_id, fields in entries:
+                yield entry_id, TodoChange.from_fields(fields)
+
+            if len(entries) < CHANGES_READ_COUNT:
+                return
+
+            start = f"({entries[-1][0]}"
+
+    async def subscribe(
+        self, last_id: str | None = None
+    ) -> AsyncIterator[StreamEntry | None]:
+        """Subscribes to changes after `last_id`, or from now on if it is None.
+
+        The returned iterator yields the stored history first, then live
+        changes, and None after every quiet CHANGES_BLOCK_MS so callers can
+        send keepalives.
+        """
+        subscription = Subscription()
+
+        # A live subscriber joins the fan-out before the reader starts, so it
+        # misses nothing from here on. A resuming one joins once its history
+        # is replayed, so a long backlog cannot fill its queue first.
+        if last_id is None:
+            self.subscriptions.add(subscription)
+
+        try:
+            await self._start()
+        except BaseException:
+            self.subscriptions.discard(subscription)
+            raise
+
+        return self._follow(subscription, last_id)
+
+    async def _follow(
+        self, subscription: Subscription, last_id: str | None
+    ) -> AsyncIterator[StreamEntry | None]:
+        try:
+            seen = (0, 0)
+
+            if last_id is not None:
+                async for entry in self._history(last_id):
+                    last_id = entry[0]
+                    yield entry
+
+                self.subscriptions.add(subscription)
+
+                # Catch up on what was written between the replay and joining.
+                # Anything also delivered live is skipped by comparing IDs.
+                async for entry in self._history(last_id):
+                    last_id = entry[0]
+                    yield entry
+
+                seen = parse_stream_id(last_id)
+
+            while not (subscription.closed and subscription.queue.empty()):
+                try:
+                    entry = await asyncio.wait_for(
+                        subscription.queue.get(), self.block_ms / 1000
+                    )
+                except TimeoutError:
+                    yield None
+                    continue
+
+                if parse_stream_id(entry[0]) > seen:
+                    seen = parse_stream_id(entry[0])
+                    yield entry
+        finally:
+            self.subscriptions.discard(subscription)
+
+
+def create_change_feed(settings: Settings, redis: RedisClient) -> ChangeFeed | None:
+    if not settings.todos_changes:
+        return None
+
+    block_ms = CHANGES_BLOCK_MS
+
+    # A blocking read must return before the socket timeout gives up on it.
+    # XREAD treats BLOCK 0 as forever, so never go below a millisecond.
+    if settings.redis_socket_timeout is not None:
+        block_ms = max(1, min(block_ms, int(settings.redis_socket_timeout * 500)))
+
+    return ChangeFeed(redis, settings.todos_changes_max_length, block_ms)
+
+
+def encode_event(entry: StreamEntry) -> str:
+    """Formats a change as a server-sent event whose ID resumes after it"""
+    entry_id, change = entry
+    data = json.dumps(change.model_dump(exclude_none=True), separators=(",", ":"))
+    return f"id: {entry_id}\nevent: {change.op}\ndata: {data}\n\n"
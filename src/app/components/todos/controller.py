@@ -1,12 +1,32 @@
+from collections.abc import AsyncIterator
 from typing import Any
 
-from app.components.todos.store import Todo, TodoDocument, Todos, get_todos_store
+from app.components.todos.changes import StreamEntry, encode_event
+from app.components.todos.store import (
+    ArchivedTodos,
+    Todo,
+    TodoBatch,
+    TodoDocument,
+    TodoStats,
+    get_todos_store,
+)
 from app.components.todos.validator import (
+    ArchivedTodosQuery,
+    BatchTodosQuery,
     CreateTodoBody,
+    CreateTodosBody,
+    DeleteTodosBody,
+    ListTodosQuery,
+    MultiGetTodosQuery,
     SearchTodosQuery,
+    TodoChangesQuery,
     TodoIdParams,
+    TodoStatsQuery,
     UpdateTodoBody,
+    UpdateTodosBody,
 )
+from app.config import get_settings
+from app.errors import ClientError
 from app.logger import get_component_logger
 
 logger = get_component_logger("todos")
@@ -16,21 +36,101 @@ async def initialize() -> None:
     await get_todos_store().initialize()
 
 
-async def get_all() -> Todos:
-    logger.debug("Fetching all todos")
-    return await get_todos_store().all()
+async def shutdown() -> None:
+    await get_todos_store().close()
+
+
+async def get_all(query: dict[str, Any]) -> bytes:
+    parsed = ListTodosQuery.model_validate(query)
+    logger.debug(
+        "Fetching all todos",
+        extra={"limit": parsed.limit, "cursor": parsed.cursor},
+    )
+
+    return await get_todos_store().all_json(
+        parsed.limit, parsed.cursor, validate=not get_settings().todos_raw_json
+    )
+
+
+async def get_many(query: dict[str, Any]) -> TodoBatch:
+    parsed = MultiGetTodosQuery.model_validate(query)
+    logger.debug("Fetching todos", extra={"count": len(parsed.ids)})
+    return await get_todos_store().many(parsed.ids)
+
+
+async def export_all() -> AsyncIterator[str]:
+    logger.debug("Exporting all todos")
 
+    async for todo in get_todos_store().stream_all():
+        yield todo.model_dump_json() + "\n"
 
-async def search(query: dict[str, Any]) -> Todos:
+
+async def archived(query: dict[str, Any]) -> ArchivedTodos:
+    parsed = ArchivedTodosQuery.model_validate(query)
+    logger.debug(
+        "Fetching archived todos",
+        extra={"cursor": parsed.cursor, "batches": parsed.batches},
+    )
+    return await get_todos_store().archived(parsed.cursor, parsed.batches)
+
+
+async def search(query: dict[str, Any]) -> bytes:
     parsed = SearchTodosQuery.model_validate(query)
     logger.debug(
         "Searching todos",
         extra={
             "queryName": parsed.name,
             "status": parsed.status.value if parsed.status else None,
+            "match": parsed.match,
+            "limit": parsed.limit,
+            "cursor": parsed.cursor,
+            "sortBy": parsed.sort_by,
+            "order": parsed.order,
         },
     )
-    return await get_todos_store().search(parsed.name, parsed.status)
+
+    return await get_todos_store().search_json(
+        parsed.name,
+        parsed.status,
+        parsed.match,
+        parsed.limit,
+        parsed.cursor,
+        parsed.filters(),
+        validate=not get_settings().todos_raw_json,
+    )
+
+
+async def stats(query: dict[str, Any]) -> TodoStats:
+    parsed = TodoStatsQuery.model_validate(query)
+    logger.debug(
+        "Counting todos",
+        extra={"bucket": parsed.bucket, "date": parsed.date},
+    )
+    return await get_todos_store().stats(parsed.bucket, parsed.date)
+
+
+async def changes(
+    query: dict[str, Any], last_event_id: str | None
+) -> AsyncIterator[str]:
+    # Browsers resume an EventSource with the Last-Event-ID header.
+    parsed = TodoChangesQuery.model_validate(
+        {**query, "last_id": last_event_id or query.get("last_id")}
+    )
+    feed = get_todos_store().changes
+
+    if feed is None:
+        raise ClientError(404, "Not Found")
+
+    logger.debug("Following todo changes", extra={"lastId": parsed.last_id})
+    return _change_events(await feed.subscribe(parsed.last_id))
+
+
+async def _change_events(
+    entries: AsyncIterator[StreamEntry | None],
+) -> AsyncIterator[str]:
+    async for entry in entries:
+        # A comment line keeps idle connections from being closed by proxies.
+        yield ": keepalive\n\n" if entry is None else encode_event(entry)
 
 
 async def get_one(params: dict[str, Any]) -> Todo:
@@ -59,3 +159,39 @@ async def delete(params: dict[str, Any]) -> None:
     parsed = TodoIdParams.model_validate(params)
     logger.debug("Deleting todo", extra={"id": parsed.id})
     await get_todos_store().delete(parsed.id)
+
+
+async def create_many(query: dict[str, Any], body: list[Any]) -> TodoBatch:
+    parsed_query = BatchTodosQuery.model_validate(query)
+    parsed_body = CreateTodosBody.model_validate(body)
+    logger.debug(
+        "Creating todos",
+        extra={"count": len(parsed_body.root), "atomic": parsed_query.atomic},
+    )
+    return await get_todos_store().create_many(
+        [(todo.id, todo.name) for todo in parsed_body.root],
+        parsed_query.atomic,
+    )
+
+
+async def update_many(query: dict[str, Any], body: list[Any]) -> TodoBatch:
+    parsed_query = BatchTodosQuery.model_validate(query)
+    parsed_body = UpdateTodosBody.model_validate(body)
+    logger.debug(
+        "Updating todos",
+        extra={"count": len(parsed_body.root), "atomic": parsed_query.atomic},
+    )
+    return await get_todos_store().update_many(
+        [(todo.id, todo.status) for todo in parsed_body.root],
+        parsed_query.atomic,
+    )
+
+
+async def delete_many(query: dict[str, Any], body: list[Any]) -> TodoBatch:
+    parsed_query = BatchTodosQuery.model_validate(query)
+    parsed_body = DeleteTodosBody.model_validate(body)
+    logger.debug(
+        "Deleting todos",
+        extra={"count": len(parsed_body.root), "atomic": parsed_query.atomic},
+    )
+    return await get_todos_store().delete_many(parsed_body.root, parsed_query.atomic)
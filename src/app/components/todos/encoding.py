@@ -0,0 +1,265 @@
+"""How todos are laid out in Redis.
+
+`JsonEncoding` stores each todo as a RedisJSON document with ISO-8601 dates,
+plus the numeric timestamps the index sorts on. `HashEncoding` stores a plain
+hash with one-letter field names and epoch-millisecond dates, which Redis
+keeps as a compact listpack and indexes without a JSON parser. Both index
+their fields under the same names, so queries work unchanged on either.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, cast
+
+from pydantic_core import from_json, to_jsonable_python
+from redis.asyncio import RedisCluster
+from redis.commands.search.document import Document
+from redis.commands.search.field import Field as SearchField
+from redis.commands.search.field import NumericField, TagField, TextField
+from redis.commands.search.index_definition import IndexType
+
+from app.config import StorageEncoding
+from app.redis import RedisClient
+
+if TYPE_CHECKING:
+    from app.components.todos.store import Todo, TodoStatus
+
+# A todo as Todo.model_validate() accepts it.
+TodoPayload = dict[str, Any]
+
+
+def epoch_millis(value: datetime | None) -> int | None:
+    return None if value is None else int(value.timestamp() * 1000)
+
+
+def from_epoch_millis(value: str | int | None) -> datetime | None:
+    return None if value is None else datetime.fromtimestamp(int(value) / 1000, UTC)
+
+
+class TodoEncoding(ABC):
+    """Subclasses override the properties below with plain class attributes"""
+
+    @property
+    @abstractmethod
+    def name(self) -> StorageEncoding: ...
+
+    @property
+    @abstractmethod
+    def index_type(self) -> IndexType: ...
+
+    @property
+    @abstractmethod
+    def key_type(self) -> str:
+        """The TYPE that SCAN filters todo keys by"""
+
+    @property
+    @abstractmethod
+    def export_fields(self) -> tuple[str, ...]:
+        """Fields an FT.AGGREGATE export LOADs besides the key"""
+
+    @property
+    @abstractmethod
+    def update_script(self) -> str:
+        """Sets status and updatedDate in place and returns the updated todo,
+        or nil when it does not exist, in a single atomic round trip"""
+
+    @abstractmethod
+    def schema(self) -> list[SearchField]: ...
+
+    @abstractmethod
+    def set(self, target: Any, key: str, todo: "Todo") -> Any:
+        """Writes a todo with a client (returns an awaitable) or a pipeline"""
+
+    @abstractmethod
+    def set_succeeded(self, reply: Any) -> bool: ...
+
+    @abstractmethod
+    def get(self, target: Any, key: str) -> Any: ...
+
+    def delete(self, target: Any, key: str) -> Any:
+        return target.delete(key)
+
+    @abstractmethod
+    def decode(self, reply: Any) -> TodoPayload | None: ...
+
+    async def get_many(
+        self, reader: RedisClient, keys: Sequence[str]
+    ) -> list[TodoPayload | None]:
+        pipeline = reader.pipeline(transaction=False)
+
+        for key in keys:
+            self.get(pipeline, key)
+
+        return [self.decode(reply) for reply in await pipeline.execute()]
+
+    @abstractmethod
+    def update_args(self, status: "TodoStatus", updated_at: datetime) -> list[Any]: ...
+
+    @abstractmethod
+    def decode_update(self, reply: Any) -> TodoPayload: ...
+
+    @abstractmethod
+    def document_json(self, document: Document) -> str:
+        """The todo in a search result as JSON text"""
+
+    @abstractmethod
+    def export_json(self, fields: dict[str, Any]) -> str:
+        """The todo in an FT.AGGREGATE export row as JSON text"""
+
+
+class JsonEncoding(TodoEncoding):
+    name: StorageEncoding = "json"
+    index_type = IndexType.JSON
+    key_type = "ReJSON-RL"
+    export_fields = ("$",)
+    update_script = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return nil
+end
+redis.call('JSON.SET', KEYS[1], '$.status', ARGV[1])
+redis.call('JSON.SET', KEYS[1], '$.updatedDate', ARGV[2])
+redis.call('JSON.SET', KEYS[1], '$.updatedTimestamp', ARGV[3])
+return redis.call('JSON.GET', KEYS[1])
+"""
+
+    def schema(self) -> list[SearchField]:
+        return [
+            TextField("$.name", as_name="name"),
+            TagField("$.status", as_name="status"),
+            NumericField("$.createdTimestamp", as_name="createdDate", sortable=True),
+            NumericField("$.updatedTimestamp", as_name="updatedDate", sortable=True),
+        ]
+
+    def serialize(self, todo: "Todo") -> TodoPayload:
+        """Adds the numeric dates the index sorts and filters on"""
+        payload = todo.model_dump(by_alias=True, exclude_none=True, mode="json")
+
+        if todo.created_date is not None:
+            payload["createdTimestamp"] = epoch_millis(todo.created_date)
+
+        if todo.updated_date is not None:
+            payload["updatedTimestamp"] = epoch_millis(todo.updated_date)
+
+        return payload
+
+    def set(self, target: Any, key: str, todo: "Todo") -> Any:
+        return target.json().set(key, "$", self.serialize(todo))
+
+    def set_succeeded(self, reply: Any) -> bool:
+        return reply in {True, "OK"}
+
+    def get(self, target: Any, key: str) -> Any:
+        return target.json().get(key)
+
+    def delete(self, target: Any, key: str) -> Any:
+        return target.json().delete(key)
+
+    def decode(self, reply: Any) -> TodoPayload | None:
+        return reply if isinstance(reply, dict) else None
+
+    async def get_many(
+        self, reader: RedisClient, keys: Sequence[str]
+    ) -> list[TodoPayload | None]:
+        # JSON.MGET cannot span slots, so clusters pipeline JSON.GETs instead.
+        if isinstance(reader, RedisCluster):
+            return await super().get_many(reader, keys)
+
+        replies = await reader.json().mget(list(keys), ".")  # type: ignore[misc]
+        return [self.decode(reply) for reply in cast(list[Any], replies)]
+
+    def update_args(self, status: "TodoStatus", updated_at: datetime) -> list[Any]:
+        return [
+            json.dumps(status.value),
+            json.dumps(to_jsonable_python(updated_at)),
+            json.dumps(epoch_millis(updated_at)),
+        ]
+
+    def decode_update(self, reply: Any) -> TodoPayload:
+        return cast(TodoPayload, from_json(reply))
+
+    def document_json(self, document: Document) -> str:
+        return cast(str, cast(Any, document).json)
+
+    def export_json(self, fields: dict[str, Any]) -> str:
+        return cast(str, fields["$"])
+
+
+class HashEncoding(TodoEncoding):
+    name: StorageEncoding = "hash"
+    index_type = IndexType.HASH
+    key_type = "hash"
+    export_fields = ("@n", "@s", "@c", "@u")
+    update_script = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return nil
+end
+redis.call('HSET', KEYS[1], 's', ARGV[1], 'u', ARGV[2])
+return redis.call('HGETALL', KEYS[1])
+"""
+
+    def schema(self) -> list[SearchField]:
+        return [
+            TextField("n", as_name="name"),
+            TagField("s", as_name="status"),
+            NumericField("c", as_name="createdDate", sortable=True),
+            NumericField("u", as_name="updatedDate", sortable=True),
+        ]
+
+    def serialize(self, todo: "Todo") -> dict[str, str | int]:
+        fields: dict[str, str | int] = {"n": todo.name, "s": todo.status.value}
+
+        for field, value in (("c", todo.created_date), ("u", todo.updated_date)):
+            if value is not None:
+                fields[field] = cast(int, epoch_millis(value))
+
+        return fields
+
+    def payload(self, fields: dict[str, Any]) -> TodoPayload:
+        payload: TodoPayload = {"name": fields["n"], "status": fields["s"]}
+
+        for field, name in (("c", "createdDate"), ("u", "updatedDate")):
+            if fields.get(field) is not None:
+                payload[name] = from_epoch_millis(fields[field])
+
+        return payload
+
+    def set(self, target: Any, key: str, todo: "Todo") -> Any:
+        return target.hset(key, mapping=self.serialize(todo))
+
+    def set_succeeded(self, reply: Any) -> bool:
+        # HSET replies with the number of fields it added.
+        return isinstance(reply, int)
+
+    def get(self, target: Any, key: str) -> Any:
+        return target.hgetall(key)
+
+    def decode(self, reply: Any) -> TodoPayload | None:
+        # HGETALL replies with an empty hash for a missing key.
+        return self.payload(reply) if isinstance(reply, dict) and reply else None
+
+    def update_args(self, status: "TodoStatus", updated_at: datetime) -> list[Any]:
+        return [status.value, epoch_millis(updated_at)]
+
+    def decode_update(self, reply: Any) -> TodoPayload:
+        # Scripts return HGETALL as a flat list of fields and values.
+        return self.payload(dict(zip(reply[::2], reply[1::2], strict=True)))
+
+    def document_json(self, document: Document) -> str:
+        return self.export_json(vars(document))
+
+    def export_json(self, fields: dict[str, Any]) -> str:
+        return json.dumps(
+            to_jsonable_python(self.payload(fields)), separators=(",", ":")
+        )
+
+
+ENCODINGS: dict[StorageEncoding, type[TodoEncoding]] = {
+    "json": JsonEncoding,
+    "hash": HashEncoding,
+}
+
+
+def create_encoding(name: StorageEncoding) -> TodoEncoding:
+    return ENCODINGS[name]()
@@ -0,0 +1,655 @@
+"""An in-process todo store for running without Redis Stack.
+
+`MemoryTodoStore` answers the same calls as `TodoStore` from plain Python
+structures kept in step with every write. Each todo is a `__slots__` record.
+An inverted index maps each lowercased name word to the IDs that contain it,
+with a sorted vocabulary for prefix lookups. There is one ID set per status,
+and one sorted `(millis, id)` array per date field for range filters and
+sorting. Nothing is persisted or shared between processes, so it suits
+edge deployments, CI and benchmark baselines rather than production.
+
+Search follows the RediSearch semantics the Redis store relies on, with two
+differences. Words are compared as written (lowercased), with no stemming
+or stopwords. Unsorted results come back in write order, not by relevance.
+"""
+
+import asyncio
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+from datetime import UTC, datetime, timedelta
+from operator import attrgetter, itemgetter
+from typing import cast
+from uuid import uuid4
+
+from app.components.todos.archive import (
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_INTERVAL,
+    TodoArchiver,
+    pack,
+    unpack,
+)
+from app.components.todos.changes import ChangeFeed
+from app.components.todos.encoding import epoch_millis
+from app.components.todos.query import (
+    MIN_FUZZY_LENGTH,
+    MIN_PREFIX_LENGTH,
+    MatchMode,
+    SearchFilters,
+    SortField,
+    query_words,
+)
+from app.components.todos.store import (
+    DEFAULT_PAGE_SIZE,
+    EXPORT_BATCH_SIZE,
+    MAX_STATS_GROUPS,
+    TODOS_PREFIX,
+    ArchivedTodos,
+    StatsBucket,
+    StatsDateField,
+    Todo,
+    TodoBatch,
+    TodoBatchResult,
+    TodoDocument,
+    Todos,
+    TodoStats,
+    TodoStatsBucket,
+    TodoStatus,
+    todo_documents_adapter,
+)
+from app.errors import ClientError
+from app.logger import get_component_logger
+from app.redis import parse_stream_id
+
+DATE_FIELDS: tuple[SortField, ...] = ("createdDate", "updatedDate")
+logger = get_component_logger("todos")
+
+_TOKEN = re.compile(r"\w+")
+_millis = itemgetter(0)
+_seq = attrgetter("seq")
+
+# A sorted date index entry: epoch milliseconds, then the todo ID.
+DateEntry = tuple[int, str]
+# An archive batch: its parsed ID (to search by), its ID, and the packed todos.
+ArchiveEntry = tuple[tuple[int, int], str, str]
+
+
+def name_tokens(name: str) -> tuple[str, ...]:
+    return tuple(word.lower() for word in _TOKEN.findall(name))
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """Whether a Levenshtein distance of at most 1 separates the words, as
+    RediSearch's %fuzzy% terms match"""
+    if len(a) > len(b):
+        a, b = b, a
+
+    if len(b) - len(a) > 1:
+        return False
+
+    i = 0
+
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+
+    if len(a) == len(b):
+        return a[i + 1 :] == b[i + 1 :]
+
+    return a[i:] == b[i + 1 :]
+
+
+def intersect(sets: list[set[str]]) -> set[str] | None:
+    """The IDs in every set, or None when there is nothing to filter by"""
+    if len(sets) == 0:
+        return None
+
+    smallest, *rest = sorted(sets, key=len)
+    return smallest.intersection(*rest)
+
+
+def contains_phrase(tokens: tuple[str, ...], words: list[str]) -> bool:
+    size = len(words)
+    return any(
+        list(tokens[start : start + size]) == words
+        for start in range(len(tokens) - size + 1)
+    )
+
+
+def bucket_start(value: datetime, bucket: StatsBucket) -> datetime:
+    value = value.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+
+    if bucket == "hour":
+        return value
+
+    value = value.replace(hour=0)
+    return value if bucket == "day" else value.replace(day=1)
+
+
+class TodoRecord:
+    __slots__ = ("id", "name", "status", "created", "updated", "tokens", "seq")
+
+    def __init__(
+        self,
+        todo_id: str,
+        name: str,
+        status: TodoStatus,
+        created: datetime | None,
+        updated: datetime | None,
+    ):
+        self.id = todo_id
+        self.name = name
+        self.status = status
+        self.created = created
+        self.updated = updated
+        self.tokens = name_tokens(name)
+        # Write order, renewed on every write like a RediSearch document ID.
+        self.seq = 0
+
+    def date(self, field: SortField) -> datetime | None:
+        return self.created if field == "createdDate" else self.updated
+
+    def todo(self) -> Todo:
+        # Records only ever hold validated values, so skip validating again.
+        return Todo.model_construct(
+            name=self.name,
+            status=self.status,
+            created_date=self.created,
+            updated_date=self.updated,
+        )
+
+    def document(self) -> TodoDocument:
+        return TodoDocument.model_construct(id=self.id, value=self.todo())
+
+
+class MemoryTodoStore:
+    def __init__(
+        self,
+        archive_after: timedelta | None = None,
+        archive_interval: float = ARCHIVE_INTERVAL,
+        archive_batch_size: int = ARCHIVE_BATCH_SIZE,
+    ) -> None:
+        self.prefix = TODOS_PREFIX
+        # There is no stream to follow, so the change feed is always off.
+        self.changes: ChangeFeed | None = None
+        self.archive_batch_size = archive_batch_size
+        # Batches of archived todos, packed like the Redis store's archive.
+        self.archive: list[ArchiveEntry] = []
+        self.archiver = (
+            None
+            if archive_after is None
+            else TodoArchiver(self.archive_completed, archive_after, archive_interval)
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        # In write order, as every write pops and reinserts its record.
+        self.records: dict[str, TodoRecord] = {}
+        self.postings: dict[str, set[str]] = {}
+        # The words in `postings`, sorted so prefixes are a contiguous slice.
+        self.vocabulary: list[str] = []
+        self.statuses: dict[TodoStatus, set[str]] = {
+            status: set() for status in TodoStatus
+        }
+        self.dates: dict[SortField, list[DateEntry]] = {
+            field: [] for field in DATE_FIELDS
+        }
+        self.seq = 0
+
+    async def initialize(self) -> None:
+        logger.info("Storing todos in memory; they are lost on restart")
+
+        if self.archiver is not None:
+            await self.archiver.start()
+
+    async def close(self) -> None:
+        if self.archiver is not None:
+            await self.archiver.stop()
+
+    def format_id(self, todo_id: str) -> str:
+        if todo_id.startswith(self.prefix):
+            return todo_id
+
+        return f"{self.prefix}{todo_id}"
+
+    def add(self, record: TodoRecord) -> None:
+        self.remove(record.id)
+        self.seq += 1
+        record.seq = self.seq
+        self.records[record.id] = record
+        self.statuses[record.status].add(record.id)
+
+        for token in set(record.tokens):
+            if token not in self.postings:
+                self.postings[token] = set()
+                insort(self.vocabulary, token)
+
+            self.postings[token].add(record.id)
+
+        for field in DATE_FIELDS:
+            millis = epoch_millis(record.date(field))
+
+            if millis is not None:
+                insort(self.dates[field], (millis, record.id))
+
+    def remove(self, todo_id: str) -> TodoRecord | None:
+        record = self.records.pop(todo_id, None)
+
+        if record is None:
+            return None
+
+        self.statuses[record.status].discard(todo_id)
+
+        for token in set(record.tokens):
+            ids = self.postings[token]
+            ids.discard(todo_id)
+
+            if len(ids) == 0:
+                del self.postings[token]
+                del self.vocabulary[bisect_left(self.vocabulary, token)]
+
+        for field in DATE_FIELDS:
+            millis = epoch_millis(record.date(field))
+
+            if millis is not None:
+                entries = self.dates[field]
+                del entries[bisect_left(entries, (millis, todo_id))]
+
+        return record
+
+    def word_matches(self, word: str, match: MatchMode) -> set[str]:
+        if match == "prefix" and len(word) >= MIN_PREFIX_LENGTH:
+            vocabulary = self.vocabulary
+            position = bisect_left(vocabulary, word)
+            ids: set[str] = set()
+
+            # Walk the slice in place; copying it would cost a full scan.
+            while position < len(vocabulary) and vocabulary[position].startswith(word):
+                ids |= self.postings[vocabulary[position]]
+                position += 1
+
+            return ids
+
+        if match == "fuzzy" and len(word) >= MIN_FUZZY_LENGTH:
+            ids = set()
+
+            for token, token_ids in self.postings.items():
+                if within_one_edit(word, token):
+                    ids |= token_ids
+
+            return ids
+
+        return self.postings.get(word, set())
+
+    def name_matches(self, words: list[str], match: MatchMode) -> set[str]:
+        ids = intersect([self.word_matches(word, match) for word in words]) or set()
+
+        if match == "exact" and len(words) > 1:
+            return {
+                todo_id
+                for todo_id in ids
+                if contains_phrase(self.records[todo_id].tokens, words)
+            }
+
+        return ids
+
+    def date_range(
+        self, field: SortField, after: datetime | None, before: datetime | None
+    ) -> list[DateEntry]:
+        """Entries strictly between `after` and `before`, like the Redis
+        store's exclusive numeric ranges"""
+        entries = self.dates[field]
+        low = (
+            0
+            if after is None
+            else bisect_right(entries, epoch_millis(after), key=_millis)
+        )
+        high = (
+            len(entries)
+            if before is None
+            else bisect_left(entries, epoch_millis(before), key=_millis)
+        )
+        return entries[low:high]
+
+    def find(
+        self,
+        name: str | None,
+        status: TodoStatus | None,
+        match: MatchMode = "all",
+        filters: SearchFilters | None = None,
+    ) -> list[TodoRecord]:
+        filters = filters or SearchFilters()
+        ranges = {
+            "createdDate": (filters.created_after, filters.created_before),
+            "updatedDate": (filters.updated_after, filters.updated_before),
+        }
+        words = [word.lower() for word in query_words(name or "")]
+        constraints: list[set[str]] = []
+
+        if len(words) > 0:
+            constraints.append(self.name_matches(words, match))
+
+        if status is not None:
+            constraints.append(self.statuses[status])
+
+        for field in DATE_FIELDS:
+            after, before = ranges[field]
+
+            # The sort field's range is applied while walking its index below.
+            if field != filters.sort_by and (after, before) != (None, None):
+                constraints.append(
+                    {todo_id for _, todo_id in self.date_range(field, after, before)}
+                )
+
+        ids = intersect(constraints)
+
+        if filters.sort_by is not None:
+            entries: Iterable[DateEntry] = self.date_range(
+                filters.sort_by, *ranges[filters.sort_by]
+            )
+
+            if filters.order == "desc":
+                entries = reversed(list(entries))
+
+            return [
+                self.records[todo_id]
+                for _, todo_id in entries
+                if ids is None or todo_id in ids
+            ]
+
+        if ids is None:
+            return list(self.records.values())
+
+        return sorted((self.records[todo_id] for todo_id in ids), key=_seq)
+
+    def page(
+        self, records: list[TodoRecord], limit: int, cursor: int
+    ) -> tuple[list[TodoDocument], str | None]:
+        documents = [record.document() for record in records[cursor : cursor + limit]]
+        next_cursor = cursor + len(documents)
+
+        # A count-only page (limit 0) has no next page to point at.
+        if limit == 0 or next_cursor >= len(records):
+            return documents, None
+
+        return documents, str(next_cursor)
+
+    async def all(self, limit: int = DEFAULT_PAGE_SIZE, cursor: int = 0) -> Todos:
+        records = list(self.records.values())
+        documents, next_cursor = self.page(records, limit, cursor)
+        return Todos(total=len(records), documents=documents, cursor=next_cursor)
+
+    async def all_json(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: int = 0,
+        validate: bool = False,
+    ) -> bytes:
+        # Records are validated as they are written, so `validate` is moot.
+        return (await self.all(limit, cursor)).model_dump_json().encode()
+
+    async def stream_all(
+        self, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[TodoDocument]:
+        """Yields a snapshot of every todo, yielding to the event loop
+        between batches"""
+        records = list(self.records.values())
+
+        for start in range(0, len(records), batch_size):
+            for record in records[start : start + batch_size]:
+                yield record.document()
+
+            await asyncio.sleep(0)
+
+    async def one(self, todo_id: str) -> Todo:
+        record = self.records.get(self.format_id(todo_id))
+
+        if record is None:
+            raise ClientError(404, "Not Found")
+
+        return record.todo()
+
+    async def many(self, todo_ids: Sequence[str]) -> TodoBatch:
+        results: list[TodoBatchResult] = []
+
+        for todo_id in (self.format_id(todo_id) for todo_id in todo_ids):
+            record = self.records.get(todo_id)
+
+            if record is None:
+                results.append(
+                    TodoBatchResult(id=todo_id, status=404, message="Not Found")
+                )
+            else:
+                results.append(
+                    TodoBatchResult(id=todo_id, status=200, value=record.todo())
+                )
+
+        return TodoBatch(results=results)
+
+    async def search(
+        self,
+        name: str | None,
+        status: TodoStatus | None,
+        match: MatchMode = "all",
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: int = 0,
+        filters: SearchFilters | None = None,
+    ) -> Todos:
+        records = self.find(name, status, match, filters)
+        documents, next_cursor = self.page(records, limit, cursor)
+        return Todos(total=len(records), documents=documents, cursor=next_cursor)
+
+    async def search_json(
+        self,
+        name: str | None,
+        status: TodoStatus | None,
+        match: MatchMode = "all",
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: int = 0,
+        filters: SearchFilters | None = None,
+        validate: bool = False,
+    ) -> bytes:
+        result = await self.search(name, status, match, limit, cursor, filters)
+        return result.model_dump_json().encode()
+
+    async def stats(
+        self,
+        bucket: StatsBucket | None = None,
+        date_field: StatsDateField = "createdDate",
+    ) -> TodoStats:
+        counts = {status: len(ids) for status, ids in self.statuses.items()}
+
+        if bucket is None:
+            return TodoStats(total=len(self.records), counts=counts)
+
+        buckets: dict[datetime, dict[TodoStatus, int]] = {}
+
+        for record in self.records.values():
+            value = record.date(date_field)
+
+            # Todos without the date field have no bucket, as in Redis.
+            if value is not None:
+                start = bucket_start(value, bucket)
+                buckets.setdefault(start, dict.fromkeys(TodoStatus, 0))[
+                    record.status
+                ] += 1
+
+        groups = sum(
+            1 for bucket_counts in buckets.values() for n in bucket_counts.values() if n
+        )
+
+        if groups > MAX_STATS_GROUPS:
+            raise ClientError(
+                400, f"Too many {bucket} buckets to count, use a larger bucket"
+            )
+
+        return TodoStats(
+            total=len(self.records),
+            counts=counts,
+            buckets=[
+                TodoStatsBucket(
+                    start=start,
+                    total=sum(bucket_counts.values()),
+                    counts=bucket_counts,
+                )
+                for start, bucket_counts in sorted(buckets.items())
+            ],
+        )
+
+    def new_record(self, todo_id: str | None, name: str) -> TodoRecord:
+        created_at = datetime.now(UTC)
+
+        return TodoRecord(
+            self.format_id(todo_id or str(uuid4())),
+            name,
+            TodoStatus.todo,
+            created_at,
+            created_at,
+        )
+
+    def set_status(self, todo_id: str, status: TodoStatus) -> TodoRecord | None:
+        record = self.remove(todo_id)
+
+        if record is None:
+            return None
+
+        record.status = status
+        record.updated = datetime.now(UTC)
+        self.add(record)
+        return record
+
+    async def create(self, todo_id: str | None, name: str | None) -> TodoDocument:
+        if name is None:
+            raise ClientError(400, "Todo must have a name")
+
+        record = self.new_record(todo_id, name)
+        self.add(record)
+        return record.document()
+
+    async def update(self, todo_id: str, status: TodoStatus) -> Todo:
+        record = self.set_status(self.format_id(todo_id), status)
+
+        if record is None:
+            raise ClientError(404, "Not Found")
+
+        return record.todo()
+
+    async def delete(self, todo_id: str) -> None:
+        self.remove(self.format_id(todo_id))
+
+    # Batches never wait on anything, so they are always atomic and `atomic`
+    # is only accepted for parity with the Redis store.
+    async def create_many(
+        self, todos: Sequence[tuple[str | None, str]], atomic: bool = False
+    ) -> TodoBatch:
+        records = [self.new_record(todo_id, name) for todo_id, name in todos]
+
+        for record in records:
+            self.add(record)
+
+        return TodoBatch(
+            results=[
+                TodoBatchResult(id=record.id, status=200, value=record.todo())
+                for record in records
+            ]
+        )
+
+    async def update_many(
+        self, updates: Sequence[tuple[str, TodoStatus]], atomic: bool = False
+    ) -> TodoBatch:
+        results: list[TodoBatchResult] = []
+
+        for todo_id, status in updates:
+            formatted_id = self.format_id(todo_id)
+            record = self.set_status(formatted_id, status)
+
+            if record is None:
+                results.append(
+                    TodoBatchResult(id=formatted_id, status=404, message="Not Found")
+                )
+            else:
+                results.append(
+                    TodoBatchResult(id=formatted_id, status=200, value=record.todo())
+                )
+
+        return TodoBatch(results=results)
+
+    async def delete_many(
+        self, todo_ids: Sequence[str], atomic: bool = False
+    ) -> TodoBatch:
+        results: list[TodoBatchResult] = []
+
+        for todo_id in (self.format_id(todo_id) for todo_id in todo_ids):
+            if self.remove(todo_id) is None:
+                results.append(
+                    TodoBatchResult(id=todo_id, status=404, message="Not Found")
+                )
+            else:
+                results.append(TodoBatchResult(id=todo_id, status=200))
+
+        return TodoBatch(results=results)
+
+    def archive_entry_id(self) -> str:
+        """A stream-style ID after the last one, like the Redis store pages by"""
+        millis = cast(int, epoch_millis(datetime.now(UTC)))
+
+        if len(self.archive) > 0:
+            millis = max(millis, self.archive[-1][0][0])
+
+        return f"{millis}-{len(self.archive)}"
+
+    async def archive_completed(self, before: datetime) -> int:
+        """Moves todos completed before `before` into the archive, oldest
+        first, in batches of `archive_batch_size`"""
+        completed = self.statuses[TodoStatus.complete]
+        ids = [
+            todo_id
+            for _, todo_id in self.date_range("updatedDate", None, before)
+            if todo_id in completed
+        ]
+
+        for start in range(0, len(ids), self.archive_batch_size):
+            records = [
+                self.remove(todo_id)
+                for todo_id in ids[start : start + self.archive_batch_size]
+            ]
+            documents = [record.document() for record in records if record is not None]
+            entry_id = self.archive_entry_id()
+            self.archive.append(
+                (
+                    parse_stream_id(entry_id),
+                    entry_id,
+                    pack(todo_documents_adapter.dump_json(documents)),
+                )
+            )
+
+        return len(ids)
+
+    async def archived(
+        self, cursor: str | None = None, batches: int = 1
+    ) -> ArchivedTodos:
+        start = (
+            0
+            if cursor is None
+            else bisect_right(self.archive, parse_stream_id(cursor), key=itemgetter(0))
+        )
+        entries = self.archive[start : start + batches]
+        documents = [
+            todo
+            for _, _, blob in entries
+            for todo in todo_documents_adapter.validate_json(unpack(blob))
+        ]
+        more = start + len(entries) < len(self.archive)
+
+        return ArchivedTodos(
+            documents=documents, cursor=entries[-1][1] if more else None
+        )
+
+    async def delete_all(self, progress: Callable[[int], None] | None = None) -> int:
+        deleted = len(self.records)
+        self.reset()
+
+        if progress is not None:
+            progress(deleted)
+
+        logger.info(f"Deleted {deleted} todos")
+        return deleted
@@ -0,0 +1,133 @@
+"""Builds RediSearch queries for todo search from untrusted input.
+
+Search text is split into words and every character RediSearch gives meaning
+to is escaped, so input can only ever match words. It cannot inject unions,
+negations, wildcards or attribute filters. Prefix and fuzzy matching are
+opt-in, and both are limited to words long enough that they cannot expand
+to most of the index. Date ranges and sorting run on the sortable numeric
+date fields, so only the requested page leaves Redis. Queries are memoized,
+since dashboards repeat the same few searches.
+"""
+
+import re
+import string
+from datetime import datetime
+from functools import lru_cache
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict
+from redis.commands.search.query import Query
+
+MatchMode = Literal["all", "exact", "prefix", "fuzzy"]
+SortField = Literal["createdDate", "updatedDate"]
+SortOrder = Literal["asc", "desc"]
+
+MAX_QUERY_LENGTH = 256
+MAX_QUERY_TERMS = 8
+# Shorter prefixes ("a*") expand to nearly every term in the index.
+MIN_PREFIX_LENGTH = 2
+# Shorter words are within one edit of too many other words to be useful.
+MIN_FUZZY_LENGTH = 4
+QUERY_CACHE_SIZE = 1024
+
+_WORD = re.compile(r"\w+")
+# RediSearch only accepts a backslash before ASCII punctuation and whitespace,
+# so letters from other scripts are left alone.
+_SPECIAL = re.compile(
+    f"([{re.escape(string.punctuation.replace('_', '') + string.whitespace)}])"
+)
+
+
+def escape_term(value: str) -> str:
+    return _SPECIAL.sub(r"\\\1", value)
+
+
+def query_words(text: str) -> list[str]:
+    return _WORD.findall(text)[:MAX_QUERY_TERMS]
+
+
+class SearchFilters(BaseModel):
+    """Date ranges and ordering for a search. Both ends of a range are
+    exclusive, and `order` only applies along with `sort_by`"""
+
+    # Frozen so filters are hashable and can key the query memo.
+    model_config = ConfigDict(frozen=True)
+
+    sort_by: SortField | None = None
+    order: SortOrder = "asc"
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    updated_after: datetime | None = None
+    updated_before: datetime | None = None
+
+
+def _millis(value: datetime) -> int:
+    return int(value.timestamp() * 1000)
+
+
+def range_clause(
+    field: SortField, after: datetime | None, before: datetime | None
+) -> str | None:
+    if after is None and before is None:
+        return None
+
+    low = "-inf" if after is None else f"({_millis(after)}"
+    high = "+inf" if before is None else f"({_millis(before)}"
+    return f"@{field}:[{low} {high}]"
+
+
+def name_clause(words: list[str], match: MatchMode) -> str:
+    terms = [escape_term(word) for word in words]
+
+    if match == "exact":
+        return f'@name:"{" ".join(terms)}"'
+
+    if match == "prefix":
+        terms = [
+            f"{term}*" if len(word) >= MIN_PREFIX_LENGTH else term
+            for word, term in zip(words, terms, strict=True)
+        ]
+    elif match == "fuzzy":
+        terms = [
+            f"%{term}%" if len(word) >= MIN_FUZZY_LENGTH else term
+            for word, term in zip(words, terms, strict=True)
+        ]
+
+    return f"@name:({' '.join(terms)})"
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def build_search_query(
+    name: str | None,
+    status: str | None,
+    match: MatchMode = "all",
+    limit: int = 10,
+    cursor: int = 0,
+    filters: SearchFilters | None = None,
+) -> Query:
+    """Compiles a todo search. The result is shared between callers, so it
+    must not be modified"""
+    filters = filters or SearchFilters()
+    clauses: list[str] = []
+    words = query_words(name or "")
+
+    if len(words) > 0:
+        clauses.append(name_clause(words, match))
+
+    if status is not None:
+        clauses.append(f"@status:{{{escape_term(status)}}}")
+
+    for clause in (
+        range_clause("createdDate", filters.created_after, filters.created_before),
+        range_clause("updatedDate", filters.updated_after, filters.updated_before),
+    ):
+        if clause is not None:
+            clauses.append(clause)
+
+    query = Query(" ".join(clauses) or "*").paging(cursor, limit)
+
+    if filters.sort_by is not None:
+        query = query.sort_by(filters.sort_by, asc=filters.order == "asc")
+
+    # A limit of 0 only counts matches, so skip loading any documents.
+    return query.no_content() if limit == 0 else query
@@ -1,23 +1,96 @@
 from typing import Any
 
 from fastapi import APIRouter, Request, Response
+from fastapi.responses import StreamingResponse
 
 from app.components.todos import controller
-from app.components.todos.store import Todo, TodoDocument, Todos
+from app.components.todos.store import (
+    ArchivedTodos,
+    Todo,
+    TodoBatch,
+    TodoDocument,
+    Todos,
+    TodoStats,
+)
+from app.resilience import set_request_deadline
 
 router = APIRouter()
 
 
-@router.get("", tags=["todos"])
-async def all() -> Todos:
-    """Gets all todos"""
-    return await controller.get_all()
+def _todos_response(result: bytes) -> Response:
+    # Pages come back already encoded (and possibly cached), so skip FastAPI
+    # validating and encoding the response model again.
+    return Response(content=result, media_type="application/json")
 
 
-@router.get("/search", tags=["todos"])
-async def search(request: Request) -> Todos:
-    """Searches for todos by name and/or status"""
-    return await controller.search(dict(request.query_params))
+@router.get("", tags=["todos"], response_model=Todos | TodoBatch)
+async def all(request: Request) -> Response:
+    """Gets a page of todos, or the todos with the given `ids`"""
+    query = dict(request.query_params)
+
+    if "ids" in query:
+        batch = await controller.get_many(query)
+        return _todos_response(batch.model_dump_json().encode())
+
+    return _todos_response(await controller.get_all(query))
+
+
+@router.get("/export", tags=["todos"])
+async def export() -> StreamingResponse:
+    """Streams every todo as newline-delimited JSON"""
+    # An export runs for as long as the dataset takes, not one request deadline.
+    set_request_deadline(None)
+    return StreamingResponse(
+        controller.export_all(),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/changes", tags=["todos"])
+async def changes(request: Request) -> StreamingResponse:
+    """Streams todo changes as server-sent events, resuming after an ID"""
+    # A subscription stays open for as long as the client listens.
+    set_request_deadline(None)
+    events = await controller.changes(
+        dict(request.query_params), request.headers.get("last-event-id")
+    )
+    return StreamingResponse(events, media_type="text/event-stream")
+
+
+@router.get("/archive", tags=["todos"])
+async def archived(request: Request) -> ArchivedTodos:
+    """Pages through archived todos, a compressed batch at a time"""
+    return await controller.archived(dict(request.query_params))
+
+
+@router.get("/search", tags=["todos"], response_model=Todos)
+async def search(request: Request) -> Response:
+    """Searches for todos by name, status and dates, sorted and paged"""
+    return _todos_response(await controller.search(dict(request.query_params)))
+
+
+@router.get("/stats", tags=["todos"])
+async def stats(request: Request) -> TodoStats:
+    """Counts todos per status, optionally bucketed by date"""
+    return await controller.stats(dict(request.query_params))
+
+
+@router.post("/batch", tags=["todos"])
+async def create_many(request: Request, todos: list[Any]) -> TodoBatch:
+    """Creates many todos in one pipelined round trip"""
+    return await controller.create_many(dict(request.query_params), todos)
+
+
+@router.patch("/batch", tags=["todos"])
+async def update_many(request: Request, todos: list[Any]) -> TodoBatch:
+    """Updates the status of many todos in one pipelined round trip"""
+    return await controller.update_many(dict(request.query_params), todos)
+
+
+@router.delete("/batch", tags=["todos"])
+async def delete_many(request: Request, ids: list[Any]) -> TodoBatch:
+    """Deletes many todos in one pipelined round trip"""
+    return await controller.delete_many(dict(request.query_params), ids)
 
 
 @router.get("/{id}", tags=["todos"])
@@ -0,0 +1,106 @@
+import hashlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from app.config import Settings
+from app.metrics import todos_search_cache_requests
+from app.redis import RedisClient
+
+SEARCH_CACHE_PREFIX = "todos-search:"
+
+
+class SearchCache(ABC):
+    """Encoded search pages keyed on the todos generation and the query.
+
+    Every write bumps the generation, so a page cached under an older
+    generation is never served again and needs no explicit invalidation.
+    """
+
+    @abstractmethod
+    async def get(self, generation: int, key: Hashable) -> bytes | None: ...
+
+    @abstractmethod
+    async def set(self, generation: int, key: Hashable, payload: bytes) -> None: ...
+
+    def discard(self) -> None:
+        """Drops what this process cached, for when a generation bump failed"""
+        # Shared caches cannot tell other processes, so they rely on the TTL.
+        return
+
+    async def lookup(self, generation: int, key: Hashable) -> bytes | None:
+        payload = await self.get(generation, key)
+        todos_search_cache_requests.inc("miss" if payload is None else "hit")
+        return payload
+
+
+class MemorySearchCache(SearchCache):
+    """Bounded in-process LRU, emptied whenever the generation moves on"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.generation = 0
+        self.entries: OrderedDict[Hashable, bytes] = OrderedDict()
+
+    def discard(self) -> None:
+        self.entries.clear()
+
+    def _advance(self, generation: int) -> None:
+        if generation > self.generation:
+            self.generation = generation
+            self.entries.clear()
+
+    async def get(self, generation: int, key: Hashable) -> bytes | None:
+        self._advance(generation)
+
+        if generation != self.generation:
+            return None
+
+        payload = self.entries.get(key)
+
+        if payload is not None:
+            self.entries.move_to_end(key)
+
+        return payload
+
+    async def set(self, generation: int, key: Hashable, payload: bytes) -> None:
+        self._advance(generation)
+
+        # A read that started before a write must not fill the newer generation.
+        if generation != self.generation:
+            return
+
+        self.entries[key] = payload
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+
+class RedisSearchCache(SearchCache):
+    """Pages stored in Redis with a TTL, shared by every app process"""
+
+    def __init__(self, redis: RedisClient, ttl: int):
+        self.redis = redis
+        self.ttl = ttl
+
+    def cache_key(self, generation: int, key: Hashable) -> str:
+        digest = hashlib.sha1(repr(key).encode(), usedforsecurity=False).hexdigest()
+        return f"{SEARCH_CACHE_PREFIX}{generation}:{digest}"
+
+    async def get(self, generation: int, key: Hashable) -> bytes | None:
+        payload = await self.redis.get(self.cache_key(generation, key))
+        return None if payload is None else payload.encode()
+
+    async def set(self, generation: int, key: Hashable, payload: bytes) -> None:
+        await self.redis.set(self.cache_key(generation, key), payload, ex=self.ttl)
+
+
+def create_search_cache(settings: Settings, redis: RedisClient) -> SearchCache | None:
+    if settings.todos_search_cache == "memory":
+        return MemorySearchCache(settings.todos_search_cache_size)
+
+    if settings.todos_search_cache == "redis":
+        return RedisSearchCache(redis, settings.todos_search_cache_ttl)
+
+    return None
@@ -1,27 +1,71 @@
+import asyncio
+import json
 import re
-from datetime import UTC, datetime
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable, Sequence
+from datetime import UTC, datetime, timedelta
 from enum import Enum
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, Literal, cast
 from uuid import uuid4
 
-from pydantic import AliasChoices, BaseModel, ConfigDict, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, TypeAdapter
 from pydantic_core import from_json
-from redis.asyncio import Redis
+from redis.asyncio import RedisCluster
+from redis.asyncio.cluster import ClusterNode, ClusterPipeline
+from redis.commands.search import reducers
+from redis.commands.search.aggregation import AggregateRequest, Cursor
 from redis.commands.search.document import Document
-from redis.commands.search.field import Field as SearchField
-from redis.commands.search.field import TextField
-from redis.commands.search.index_definition import IndexDefinition, IndexType
+from redis.commands.search.index_definition import IndexDefinition
 from redis.commands.search.query import Query
-from redis.exceptions import ResponseError
+from redis.commands.search.result import Result
+from redis.crc import key_slot
+from redis.exceptions import ResponseError, WatchError
 
+from app.components.todos.archive import (
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_INTERVAL,
+    TODOS_ARCHIVE_KEY,
+    TodoArchiver,
+    pack,
+    unpack,
+)
+from app.components.todos.cache import TodoCache
+from app.components.todos.changes import ChangeFeed, TodoChange, create_change_feed
+from app.components.todos.encoding import (
+    JsonEncoding,
+    TodoEncoding,
+    create_encoding,
+    epoch_millis,
+)
+from app.components.todos.query import MatchMode, SearchFilters, build_search_query
+from app.components.todos.search_cache import SearchCache, create_search_cache
+from app.config import Settings, get_settings
 from app.errors import ClientError
 from app.logger import get_component_logger
-from app.redis import get_client, reset_async_clients
+from app.redis import RedisClient, get_client, reset_async_clients
+from app.replicas import ReplicaSet
 
+if TYPE_CHECKING:
+    from app.components.todos.memory_store import MemoryTodoStore
+
+# Queries go through the TODOS_INDEX alias, which points at the current
+# versioned index. Bump TODOS_INDEX_VERSION whenever an encoding's schema changes.
 TODOS_INDEX = "todos-idx"
+TODOS_INDEX_VERSION = 2
 TODOS_PREFIX = "todos:"
+# Bumped after every write so cached list and search pages go stale.
+TODOS_GENERATION_KEY = "todos-generation"
+INDEX_BUILD_TIMEOUT = 300.0
+INDEX_BUILD_POLL_INTERVAL = 0.1
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = 500
+MAX_BATCH_SIZE = 1000
+PURGE_BATCH_SIZE = 1000
+PURGE_CONCURRENCY = 4
+# Upper bound on the status/date groups a bucketed stats aggregation returns.
+MAX_STATS_GROUPS = 10_000
 logger = get_component_logger("todos")
-todos_store: "TodoStore | None" = None
+todos_store: "TodoStore | MemoryTodoStore | None" = None
 
 
 class TodoStatus(str, Enum):
@@ -55,60 +99,391 @@ class TodoDocument(BaseModel):
 class Todos(BaseModel):
     total: int
     documents: list[TodoDocument]
+    cursor: str | None = None
+
+
+class ArchivedTodos(BaseModel):
+    documents: list[TodoDocument]
+    cursor: str | None = None
+
+
+todo_documents_adapter = TypeAdapter(list[TodoDocument])
+
+
+# RediSearch APPLY functions that round a unix timestamp down to a bucket.
+StatsBucket = Literal["hour", "day", "month"]
+StatsDateField = Literal["createdDate", "updatedDate"]
+
+
+STATUS_VALUES = {status.value for status in TodoStatus}
+
+
+class TodoStatsBucket(BaseModel):
+    start: datetime
+    total: int
+    counts: dict[TodoStatus, int]
+
+
+class TodoStats(BaseModel):
+    total: int
+    counts: dict[TodoStatus, int]
+    buckets: list[TodoStatsBucket] | None = None
+
+
+class TodoBatchResult(BaseModel):
+    id: str
+    status: int
+    value: Todo | None = None
+    message: str | None = None
+
+
+class TodoBatch(BaseModel):
+    results: list[TodoBatchResult]
+
+
+def is_unknown_index(exc: ResponseError) -> bool:
+    return "Unknown index name" in str(exc) or "no such index" in str(exc)
+
+
+def stats_rows(rows: list[list[str]]) -> list[dict[str, str]]:
+    """Turns aggregate rows into field dicts, skipping unknown statuses"""
+    parsed = [dict(zip(row[::2], row[1::2], strict=True)) for row in rows]
+    return [fields for fields in parsed if fields.get("status") in STATUS_VALUES]
+
+
+class TodoPurge:
+    """Runs UNLINK batches with bounded concurrency and counts deletions"""
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        concurrency: int,
+        progress: Callable[[int], None] | None = None,
+    ):
+        self.redis = redis
+        self.slots = asyncio.Semaphore(concurrency)
+        self.progress = progress
+        self.deleted = 0
+        self.tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, keys: list[str]) -> None:
+        # Waiting for a free slot here also stops the scan from racing ahead.
+        await self.slots.acquire()
+
+        for task in self.tasks:
+            # Stop scanning as soon as a batch has failed.
+            if task.done() and task.exception() is not None:
+                self.slots.release()
+                raise cast(BaseException, task.exception())
+
+        task = asyncio.create_task(self.run(keys))
+        self.tasks.add(task)
+
+    async def run(self, keys: list[str]) -> None:
+        try:
+            # Cluster clients split a multi-key UNLINK by slot.
+            deleted = await self.redis.unlink(*keys)
+        finally:
+            self.slots.release()
+
+        self.deleted += deleted
+
+        logger.debug(f"Deleted {self.deleted} todos so far")
+
+        if self.progress is not None:
+            self.progress(self.deleted)
+
+    async def wait(self) -> None:
+        await asyncio.gather(*self.tasks)
+
+    def cancel(self) -> None:
+        for task in self.tasks:
+            task.cancel()
 
 
 class TodoStore:
-    def __init__(self, redis: Redis):
+    def __init__(
+        self,
+        redis: RedisClient,
+        cache_size: int = 0,
+        replicas: ReplicaSet | None = None,
+        search_cache: SearchCache | None = None,
+        changes: ChangeFeed | None = None,
+        purge_batch_size: int = PURGE_BATCH_SIZE,
+        purge_concurrency: int = PURGE_CONCURRENCY,
+        encoding: TodoEncoding | None = None,
+        archive_after: timedelta | None = None,
+        archive_interval: float = ARCHIVE_INTERVAL,
+        archive_batch_size: int = ARCHIVE_BATCH_SIZE,
+    ):
         self.redis = redis
+        self.encoding = encoding or JsonEncoding()
+        self.purge_batch_size = purge_batch_size
+        self.purge_concurrency = purge_concurrency
+        self.search_cache = search_cache
+        self.changes = changes
+        # Reads go through `replicas.reader()`, writes always use `redis`.
+        self.replicas = replicas or ReplicaSet(redis)
         self.index = TODOS_INDEX
         self.prefix = TODOS_PREFIX
+        self.cluster = isinstance(redis, RedisCluster)
+        # redis-py types register_script as standalone-only, but it works on both.
+        self.update_status_script = redis.register_script(  # type: ignore[misc]
+            self.encoding.update_script
+        )
+        self.cache: TodoCache | None = None
+
+        if cache_size > 0 and isinstance(redis, RedisCluster):
+            logger.warning("The todo cache is not supported in cluster mode")
+        elif cache_size > 0 and not isinstance(redis, RedisCluster):
+            self.cache = TodoCache(redis, self.prefix, cache_size)
+
+        self.archive_batch_size = archive_batch_size
+        self.archiver: TodoArchiver | None = None
+
+        # Each batch moves in a WATCH transaction, which cannot span slots.
+        if archive_after is not None and self.cluster:
+            logger.warning("Archiving todos is not supported in cluster mode")
+        elif archive_after is not None:
+            self.archiver = TodoArchiver(
+                self.archive_completed, archive_after, archive_interval
+            )
 
     async def initialize(self) -> None:
         await self.create_index_if_not_exists()
 
-    async def have_index(self) -> bool:
+        if self.cache is not None:
+            await self.cache.start()
+
+        if self.archiver is not None:
+            await self.archiver.start()
+
+    async def close(self) -> None:
+        if self.cache is not None:
+            await self.cache.stop()
+
+        if self.archiver is not None:
+            await self.archiver.stop()
+
+        if self.changes is not None:
+            await self.changes.stop()
+
+    def invalidate_cache(self, todo_ids: list[str] | None = None) -> None:
+        # Tracking invalidations are asynchronous, so evict our own writes now.
+        if self.cache is not None:
+            self.cache.invalidate(todo_ids)
+
+    async def generation(self, reader: RedisClient) -> int:
+        return int(await reader.get(TODOS_GENERATION_KEY) or 0)
+
+    async def record_writes(self, changes: Sequence[TodoChange]) -> None:
+        """Bumps the search cache generation and appends to the change feed,
+        together in one round trip.
+
+        The writes have already been committed by then, so a failure here is
+        logged rather than raised. Cached pages then stay stale for at most
+        TODOS_SEARCH_CACHE_TTL, or until the next write in this process.
+        """
+        if self.search_cache is None and (self.changes is None or not changes):
+            return
+
+        pipeline = self.redis.pipeline(transaction=False)
+
+        if self.search_cache is not None:
+            pipeline.incr(TODOS_GENERATION_KEY)
+
+        if self.changes is not None:
+            for change in changes:
+                pipeline.xadd(**self.changes.entry_args(change))
+
         try:
-            await self.redis.ft(self.index).info()
+            await pipeline.execute()
+        except Exception as exc:
+            logger.error(f"Error recording todo writes: {exc}")
+
+            if self.search_cache is not None:
+                self.search_cache.discard()
+
+    async def cached_json(
+        self, key: Hashable, load: Callable[[RedisClient], Awaitable[bytes]]
+    ) -> bytes:
+        """Serves an encoded page from the search cache, or loads and caches it.
+
+        The generation is read from the same server as the page, so a lagging
+        replica can only cache its old data under its old generation.
+        """
+        reader = self.replicas.reader()
+
+        if self.search_cache is None:
+            return await load(reader)
+
+        generation = await self.generation(reader)
+        cached = await self.search_cache.lookup(generation, key)
+
+        if cached is not None:
+            return cached
+
+        payload = await load(reader)
+        await self.search_cache.set(generation, key, payload)
+        return payload
+
+    @property
+    def versioned_index(self) -> str:
+        # JSON indexes keep their original names, so they need no migration.
+        if self.encoding.name == "json":
+            return f"{self.index}-v{TODOS_INDEX_VERSION}"
+
+        return f"{self.index}-{self.encoding.name}-v{TODOS_INDEX_VERSION}"
+
+    async def index_info(self, name: str) -> dict[str, Any] | None:
+        try:
+            return cast(dict[str, Any], await self.redis.ft(name).info())
         except ResponseError as exc:
-            if "Unknown index name" in str(exc) or "no such index" in str(exc):
-                logger.debug(f"Index {self.index} does not exist")
-                return False
+            if is_unknown_index(exc):
+                logger.debug(f"Index {name} does not exist")
+                return None
+
+            raise
+
+    async def drop_index_named(self, name: str) -> None:
+        try:
+            await self.redis.ft(name).dropindex()
+        except ResponseError as exc:
+            # Another process running the same migration dropped it first.
+            if not is_unknown_index(exc):
+                raise
 
-        logger.debug(f"Index {self.index} already exists")
-        return True
+            logger.debug(f"Index {name} was already dropped")
+
+    async def have_index(self) -> bool:
+        return await self.index_info(self.index) is not None
 
     async def create_index_if_not_exists(self) -> None:
-        if await self.have_index():
+        target = self.versioned_index
+        current = await self.index_info(self.index)
+        previous = cast(str, current["index_name"]) if current is not None else None
+
+        if previous == target:
+            logger.debug(f"Index {self.index} already points at {target}")
             return
 
-        logger.debug(f"Creating index {self.index}")
-        schema: list[SearchField] = [
-            TextField("$.name", as_name="name"),
-            TextField("$.status", as_name="status"),
-        ]
+        logger.debug(f"Migrating index {self.index} from {previous} to {target}")
 
         try:
-            await self.redis.ft(self.index).create_index(
-                schema,
-                definition=IndexDefinition(
-                    prefix=[TODOS_PREFIX],
-                    index_type=IndexType.JSON,
-                ),
-            )
+            await self.create_versioned_index(target)
+
+            if isinstance(self.encoding, JsonEncoding):
+                await self.backfill_timestamps()
+
+            await self.wait_for_indexing(target)
+            await self.swap_alias(target, previous)
         except Exception as exc:
             logger.error(f"Error setting up index {self.index}: {exc}")
             raise
 
+    async def create_versioned_index(self, name: str) -> None:
+        try:
+            await self.redis.ft(name).create_index(
+                self.encoding.schema(),
+                definition=IndexDefinition(
+                    prefix=[self.prefix],
+                    index_type=self.encoding.index_type,
+                ),
+            )
+        except ResponseError as exc:
+            # Another process may be running the same migration.
+            if "Index already exists" not in str(exc):
+                raise
+
+    async def backfill_timestamps(self) -> None:
+        """Adds the numeric date fields the index sorts on to older todos"""
+        keys: list[str] = []
+
+        async for key in self.redis.scan_iter(
+            match=f"{self.prefix}*",
+            count=EXPORT_BATCH_SIZE,
+            _type=self.encoding.key_type,
+        ):
+            keys.append(key)
+
+            if len(keys) >= EXPORT_BATCH_SIZE:
+                await self.backfill_timestamps_for(keys)
+                keys = []
+
+        if len(keys) > 0:
+            await self.backfill_timestamps_for(keys)
+
+    async def backfill_timestamps_for(self, keys: list[str]) -> None:
+        pipeline = self.redis.pipeline(transaction=False)
+
+        for key in keys:
+            pipeline.json().get(key)
+
+        payloads = await pipeline.execute()
+
+        for key, payload in zip(keys, payloads, strict=True):
+            if not isinstance(payload, dict) or "createdTimestamp" in payload:
+                continue
+
+            todo = Todo.model_validate(payload)
+
+            # NX keeps timestamps written by a concurrent update.
+            for path, value in (
+                ("$.createdTimestamp", epoch_millis(todo.created_date)),
+                ("$.updatedTimestamp", epoch_millis(todo.updated_date)),
+            ):
+                if value is not None:
+                    pipeline.json().set(key, path, value, nx=True)
+
+        await pipeline.execute()
+
+    async def wait_for_indexing(self, name: str) -> None:
+        deadline = asyncio.get_running_loop().time() + INDEX_BUILD_TIMEOUT
+
+        while True:
+            info = await self.index_info(name)
+
+            if info is not None and int(info.get("indexing", 0)) == 0:
+                return
+
+            if asyncio.get_running_loop().time() > deadline:
+                raise TimeoutError(f"Index {name} did not finish indexing")
+
+            await asyncio.sleep(INDEX_BUILD_POLL_INTERVAL)
+
+    async def swap_alias(self, target: str, previous: str | None) -> None:
+        if previous == self.index:
+            # Indexes created before aliasing used the alias name itself, and an
+            # alias cannot shadow an index, so search is briefly unavailable.
+            logger.warning(f"Replacing unversioned index {self.index} with {target}")
+            await self.drop_index_named(previous)
+
+        await self.redis.ft(target).aliasupdate(self.index)
+        logger.debug(f"Index {self.index} now points at {target}")
+
+        if previous is not None and previous not in {self.index, target}:
+            await self.drop_index_named(previous)
+
     async def drop_index(self) -> None:
-        if not await self.have_index():
+        info = await self.index_info(self.index)
+
+        if info is None:
             return
 
         try:
-            await self.redis.ft(self.index).dropindex()
+            await self.redis.ft(cast(str, info["index_name"])).dropindex()
         except Exception as exc:
             logger.error(f"Error dropping index {self.index}: {exc}")
             raise
 
+    def check_atomic_batch(self, keys: Sequence[str]) -> None:
+        # A cluster transaction runs on one node, so its keys must share a slot.
+        if self.cluster and len({key_slot(key.encode()) for key in keys}) > 1:
+            raise ClientError(
+                400,
+                "Atomic batches in cluster mode need ids sharing a {hash tag}",
+            )
+
     def format_id(self, todo_id: str) -> str:
         if re.match(f"^{self.prefix}", todo_id):
             return todo_id
@@ -120,35 +495,156 @@ class TodoStore:
             id=todo.id,
             value=Todo.model_validate(
                 from_json(
-                    cast(str, cast(Any, todo).json),
+                    self.encoding.document_json(todo),
                     allow_partial=True,
                 )
             ),
         )
 
+    def todo_document_fragments(self, todos: list[Document]) -> list[str]:
+        # JSON search results already carry each todo as JSON text, so wrap it.
+        return [
+            f'{{"id":{json.dumps(doc.id)},"value":{self.encoding.document_json(doc)}}}'
+            for doc in todos
+        ]
+
     def deserialize_todo_documents(self, todos: list[Document]) -> list[TodoDocument]:
-        return [self.deserialize_todo_document(doc) for doc in todos]
+        """Validates a page of search results in a single pydantic pass"""
+        return todo_documents_adapter.validate_json(
+            f"[{','.join(self.todo_document_fragments(todos))}]"
+        )
+
+    def encode_todos(self, result: Result, cursor: str | None = None) -> bytes:
+        """Encodes a `Todos` payload straight from the stored JSON, unvalidated"""
+        return (
+            f'{{"total":{result.total},'
+            f'"documents":[{",".join(self.todo_document_fragments(result.docs))}],'
+            f'"cursor":{json.dumps(cursor)}}}'
+        ).encode()
+
+    def encode_page(
+        self, result: Result, cursor: str | None = None, validate: bool = True
+    ) -> bytes:
+        if not validate:
+            return self.encode_todos(result, cursor)
+
+        return (
+            Todos(
+                total=result.total,
+                documents=self.deserialize_todo_documents(result.docs),
+                cursor=cursor,
+            )
+            .model_dump_json()
+            .encode()
+        )
+
+    def next_cursor(self, result: Result, cursor: int) -> str | None:
+        next_cursor = cursor + len(result.docs)
+
+        return str(next_cursor) if next_cursor < result.total else None
+
+    async def search_all(
+        self, limit: int, cursor: int, reader: RedisClient | None = None
+    ) -> Result:
+        reader = reader or self.replicas.reader()
 
-    async def all(self) -> Todos:
         try:
-            result = await self.redis.ft(self.index).search("*")
+            return cast(
+                Result,
+                await reader.ft(self.index).search(Query("*").paging(cursor, limit)),
+            )
         except Exception as exc:
             logger.error(f"Error getting all todos: {exc}")
             raise
 
+    async def all(self, limit: int = DEFAULT_PAGE_SIZE, cursor: int = 0) -> Todos:
+        result = await self.search_all(limit, cursor)
+
         return Todos(
             total=result.total,
             documents=self.deserialize_todo_documents(result.docs),
+            cursor=self.next_cursor(result, cursor),
         )
 
+    async def all_json(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: int = 0,
+        validate: bool = False,
+    ) -> bytes:
+        async def load(reader: RedisClient) -> bytes:
+            result = await self.search_all(limit, cursor, reader)
+            return self.encode_page(result, self.next_cursor(result, cursor), validate)
+
+        return await self.cached_json(("all", limit, cursor, validate), load)
+
+    async def stream_all(
+        self, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[TodoDocument]:
+        """Yields every todo using an FT.AGGREGATE cursor, one batch at a time"""
+        query: AggregateRequest | Cursor = (
+            AggregateRequest("*")
+            .load("@__key", *self.encoding.export_fields)
+            .cursor(count=batch_size)
+        )
+        cursor_id = 0
+        # Cursors live on the server that created them, so stay on one reader.
+        reader = self.replicas.reader()
+
+        try:
+            while True:
+                try:
+                    # redis-py types aggregate() as taking a result, not a request.
+                    result = await reader.ft(self.index).aggregate(cast(Any, query))
+                except Exception as exc:
+                    logger.error(f"Error exporting todos: {exc}")
+                    raise
+
+                for row in result.rows:
+                    fields = dict(zip(row[::2], row[1::2], strict=True))
+                    yield TodoDocument(
+                        id=fields["__key"],
+                        value=Todo.model_validate_json(
+                            self.encoding.export_json(fields)
+                        ),
+                    )
+
+                next_cursor: Cursor | None = result.cursor
+                cursor_id = next_cursor.cid if next_cursor else 0
+
+                if next_cursor is None or cursor_id == 0:
+                    return
+
+                next_cursor.count = batch_size
+                query = next_cursor
+        finally:
+            if cursor_id != 0:
+                # The consumer stopped early, so release the server-side cursor.
+                try:
+                    await reader.execute_command(
+                        "FT.CURSOR", "DEL", self.index, cursor_id
+                    )
+                except Exception as exc:
+                    logger.debug(f"Error releasing cursor {cursor_id}: {exc}")
+
     async def one(self, todo_id: str) -> Todo:
         formatted_id = self.format_id(todo_id)
+        epoch = 0
+        # Tracking invalidates against the primary, and a lagging replica could
+        # refill the cache with a value it just evicted, so cached reads stay there.
+        reader = self.redis if self.cache is not None else self.replicas.reader()
+
+        if self.cache is not None:
+            cached = self.cache.get(formatted_id)
+
+            if cached is not None:
+                return cached
+
+            epoch = self.cache.epoch
 
         try:
-            # redis-py async JSON stubs are currently typed as sync returns.
-            payload = cast(
-                dict[str, object] | None,
-                await self.redis.json().get(formatted_id),  # type: ignore[misc]
+            payload = self.encoding.decode(
+                await self.encoding.get(reader, formatted_id)
             )
         except Exception as exc:
             logger.error(f"Error getting todo {formatted_id}: {exc}")
@@ -157,34 +653,219 @@ class TodoStore:
         if payload is None:
             raise ClientError(404, "Not Found")
 
-        return Todo.model_validate(payload)
+        todo = Todo.model_validate(payload)
+
+        if self.cache is not None:
+            self.cache.set(formatted_id, todo, epoch)
+
+        return todo
+
+    async def many(self, todo_ids: Sequence[str]) -> TodoBatch:
+        """Gets todos by ID in one round trip, reporting missing ones inline"""
+        ids = [self.format_id(todo_id) for todo_id in todo_ids]
+        found: dict[str, Todo] = {}
+        epoch = 0
+        reader = self.redis if self.cache is not None else self.replicas.reader()
+
+        if self.cache is not None:
+            for todo_id in ids:
+                cached = self.cache.get(todo_id)
+
+                if cached is not None:
+                    found[todo_id] = cached
+
+            epoch = self.cache.epoch
+
+        missing = list(
+            dict.fromkeys(todo_id for todo_id in ids if todo_id not in found)
+        )
+
+        if len(missing) > 0:
+            try:
+                payloads = await self.encoding.get_many(reader, missing)
+            except Exception as exc:
+                logger.error(f"Error getting todos: {exc}")
+                raise
+
+            for todo_id, payload in zip(missing, payloads, strict=True):
+                if payload is None:
+                    continue
 
-    async def search(self, name: str | None, status: TodoStatus | None) -> Todos:
-        searches: list[str] = []
+                found[todo_id] = Todo.model_validate(payload)
 
-        if name is not None and len(name) > 0:
-            searches.append(f"@name:({name})")
+                if self.cache is not None:
+                    self.cache.set(todo_id, found[todo_id], epoch)
+
+        return TodoBatch(
+            results=[
+                TodoBatchResult(id=todo_id, status=200, value=found[todo_id])
+                if todo_id in found
+                else TodoBatchResult(id=todo_id, status=404, message="Not Found")
+                for todo_id in ids
+            ]
+        )
 
-        if status is not None:
-            searches.append(f'@status:"{status.value}"')
+    async def search_todos(
+        self,
+        name: str | None,
+        status: TodoStatus | None,
+        match: MatchMode = "all",
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: int = 0,
+        filters: SearchFilters | None = None,
+        reader: RedisClient | None = None,
+    ) -> Result:
+        query = build_search_query(
+            name,
+            status.value if status is not None else None,
+            match,
+            limit,
+            cursor,
+            filters,
+        )
+        reader = reader or self.replicas.reader()
 
         try:
-            result = await self.redis.ft(self.index).search(Query(" ".join(searches)))
+            return cast(Result, await reader.ft(self.index).search(query))
         except Exception as exc:
             logger.error(f"Error searching todos: {exc}")
             raise
 
+    def search_cursor(self, result: Result, limit: int, cursor: int) -> str | None:
+        # A count-only search (limit 0) has no next page to point at.
+        return self.next_cursor(result, cursor) if limit > 0 else None
+
+    async def search(
+        self,
+        name: str | None,
+        status: TodoStatus | None,
+        match: MatchMode = "all",
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: int = 0,
+        filters: SearchFilters | None = None,
+    ) -> Todos:
+        result = await self.search_todos(name, status, match, limit, cursor, filters)
+
         return Todos(
             total=result.total,
             documents=self.deserialize_todo_documents(result.docs),
+            cursor=self.search_cursor(result, limit, cursor),
         )
 
-    async def create(self, todo_id: str | None, name: str | None) -> TodoDocument:
-        if name is None:
-            raise ClientError(400, "Todo must have a name")
+    async def search_json(
+        self,
+        name: str | None,
+        status: TodoStatus | None,
+        match: MatchMode = "all",
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: int = 0,
+        filters: SearchFilters | None = None,
+        validate: bool = False,
+    ) -> bytes:
+        async def load(reader: RedisClient) -> bytes:
+            result = await self.search_todos(
+                name, status, match, limit, cursor, filters, reader
+            )
+            return self.encode_page(
+                result, self.search_cursor(result, limit, cursor), validate
+            )
+
+        # The compiled query is the normalized form of the search params.
+        query = build_search_query(
+            name,
+            status.value if status is not None else None,
+            match,
+            limit,
+            cursor,
+            filters,
+        )
+
+        return await self.cached_json(("search", *query.get_args(), validate), load)
+
+    def stats_request(
+        self, bucket: StatsBucket | None, date_field: StatsDateField
+    ) -> AggregateRequest:
+        request = AggregateRequest("*")
+        count = reducers.count().alias("count")
+
+        if bucket is None:
+            return request.group_by("@status", count)
+
+        # Dates are indexed in milliseconds; the date functions take seconds.
+        # One group past the limit is read so that going over it shows.
+        return (
+            request.apply(bucket=f"{bucket}(floor(@{date_field} / 1000))")
+            .group_by(["@bucket", "@status"], count)
+            .sort_by("@bucket", max=MAX_STATS_GROUPS + 1)
+            .limit(0, MAX_STATS_GROUPS + 1)
+        )
+
+    async def stats(
+        self,
+        bucket: StatsBucket | None = None,
+        date_field: StatsDateField = "createdDate",
+    ) -> TodoStats:
+        """Counts todos per status with one FT.AGGREGATE, and per date bucket
+        with a second if one is given, neither of which loads the documents"""
+        requests = [self.stats_request(None, date_field)]
+
+        if bucket is not None:
+            requests.append(self.stats_request(bucket, date_field))
+
+        reader = self.replicas.reader()
+
+        try:
+            # redis-py types aggregate() as taking a result, not a request.
+            results = await asyncio.gather(
+                *(
+                    reader.ft(self.index).aggregate(cast(Any, request))
+                    for request in requests
+                )
+            )
+        except Exception as exc:
+            logger.error(f"Error counting todos: {exc}")
+            raise
+
+        counts = dict.fromkeys(TodoStatus, 0)
+
+        for fields in stats_rows(results[0].rows):
+            counts[TodoStatus(fields["status"])] += int(fields["count"])
+
+        if bucket is None:
+            return TodoStats(total=sum(counts.values()), counts=counts)
+
+        if len(results[1].rows) > MAX_STATS_GROUPS:
+            raise ClientError(
+                400, f"Too many {bucket} buckets to count, use a larger bucket"
+            )
+
+        buckets: dict[int, dict[TodoStatus, int]] = {}
+
+        for fields in stats_rows(results[1].rows):
+            # Todos without the date field land in a null bucket; skip those.
+            if fields.get("bucket") not in {None, ""}:
+                start = int(float(fields["bucket"]))
+                buckets.setdefault(start, dict.fromkeys(TodoStatus, 0))[
+                    TodoStatus(fields["status"])
+                ] += int(fields["count"])
+
+        return TodoStats(
+            total=sum(counts.values()),
+            counts=counts,
+            buckets=[
+                TodoStatsBucket(
+                    start=datetime.fromtimestamp(start, UTC),
+                    total=sum(bucket_counts.values()),
+                    counts=bucket_counts,
+                )
+                for start, bucket_counts in buckets.items()
+            ],
+        )
 
+    def new_todo_document(self, todo_id: str | None, name: str) -> TodoDocument:
         created_at = datetime.now(UTC)
-        todo = TodoDocument(
+
+        return TodoDocument(
             id=self.format_id(todo_id or str(uuid4())),
             value=Todo(
                 name=name,
@@ -194,69 +875,429 @@ class TodoStore:
             ),
         )
 
+    async def create(self, todo_id: str | None, name: str | None) -> TodoDocument:
+        if name is None:
+            raise ClientError(400, "Todo must have a name")
+
+        todo = self.new_todo_document(todo_id, name)
+
         try:
-            result = await self.redis.json().set(
-                todo.id,
-                "$",
-                todo.value.model_dump(by_alias=True, exclude_none=True, mode="json"),
-            )  # type: ignore[misc]
+            result = await self.encoding.set(self.redis, todo.id, todo.value)
         except Exception as exc:
             logger.error(f"Error creating todo {todo.id}: {exc}")
             raise
 
-        if result not in {True, "OK"}:
+        self.invalidate_cache([todo.id])
+
+        if not self.encoding.set_succeeded(result):
             raise ClientError(400, "Todo is invalid")
 
+        await self.record_writes(
+            [TodoChange.now("create", todo.id, todo.value.status.value)]
+        )
         return todo
 
+    def update_status_args(self, status: TodoStatus) -> list[Any]:
+        return self.encoding.update_args(status, datetime.now(UTC))
+
     async def update(self, todo_id: str, status: TodoStatus) -> Todo:
-        updated_at = datetime.now(UTC)
-        todo = await self.one(todo_id)
-        todo.status = status
-        todo.updated_date = updated_at
+        formatted_id = self.format_id(todo_id)
 
         try:
-            result = await self.redis.json().set(
-                self.format_id(todo_id),
-                "$",
-                todo.model_dump(by_alias=True, exclude_none=True, mode="json"),
-            )  # type: ignore[misc]
+            payload = await self.update_status_script(
+                keys=[formatted_id],
+                args=self.update_status_args(status),
+            )
         except Exception as exc:
             logger.error(f"Error updating todo {todo_id}: {exc}")
             raise
 
-        if result not in {True, "OK"}:
-            raise ClientError(400, "Todo is invalid")
+        self.invalidate_cache([formatted_id])
 
-        return todo
+        if payload is None:
+            raise ClientError(404, "Not Found")
+
+        await self.record_writes([TodoChange.now("update", formatted_id, status.value)])
+        return Todo.model_validate(self.encoding.decode_update(payload))
 
     async def delete(self, todo_id: str) -> None:
+        formatted_id = self.format_id(todo_id)
+
         try:
-            await self.redis.json().delete(self.format_id(todo_id))  # type: ignore[misc]
+            deleted = await self.encoding.delete(self.redis, formatted_id)
         except Exception as exc:
             logger.error(f"Error deleting todo {todo_id}: {exc}")
             raise
 
-    async def delete_all(self) -> None:
-        todos = await self.all()
+        self.invalidate_cache([formatted_id])
+
+        if deleted:
+            await self.record_writes([TodoChange.now("delete", formatted_id)])
+
+    async def create_many(
+        self, todos: Sequence[tuple[str | None, str]], atomic: bool = False
+    ) -> TodoBatch:
+        documents = [self.new_todo_document(todo_id, name) for todo_id, name in todos]
+
+        if atomic:
+            self.check_atomic_batch([todo.id for todo in documents])
+
+        pipeline = self.redis.pipeline(transaction=atomic)
+
+        for todo in documents:
+            self.encoding.set(pipeline, todo.id, todo.value)
+
+        try:
+            replies = await pipeline.execute(raise_on_error=False)
+        except Exception as exc:
+            logger.error(f"Error creating todos: {exc}")
+            raise
+
+        self.invalidate_cache([todo.id for todo in documents])
+
+        results: list[TodoBatchResult] = []
+
+        for todo, reply in zip(documents, replies, strict=True):
+            if isinstance(reply, Exception) or not self.encoding.set_succeeded(reply):
+                results.append(
+                    TodoBatchResult(id=todo.id, status=400, message="Todo is invalid")
+                )
+            else:
+                results.append(
+                    TodoBatchResult(id=todo.id, status=200, value=todo.value)
+                )
+
+        await self.record_writes(
+            [
+                TodoChange.now("create", result.id, result.value.status.value)
+                for result in results
+                if result.value is not None
+            ]
+        )
+        return TodoBatch(results=results)
+
+    async def update_many(
+        self, updates: Sequence[tuple[str, TodoStatus]], atomic: bool = False
+    ) -> TodoBatch:
+        ids = [self.format_id(todo_id) for todo_id, _ in updates]
+
+        if atomic:
+            self.check_atomic_batch(ids)
 
-        for todo in todos.documents:
+        pipeline = self.redis.pipeline(transaction=atomic)
+
+        try:
+            if isinstance(pipeline, ClusterPipeline):
+                # Cluster pipelines cannot load scripts on demand, so make sure
+                # every primary has it before queueing EVALSHA.
+                await self.redis.script_load(self.encoding.update_script)
+
+            for todo_id, (_, status) in zip(ids, updates, strict=True):
+                if isinstance(pipeline, ClusterPipeline):
+                    pipeline.evalsha(
+                        self.update_status_script.sha,
+                        1,
+                        todo_id,
+                        *self.update_status_args(status),
+                    )
+                else:
+                    await self.update_status_script(
+                        keys=[todo_id],
+                        args=self.update_status_args(status),
+                        client=pipeline,
+                    )
+
+            replies = await pipeline.execute(raise_on_error=False)
+        except Exception as exc:
+            logger.error(f"Error updating todos: {exc}")
+            raise
+
+        self.invalidate_cache(ids)
+        batch = TodoBatch(
+            results=[
+                TodoBatchResult(
+                    id=todo_id,
+                    status=200,
+                    value=Todo.model_validate(self.encoding.decode_update(reply)),
+                )
+                if reply is not None and not isinstance(reply, Exception)
+                else TodoBatchResult(id=todo_id, status=404, message="Not Found")
+                for todo_id, reply in zip(ids, replies, strict=True)
+            ]
+        )
+
+        await self.record_writes(
+            [
+                TodoChange.now("update", result.id, result.value.status.value)
+                for result in batch.results
+                if result.value is not None
+            ]
+        )
+        return batch
+
+    async def delete_many(
+        self, todo_ids: Sequence[str], atomic: bool = False
+    ) -> TodoBatch:
+        ids = [self.format_id(todo_id) for todo_id in todo_ids]
+
+        if atomic:
+            self.check_atomic_batch(ids)
+
+        pipeline = self.redis.pipeline(transaction=atomic)
+
+        for todo_id in ids:
+            self.encoding.delete(pipeline, todo_id)
+
+        try:
+            replies = await pipeline.execute(raise_on_error=False)
+        except Exception as exc:
+            logger.error(f"Error deleting todos: {exc}")
+            raise
+
+        self.invalidate_cache(ids)
+        await self.record_writes(
+            [
+                TodoChange.now("delete", todo_id)
+                for todo_id, reply in zip(ids, replies, strict=True)
+                if reply == 1
+            ]
+        )
+
+        return TodoBatch(
+            results=[
+                TodoBatchResult(id=todo_id, status=200)
+                if reply == 1
+                else TodoBatchResult(id=todo_id, status=404, message="Not Found")
+                for todo_id, reply in zip(ids, replies, strict=True)
+            ]
+        )
+
+    async def archive_completed(self, before: datetime) -> int:
+        """Moves todos completed before `before` into the archive, a batch at
+        a time, and returns how many were moved"""
+        filters = SearchFilters(updated_before=before, sort_by="updatedDate")
+        archived = 0
+
+        while True:
+            # Search the primary, as a lagging replica could resurface todos
+            # that were just archived.
+            result = await self.search_todos(
+                None,
+                TodoStatus.complete,
+                limit=self.archive_batch_size,
+                filters=filters,
+                reader=self.redis,
+            )
+
+            if len(result.docs) == 0:
+                return archived
+
+            moved = await self.archive_batch([doc.id for doc in result.docs], before)
+
+            # Another writer got there first; the next run picks up the rest.
+            if moved == 0:
+                return archived
+
+            archived += moved
+
+    async def archive_batch(self, todo_ids: list[str], before: datetime) -> int:
+        """Appends the todos that are still completed before `before` to the
+        archive and deletes them in one transaction. Returns 0 without
+        archiving anything if any of them changed in the meantime."""
+        async with self.redis.pipeline(transaction=True) as pipeline:
             try:
-                await self.redis.json().delete(todo.id)  # type: ignore[misc]
+                await pipeline.watch(*todo_ids)
+                payloads = await self.encoding.get_many(self.redis, todo_ids)
+                documents = [
+                    TodoDocument(id=todo_id, value=Todo.model_validate(payload))
+                    for todo_id, payload in zip(todo_ids, payloads, strict=True)
+                    if payload is not None
+                ]
+                documents = [
+                    todo
+                    for todo in documents
+                    if todo.value.status == TodoStatus.complete
+                    # Compare in milliseconds, as the search above did.
+                    and cast(int, epoch_millis(todo.value.updated_date))
+                    < cast(int, epoch_millis(before))
+                ]
+
+                if len(documents) == 0:
+                    return 0
+
+                pipeline.multi()
+                pipeline.xadd(
+                    TODOS_ARCHIVE_KEY,
+                    {
+                        "count": len(documents),
+                        "todos": pack(todo_documents_adapter.dump_json(documents)),
+                    },
+                )
+
+                for todo in documents:
+                    self.encoding.delete(pipeline, todo.id)
+
+                await pipeline.execute()
+            except WatchError:
+                logger.debug("Todos changed while being archived")
+                return 0
             except Exception as exc:
-                logger.error(f"Error deleting todos: {exc}")
+                logger.error(f"Error archiving todos: {exc}")
                 raise
 
+        ids = [todo.id for todo in documents]
+        self.invalidate_cache(ids)
+        await self.record_writes(
+            [TodoChange.now("archive", todo_id) for todo_id in ids]
+        )
+        return len(documents)
 
-def get_todos_store() -> TodoStore:
+    async def archived(
+        self, cursor: str | None = None, batches: int = 1
+    ) -> ArchivedTodos:
+        """Gets the todos in up to `batches` archive batches after `cursor`"""
+        pipeline = self.replicas.reader().pipeline(transaction=False)
+        pipeline.xrange(
+            TODOS_ARCHIVE_KEY,
+            min="-" if cursor is None else f"({cursor}",
+            count=batches,
+        )
+        pipeline.xrevrange(TODOS_ARCHIVE_KEY, count=1)
+
+        try:
+            entries, last = await pipeline.execute()
+        except Exception as exc:
+            logger.error(f"Error getting archived todos: {exc}")
+            raise
+
+        documents = [
+            todo
+            for _, fields in entries
+            for todo in todo_documents_adapter.validate_json(unpack(fields["todos"]))
+        ]
+        more = len(entries) > 0 and len(last) > 0 and last[0][0] != entries[-1][0]
+
+        return ArchivedTodos(
+            documents=documents, cursor=entries[-1][0] if more else None
+        )
+
+    async def delete_all(self, progress: Callable[[int], None] | None = None) -> int:
+        """Deletes every todo and returns how many were deleted.
+
+        Each cluster primary is scanned in parallel, and batches of keys are
+        UNLINKed (freed in the background by Redis) with at most
+        `purge_concurrency` batches in flight. `progress` is called with the
+        running total after each batch.
+        """
+        nodes: list[ClusterNode | None] = (
+            list(self.redis.get_primaries())
+            if isinstance(self.redis, RedisCluster)
+            else [None]
+        )
+        purge = TodoPurge(self.redis, self.purge_concurrency, progress)
+
+        try:
+            await asyncio.gather(*(self.delete_all_on(node, purge) for node in nodes))
+            await purge.wait()
+        except Exception as exc:
+            purge.cancel()
+            logger.error(f"Error deleting todos: {exc}")
+            raise
+        finally:
+            self.invalidate_cache()
+
+        await self.record_writes([TodoChange.now("clear")])
+        logger.info(f"Deleted {purge.deleted} todos")
+        return purge.deleted
+
+    async def scan_keys(
+        self, cursor: int, node: ClusterNode | None
+    ) -> tuple[int, list[str]]:
+        if isinstance(self.redis, RedisCluster):
+            cursors, keys = await self.redis.scan(
+                cursor,
+                match=f"{self.prefix}*",
+                count=self.purge_batch_size,
+                _type=self.encoding.key_type,
+                target_nodes=node,
+            )
+            return cursors[cast(ClusterNode, node).name], keys
+
+        return cast(
+            tuple[int, list[str]],
+            await self.redis.scan(
+                cursor,
+                match=f"{self.prefix}*",
+                count=self.purge_batch_size,
+                _type=self.encoding.key_type,
+            ),
+        )
+
+    async def delete_all_on(self, node: ClusterNode | None, purge: "TodoPurge") -> None:
+        cursor = 0
+        batch: list[str] = []
+
+        while True:
+            cursor, keys = await self.scan_keys(cursor, node)
+            batch.extend(keys)
+
+            # SCAN COUNT is only a hint, so gather keys into full batches.
+            if len(batch) >= self.purge_batch_size or (cursor == 0 and len(batch) > 0):
+                await purge.submit(batch)
+                batch = []
+
+            if cursor == 0:
+                return
+
+
+def archive_after(settings: Settings) -> timedelta | None:
+    days = settings.todos_archive_after_days
+    return None if days is None else timedelta(days=days)
+
+
+def get_todos_store() -> "TodoStore | MemoryTodoStore":
     global todos_store
 
     if todos_store is None:
-        todos_store = TodoStore(get_client())
+        todos_store = create_todos_store(get_settings())
 
     return todos_store
 
 
+def create_todos_store(settings: Settings) -> "TodoStore | MemoryTodoStore":
+    if settings.todos_backend == "memory":
+        # Imported here because the memory store builds on this module.
+        from app.components.todos.memory_store import MemoryTodoStore
+
+        return MemoryTodoStore(
+            archive_after(settings),
+            settings.todos_archive_interval,
+            settings.todos_archive_batch_size,
+        )
+
+    redis = get_client()
+    read_urls = settings.redis_read_urls
+
+    if settings.redis_cluster and len(read_urls) > 0:
+        logger.warning("REDIS_READ_URLS is ignored in cluster mode")
+        read_urls = []
+
+    replicas = [get_client(url) for url in read_urls]
+    return TodoStore(
+        redis,
+        settings.todos_cache_size,
+        ReplicaSet(redis, replicas, settings.redis_read_strategy),
+        create_search_cache(settings, redis),
+        create_change_feed(settings, redis),
+        settings.todos_purge_batch_size,
+        settings.todos_purge_concurrency,
+        create_encoding(settings.todos_storage),
+        archive_after(settings),
+        settings.todos_archive_interval,
+        settings.todos_archive_batch_size,
+    )
+
+
 def reset_todos_store() -> None:
     global todos_store
 
@@ -1,9 +1,36 @@
-from typing import Annotated
-
-from pydantic import BaseModel, ConfigDict, StringConstraints, field_validator
+from datetime import UTC, datetime
+from typing import Annotated, Self
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    RootModel,
+    StringConstraints,
+    field_validator,
+    model_validator,
+)
 from pydantic_core import PydanticCustomError
 
-from app.components.todos.store import TodoStatus
+from app.components.todos.archive import MAX_ARCHIVE_PAGE_BATCHES
+from app.components.todos.query import (
+    MAX_QUERY_LENGTH,
+    MatchMode,
+    SearchFilters,
+    SortField,
+    SortOrder,
+    query_words,
+)
+from app.components.todos.store import (
+    DEFAULT_PAGE_SIZE,
+    MAX_BATCH_SIZE,
+    MAX_PAGE_SIZE,
+    StatsBucket,
+    StatsDateField,
+    TodoStatus,
+)
+
+TodoId = Annotated[str, StringConstraints(min_length=1)]
 
 
 class CreateTodoBody(BaseModel):
@@ -27,14 +54,142 @@ class UpdateTodoBody(BaseModel):
     status: TodoStatus
 
 
+class ListTodosQuery(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: int = Field(default=0, ge=0)
+
+
+class MultiGetTodosQuery(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    ids: Annotated[list[TodoId], Field(min_length=1, max_length=MAX_BATCH_SIZE)]
+
+    @field_validator("ids", mode="before")
+    @classmethod
+    def split_ids(cls, value: str | list[str]) -> list[str]:
+        if isinstance(value, str):
+            value = value.split(",")
+
+        return [todo_id.strip() for todo_id in value if todo_id.strip()]
+
+
 class SearchTodosQuery(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
-    name: str | None = None
+    name: str | None = Field(default=None, max_length=MAX_QUERY_LENGTH)
     status: TodoStatus | None = None
+    match: MatchMode = "all"
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=0, le=MAX_PAGE_SIZE)
+    cursor: int = Field(default=0, ge=0)
+    sort_by: SortField | None = None
+    order: SortOrder = "asc"
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    updated_after: datetime | None = None
+    updated_before: datetime | None = None
+
+    @field_validator("name")
+    @classmethod
+    def validate_name(cls, value: str | None) -> str | None:
+        if value is None or len(value) == 0:
+            return None
+
+        if len(query_words(value)) == 0:
+            raise PydanticCustomError(
+                "search_name",
+                "Search name must contain at least one word",
+            )
+
+        return value
+
+    @field_validator(
+        "created_after", "created_before", "updated_after", "updated_before"
+    )
+    @classmethod
+    def validate_date(cls, value: datetime | None) -> datetime | None:
+        # Stored dates are UTC, so read dates without an offset as UTC too.
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+
+        return value
+
+    @model_validator(mode="after")
+    def validate_date_ranges(self) -> Self:
+        for after, before in (
+            (self.created_after, self.created_before),
+            (self.updated_after, self.updated_before),
+        ):
+            if after is not None and before is not None and after >= before:
+                raise PydanticCustomError(
+                    "date_range",
+                    "Date ranges must end after they start",
+                )
+
+        return self
+
+    def filters(self) -> SearchFilters:
+        return SearchFilters.model_validate(
+            self.model_dump(include=set(SearchFilters.model_fields))
+        )
+
+
+class TodoStatsQuery(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    bucket: StatsBucket | None = None
+    date: StatsDateField = "createdDate"
+
+
+class TodoChangesQuery(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    # A stream entry ID, as sent in each event's `id` field.
+    last_id: str | None = Field(default=None, pattern=r"^\d+(-\d+)?$")
+
+
+class ArchivedTodosQuery(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    # The stream entry ID of the last batch on the previous page.
+    cursor: str | None = Field(default=None, pattern=r"^\d+(-\d+)?$")
+    batches: int = Field(default=1, ge=1, le=MAX_ARCHIVE_PAGE_BATCHES)
 
 
 class TodoIdParams(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
-    id: Annotated[str, StringConstraints(min_length=1)]
+    id: TodoId
+
+
+class UpdateTodoItem(UpdateTodoBody):
+    id: TodoId
+
+
+class BatchTodosQuery(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    atomic: bool = False
+
+
+class CreateTodosBody(
+    RootModel[
+        Annotated[list[CreateTodoBody], Field(min_length=1, max_length=MAX_BATCH_SIZE)]
+    ]
+):
+    pass
+
+
+class UpdateTodosBody(
+    RootModel[
+        Annotated[list[UpdateTodoItem], Field(min_length=1, max_length=MAX_BATCH_SIZE)]
+    ]
+):
+    pass
+
+
+class DeleteTodosBody(
+    RootModel[Annotated[list[TodoId], Field(min_length=1, max_length=MAX_BATCH_SIZE)]]
+):
+    pass
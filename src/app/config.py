@@ -9,6 +9,11 @@ load_dotenv()
 
 AppEnv = Literal["development", "test", "production"]
 LogLevel = Literal["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"]
+LogOverflowPolicy = Literal["drop_newest", "drop_oldest", "block"]
+ReadStrategy = Literal["round_robin", "least_latency"]
+SearchCacheBackend = Literal["off", "memory", "redis"]
+StorageEncoding = Literal["json", "hash"]
+TodosBackend = Literal["redis", "memory"]
 
 
 class Settings(BaseModel):
@@ -22,18 +27,213 @@ class Settings(BaseModel):
         min_length=1,
         validation_alias="REDIS_URL",
     )
+    redis_read_urls: list[str] = Field(
+        default=[],
+        validation_alias="REDIS_READ_URLS",
+    )
+    redis_read_strategy: ReadStrategy = Field(
+        default="round_robin",
+        validation_alias="REDIS_READ_STRATEGY",
+    )
+    read_your_writes_window: float = Field(
+        default=0.0,
+        ge=0,
+        validation_alias="READ_YOUR_WRITES_WINDOW",
+    )
+    redis_cluster: bool = Field(default=False, validation_alias="REDIS_CLUSTER")
+    redis_pool_size: int | None = Field(
+        default=None,
+        ge=1,
+        validation_alias="REDIS_POOL_SIZE",
+    )
+    redis_pool_timeout: float = Field(
+        default=5.0,
+        ge=0,
+        validation_alias="REDIS_POOL_TIMEOUT",
+    )
+    redis_pool_warm_connections: int = Field(
+        default=0,
+        ge=0,
+        validation_alias="REDIS_POOL_WARM_CONNECTIONS",
+    )
+    redis_socket_timeout: float | None = Field(
+        default=None,
+        gt=0,
+        validation_alias="REDIS_SOCKET_TIMEOUT",
+    )
+    redis_socket_connect_timeout: float | None = Field(
+        default=None,
+        gt=0,
+        validation_alias="REDIS_SOCKET_CONNECT_TIMEOUT",
+    )
+    redis_socket_keepalive: bool = Field(
+        default=True,
+        validation_alias="REDIS_SOCKET_KEEPALIVE",
+    )
+    redis_health_check_interval: int = Field(
+        default=30,
+        ge=0,
+        validation_alias="REDIS_HEALTH_CHECK_INTERVAL",
+    )
+    redis_retries: int = Field(default=3, ge=0, validation_alias="REDIS_RETRIES")
+    redis_retry_backoff_cap: float = Field(
+        default=1.0,
+        ge=0,
+        validation_alias="REDIS_RETRY_BACKOFF_CAP",
+    )
+    redis_retry_budget: float = Field(
+        default=0.1,
+        ge=0,
+        validation_alias="REDIS_RETRY_BUDGET",
+    )
+    circuit_breaker_failures: int = Field(
+        default=5,
+        ge=1,
+        validation_alias="CIRCUIT_BREAKER_FAILURES",
+    )
+    circuit_breaker_reset_timeout: float = Field(
+        default=5.0,
+        gt=0,
+        validation_alias="CIRCUIT_BREAKER_RESET_TIMEOUT",
+    )
+    request_timeout: float | None = Field(
+        default=10.0,
+        gt=0,
+        validation_alias="REQUEST_TIMEOUT",
+    )
+    todos_cache_size: int = Field(
+        default=0,
+        ge=0,
+        validation_alias="TODOS_CACHE_SIZE",
+    )
+    todos_search_cache: SearchCacheBackend = Field(
+        default="off",
+        validation_alias="TODOS_SEARCH_CACHE",
+    )
+    todos_search_cache_size: int = Field(
+        default=1000,
+        ge=1,
+        validation_alias="TODOS_SEARCH_CACHE_SIZE",
+    )
+    todos_search_cache_ttl: int = Field(
+        default=60,
+        ge=1,
+        validation_alias="TODOS_SEARCH_CACHE_TTL",
+    )
+    todos_backend: TodosBackend = Field(
+        default="redis",
+        validation_alias="TODOS_BACKEND",
+    )
+    todos_storage: StorageEncoding = Field(
+        default="json",
+        validation_alias="TODOS_STORAGE",
+    )
+    todos_raw_json: bool = Field(default=False, validation_alias="TODOS_RAW_JSON")
+    todos_purge_batch_size: int = Field(
+        default=1000,
+        ge=1,
+        validation_alias="TODOS_PURGE_BATCH_SIZE",
+    )
+    todos_purge_concurrency: int = Field(
+        default=4,
+        ge=1,
+        validation_alias="TODOS_PURGE_CONCURRENCY",
+    )
+    todos_changes: bool = Field(default=False, validation_alias="TODOS_CHANGES")
+    todos_changes_max_length: int = Field(
+        default=10000,
+        ge=1,
+        validation_alias="TODOS_CHANGES_MAX_LENGTH",
+    )
+    todos_archive_after_days: int | None = Field(
+        default=None,
+        ge=1,
+        validation_alias="TODOS_ARCHIVE_AFTER_DAYS",
+    )
+    todos_archive_interval: float = Field(
+        default=3600.0,
+        gt=0,
+        validation_alias="TODOS_ARCHIVE_INTERVAL",
+    )
+    todos_archive_batch_size: int = Field(
+        default=500,
+        ge=1,
+        le=1000,
+        validation_alias="TODOS_ARCHIVE_BATCH_SIZE",
+    )
     log_level: LogLevel = Field(default="INFO", validation_alias="LOG_LEVEL")
     log_stream_key: str = Field(
         default="logs",
         min_length=1,
         validation_alias="LOG_STREAM_KEY",
     )
+    log_stream_shards: int = Field(
+        default=1,
+        ge=1,
+        validation_alias="LOG_STREAM_SHARDS",
+    )
+    log_stream_queue_size: int = Field(
+        default=10_000,
+        ge=1,
+        validation_alias="LOG_STREAM_QUEUE_SIZE",
+    )
+    log_stream_batch_size: int = Field(
+        default=100,
+        ge=1,
+        validation_alias="LOG_STREAM_BATCH_SIZE",
+    )
+    log_stream_overflow: LogOverflowPolicy = Field(
+        default="drop_newest",
+        validation_alias="LOG_STREAM_OVERFLOW",
+    )
+    log_stream_block_timeout: float = Field(
+        default=0.1,
+        ge=0,
+        validation_alias="LOG_STREAM_BLOCK_TIMEOUT",
+    )
+    log_stream_flush_timeout: float = Field(
+        default=5.0,
+        ge=0,
+        validation_alias="LOG_STREAM_FLUSH_TIMEOUT",
+    )
+    access_log_sample_rate: float = Field(
+        default=1.0,
+        ge=0,
+        le=1,
+        validation_alias="ACCESS_LOG_SAMPLE_RATE",
+    )
+    access_log_errors: bool = Field(default=True, validation_alias="ACCESS_LOG_ERRORS")
+    access_log_slow_ms: float | None = Field(
+        default=None,
+        ge=0,
+        validation_alias="ACCESS_LOG_SLOW_MS",
+    )
+    access_log_headers: list[str] = Field(
+        default=["*"],
+        validation_alias="ACCESS_LOG_HEADERS",
+    )
 
     @field_validator("log_level", mode="before")
     @classmethod
     def normalize_log_level(cls, value: str) -> str:
         return value.upper()
 
+    @field_validator("access_log_headers", mode="before")
+    @classmethod
+    def split_access_log_headers(cls, value: str | list[str]) -> list[str]:
+        if isinstance(value, str):
+            value = value.split(",")
+
+        return [header.strip().lower() for header in value if header.strip()]
+
+    @field_validator("redis_read_urls", mode="before")
+    @classmethod
+    def split_redis_read_urls(cls, value: str | list[str]) -> list[str]:
+        if isinstance(value, str):
+            value = value.split(",")
+
+        return [url.strip() for url in value if url.strip()]
+
     @property
     def is_production(self) -> bool:
         return self.app_env == "production"
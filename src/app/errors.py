@@ -2,3 +2,9 @@ class ClientError(Exception):
     def __init__(self, status: int, message: str):
         super().__init__(message)
         self.status = status
+
+
+class ServiceUnavailableError(ClientError):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(503, message)
+        self.retry_after = retry_after
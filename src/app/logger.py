@@ -1,13 +1,15 @@
 import json
 import logging
+import queue
+import threading
 from collections.abc import Mapping, MutableMapping
 from datetime import UTC, datetime
 from logging import LogRecord
+from time import monotonic
 from typing import Any, cast
 
-from redis import Redis as SyncRedis
-
-from app.config import get_settings
+from app.config import LogOverflowPolicy, get_settings
+from app.redis import create_sync_client, sharded_keys
 
 _configured = False
 
@@ -91,17 +93,50 @@ class ConsoleFormatter(logging.Formatter):
 
 
 class RedisStreamHandler(logging.Handler):
-    def __init__(self) -> None:
+    """Queues log records and ships them to a Redis stream in pipelined XADD
+    batches from a background thread, so `emit` never waits on Redis.
+
+    With `LOG_STREAM_SHARDS` above one, batches rotate across that many streams
+    named `<key>:{<n>}`, which spreads them over cluster slots."""
+
+    def __init__(
+        self,
+        queue_size: int | None = None,
+        batch_size: int | None = None,
+        overflow: LogOverflowPolicy | None = None,
+        block_timeout: float | None = None,
+    ) -> None:
         super().__init__()
         settings = get_settings()
         self.stream_key = settings.log_stream_key
-        self.redis = SyncRedis.from_url(
-            settings.redis_url,
-            decode_responses=True,
-            health_check_interval=1,
+        self.stream_keys = sharded_keys(self.stream_key, settings.log_stream_shards)
+        self.batches_sent = 0
+        self.batch_size = batch_size or settings.log_stream_batch_size
+        self.overflow = overflow or settings.log_stream_overflow
+        self.block_timeout = (
+            settings.log_stream_block_timeout
+            if block_timeout is None
+            else block_timeout
+        )
+        self.flush_timeout = settings.log_stream_flush_timeout
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self.redis = create_sync_client(settings.redis_url, settings)
+        self.queue: queue.Queue[dict[str, str] | None] = queue.Queue(
+            maxsize=queue_size or settings.log_stream_queue_size
+        )
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._drain,
+            name="redis-log-stream",
+            daemon=True,
         )
+        self._worker.start()
 
     def emit(self, record: LogRecord) -> None:
+        if self._closed:
+            return
+
         payload = {
             "level": record.levelname.lower(),
             "component": str(getattr(record, "component", "root")),
@@ -110,12 +145,101 @@ class RedisStreamHandler(logging.Handler):
             "metadata": json.dumps(_record_metadata(record), default=str),
         }
 
+        if self.overflow == "block":
+            # `emit` runs on the event loop, so waiting for room stalls every
+            # request. Wait briefly, then drop like `drop_newest`.
+            try:
+                self.queue.put(payload, timeout=self.block_timeout)
+            except queue.Full:
+                self._drop()
+            return
+
+        try:
+            self.queue.put_nowait(payload)
+            return
+        except queue.Full:
+            if self.overflow == "drop_newest":
+                self._drop()
+                return
+
         try:
-            self.redis.xadd(self.stream_key, cast(Any, payload))
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self._drop()
+            self.queue.put_nowait(payload)
+        except (queue.Empty, queue.Full):
+            self._drop()
+
+    def _drop(self) -> None:
+        # Records are emitted from any thread that logs.
+        with self._dropped_lock:
+            self.dropped += 1
+
+    def _drain(self) -> None:
+        while True:
+            entry = self.queue.get()
+            stopping = entry is None
+            batch = [] if entry is None else [entry]
+
+            while not stopping and len(batch) < self.batch_size:
+                try:
+                    entry = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if entry is None:
+                    stopping = True
+                else:
+                    batch.append(entry)
+
+            try:
+                self._send(batch)
+            finally:
+                for _ in range(len(batch) + int(stopping)):
+                    self.queue.task_done()
+
+            if stopping:
+                return
+
+    def _send(self, batch: list[dict[str, str]]) -> None:
+        if len(batch) == 0:
+            return
+
+        stream_key = self.stream_keys[self.batches_sent % len(self.stream_keys)]
+        self.batches_sent += 1
+        pipeline = self.redis.pipeline(transaction=False)
+
+        for payload in batch:
+            pipeline.xadd(stream_key, cast(Any, payload))
+
+        try:
+            pipeline.execute()
         except Exception:
             # Logging to Redis is best-effort and must not break requests.
             return
 
+    def flush(self) -> None:
+        """Waits up to `flush_timeout` seconds for queued records to be sent"""
+        deadline = monotonic() + self.flush_timeout
+
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks > 0 and self._worker.is_alive():
+                remaining = deadline - monotonic()
+
+                if remaining <= 0:
+                    return
+
+                self.queue.all_tasks_done.wait(remaining)
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self.queue.put(None)
+            self._worker.join(self.flush_timeout)
+            self.redis.close()
+
+        super().close()
+
 
 def configure_logging() -> None:
     global _configured
@@ -137,6 +261,11 @@ def configure_logging() -> None:
     _configured = True
 
 
+def flush_logging() -> None:
+    for handler in logging.getLogger("app").handlers:
+        handler.flush()
+
+
 def get_logger(name: str = "app") -> logging.Logger:
     configure_logging()
     logger = logging.getLogger(name)
@@ -1,28 +1,110 @@
+import logging
+import math
+import random
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
-from time import perf_counter
+from time import perf_counter, time
 from typing import Any
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import ValidationError
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
 from app.components.todos import controller as todos_controller
 from app.components.todos.router import router as todos_router
-from app.errors import ClientError
-from app.logger import configure_logging, get_logger
+from app.config import Settings, get_settings
+from app.errors import ClientError, ServiceUnavailableError
+from app.logger import configure_logging, flush_logging, get_logger
+from app.metrics import (
+    http_request_duration,
+    http_request_errors,
+    http_requests_in_flight,
+    registry,
+)
+from app.redis import get_client, warm_connection_pool
+from app.replicas import read_from_primary
+from app.resilience import set_request_deadline
+
+LAST_WRITE_COOKIE = "todos-last-write"
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
 
 
 def _validation_message(exc: ValidationError | RequestValidationError) -> str:
     return ", ".join(error["msg"] for error in exc.errors())
 
 
+def _should_log_request(
+    settings: Settings, status_code: int, duration_ms: float
+) -> bool:
+    if settings.access_log_errors and status_code >= 500:
+        return True
+
+    if settings.access_log_slow_ms is not None and (
+        duration_ms >= settings.access_log_slow_ms
+    ):
+        return True
+
+    return random.random() < settings.access_log_sample_rate
+
+
+def _request_headers(settings: Settings, request: Request) -> dict[str, str]:
+    if "*" in settings.access_log_headers:
+        return dict(request.headers)
+
+    return {
+        name: request.headers[name]
+        for name in settings.access_log_headers
+        if name in request.headers
+    }
+
+
+def _reads_your_writes(settings: Settings) -> bool:
+    return settings.read_your_writes_window > 0 and len(settings.redis_read_urls) > 0
+
+
+def _wrote_recently(settings: Settings, request: Request) -> bool:
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+
+    return time() - last_write < settings.read_your_writes_window
+
+
+def _remember_write(settings: Settings, response: Response) -> None:
+    response.set_cookie(
+        LAST_WRITE_COOKIE,
+        str(time()),
+        max_age=math.ceil(settings.read_your_writes_window),
+        httponly=True,
+        samesite="lax",
+    )
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncIterator[None]:
     configure_logging()
+    settings = get_settings()
+
+    # The memory backend only talks to Redis for logs, so leave pools cold.
+    clients = [get_client()] if settings.todos_backend == "redis" else []
+
+    if settings.todos_backend == "redis" and not settings.redis_cluster:
+        clients.extend(get_client(url) for url in settings.redis_read_urls)
+
+    for client in clients:
+        try:
+            await warm_connection_pool(client, settings.redis_pool_warm_connections)
+        except Exception as exc:
+            logger.warning(f"Could not warm the Redis connection pool: {exc}")
+
     await todos_controller.initialize()
     yield
+    await todos_controller.shutdown()
+    flush_logging()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -33,37 +115,92 @@ logger = get_logger()
 async def request_logging_middleware(request: Request, call_next: Any) -> Any:
     start = perf_counter()
     status_code = 500
+    settings = get_settings()
+    set_request_deadline(settings.request_timeout)
+    http_requests_in_flight.inc()
+
+    if _reads_your_writes(settings):
+        read_from_primary.set(_wrote_recently(settings, request))
 
     try:
         response = await call_next(request)
         status_code = response.status_code
+
+        # Send this client's reads to the primary until replicas catch up.
+        if (
+            _reads_your_writes(settings)
+            and request.method not in READ_METHODS
+            and status_code < 400
+        ):
+            _remember_write(settings, response)
+
         return response
     finally:
-        duration_ms = round((perf_counter() - start) * 1000, 2)
-        client = request.client
-        logger.info(
-            "request completed",
-            extra={
-                "req": {
-                    "method": request.method,
-                    "url": str(request.url.path),
-                    "query": dict(request.query_params),
-                    "params": dict(request.path_params),
-                    "headers": dict(request.headers),
-                    "remoteAddress": client.host if client else None,
-                    "remotePort": client.port if client else None,
+        duration = perf_counter() - start
+        duration_ms = round(duration * 1000, 2)
+        # Label by route template, not path, to keep the series count bounded.
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        http_requests_in_flight.dec()
+        http_request_duration.observe(duration, request.method, route, str(status_code))
+
+        if status_code >= 500:
+            http_request_errors.inc(request.method, route)
+
+        # Only build the payload for requests that will actually be logged.
+        if logger.isEnabledFor(logging.INFO) and _should_log_request(
+            settings, status_code, duration_ms
+        ):
+            client = request.client
+            logger.info(
+                "request completed",
+                extra={
+                    "req": {
+                        "method": request.method,
+                        "url": str(request.url.path),
+                        "query": dict(request.query_params),
+                        "params": dict(request.path_params),
+                        "headers": _request_headers(settings, request),
+                        "remoteAddress": client.host if client else None,
+                        "remotePort": client.port if client else None,
+                    },
+                    "statusCode": status_code,
+                    "responseTime": duration_ms,
+                    "sampleRate": settings.access_log_sample_rate,
                 },
-                "statusCode": status_code,
-                "responseTime": duration_ms,
-            },
-        )
+            )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4",
+    )
 
 
 @app.exception_handler(ClientError)
 async def client_error_handler(_: Request, exc: ClientError) -> JSONResponse:
+    headers = None
+
+    if isinstance(exc, ServiceUnavailableError):
+        headers = {"Retry-After": str(math.ceil(exc.retry_after))}
+
     return JSONResponse(
         status_code=exc.status,
         content={"status": exc.status, "message": str(exc)},
+        headers=headers,
+    )
+
+
+@app.exception_handler(RedisConnectionError)
+@app.exception_handler(RedisTimeoutError)
+async def redis_unavailable_handler(request: Request, exc: Exception) -> JSONResponse:
+    logger.warning("Redis unavailable", extra={"error": str(exc)})
+    return await client_error_handler(
+        request,
+        ServiceUnavailableError(
+            "Service Unavailable", get_settings().circuit_breaker_reset_timeout
+        ),
     )
 
 
@@ -1,47 +1,351 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from time import perf_counter
+from typing import Any, TypeVar, cast
+
 from redis import Redis as SyncRedis
-from redis.asyncio import Redis
+from redis.asyncio import Redis, RedisCluster
+from redis.asyncio.client import Pipeline
+from redis.asyncio.cluster import ClusterPipeline
+from redis.asyncio.connection import BlockingConnectionPool, ConnectionPool
 from redis.backoff import ExponentialBackoff
+from redis.cluster import RedisCluster as SyncRedisCluster
 from redis.exceptions import ConnectionError, TimeoutError
-from redis.retry import Retry
 
-from app.config import get_settings
+from app.config import Settings, get_settings
+from app.metrics import (
+    Gauge,
+    LabelValues,
+    redis_command_duration,
+    redis_command_errors,
+    registry,
+)
+from app.resilience import BudgetedRetry, CircuitBreaker, RetryBudget, remaining_time
+
+T = TypeVar("T")
+RETRY_BACKOFF_BASE = 0.05
+# Weight of the newest sample in each client's moving average command latency.
+LATENCY_SMOOTHING = 0.2
+
+# Standalone or cluster clients, depending on the `REDIS_CLUSTER` setting.
+RedisClient = Redis | RedisCluster
+SyncRedisClient = SyncRedis | SyncRedisCluster
+
+async_clients: dict[str, RedisClient] = {}
+sync_clients: dict[str, SyncRedisClient] = {}
+
+
+async def guarded_call(
+    breaker: CircuitBreaker | None, do: Callable[[], Awaitable[T]]
+) -> T:
+    """Runs a Redis call within the request deadline and the circuit breaker"""
+    remaining = remaining_time()
+
+    if remaining is not None and remaining <= 0:
+        raise TimeoutError("Request deadline exceeded")
+
+    async def call() -> T:
+        if remaining is None:
+            return await do()
+
+        try:
+            async with asyncio.timeout(remaining):
+                return await do()
+        except asyncio.TimeoutError as exc:
+            raise TimeoutError("Request deadline exceeded") from exc
+
+    return await (call() if breaker is None else breaker.call(call))
+
+
+class InstrumentedPipeline(Pipeline):
+    breaker: CircuitBreaker | None = None
+
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        command = "MULTI" if self.is_transaction else "PIPELINE"
+        start = perf_counter()
+
+        try:
+            return await guarded_call(
+                self.breaker,
+                lambda: super(InstrumentedPipeline, self).execute(raise_on_error),
+            )
+        except Exception:
+            redis_command_errors.inc(command)
+            raise
+        finally:
+            redis_command_duration.observe(perf_counter() - start, command)
+
+
+class InstrumentedRedis(Redis):
+    """Records the latency and errors of every command in `app.metrics`, and
+    keeps a moving average of latency in `latency`.
+
+    Commands also run within the current request deadline and through `breaker`
+    when one is attached, so they fail fast while Redis is unhealthy.
+    """
+
+    breaker: CircuitBreaker | None = None
+    latency = 0.0
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        command = str(args[0]).upper()
+        start = perf_counter()
+
+        try:
+            return await guarded_call(
+                self.breaker,
+                lambda: super(InstrumentedRedis, self).execute_command(
+                    *args, **options
+                ),
+            )
+        except Exception:
+            redis_command_errors.inc(command)
+            raise
+        finally:
+            duration = perf_counter() - start
+            redis_command_duration.observe(duration, command)
+            self.latency += LATENCY_SMOOTHING * (duration - self.latency)
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: str | None = None
+    ) -> Pipeline:
+        pipeline = InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+        pipeline.breaker = self.breaker
+        return pipeline
+
+
+class InstrumentedClusterPipeline(ClusterPipeline):
+    breaker: CircuitBreaker | None = None
+
+    async def execute(
+        self, raise_on_error: bool = True, allow_redirections: bool = True
+    ) -> list[Any]:
+        command = "MULTI" if self._transaction else "PIPELINE"
+        start = perf_counter()
+
+        try:
+            return await guarded_call(
+                self.breaker,
+                lambda: super(InstrumentedClusterPipeline, self).execute(
+                    raise_on_error, allow_redirections
+                ),
+            )
+        except Exception:
+            redis_command_errors.inc(command)
+            raise
+        finally:
+            redis_command_duration.observe(perf_counter() - start, command)
+
+
+class InstrumentedRedisCluster(RedisCluster):
+    """`InstrumentedRedis` for cluster mode, where redis-py routes each command
+    to the node owning its key's slot"""
+
+    breaker: CircuitBreaker | None = None
+    latency = 0.0
+
+    async def execute_command(self, *args: Any, **kwargs: Any) -> Any:
+        command = str(args[0]).upper()
+        start = perf_counter()
+
+        try:
+            return await guarded_call(
+                self.breaker,
+                lambda: super(InstrumentedRedisCluster, self).execute_command(
+                    *args, **kwargs
+                ),
+            )
+        except Exception:
+            redis_command_errors.inc(command)
+            raise
+        finally:
+            duration = perf_counter() - start
+            redis_command_duration.observe(duration, command)
+            self.latency += LATENCY_SMOOTHING * (duration - self.latency)
+
+    def pipeline(
+        self, transaction: Any | None = None, shard_hint: Any | None = None
+    ) -> ClusterPipeline:
+        # Cluster transactions only work when every key maps to the same slot.
+        pipeline = InstrumentedClusterPipeline(self, transaction)  # type: ignore[abstract]
+        pipeline.breaker = self.breaker
+        return pipeline
+
+
+def sharded_keys(key: str, shards: int) -> list[str]:
+    """Names `shards` keys whose hash tags map them to different cluster slots"""
+    if shards <= 1:
+        return [key]
+
+    return [f"{key}:{{{shard}}}" for shard in range(shards)]
+
+
+def parse_stream_id(value: str) -> tuple[int, int]:
+    """Splits a stream entry ID into its milliseconds and sequence number, which
+    order the same way the IDs do"""
+    milliseconds, _, sequence = value.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
 
-async_clients: dict[str, Redis] = {}
-sync_clients: dict[str, SyncRedis] = {}
+def _pool_connections() -> Iterable[tuple[LabelValues, float]]:
+    for client in async_clients.values():
+        if isinstance(client, RedisCluster):
+            yield from _cluster_connections(client)
+            continue
+
+        pool = client.connection_pool
+        kwargs = pool.connection_kwargs
+        name = f"{kwargs.get('host')}:{kwargs.get('port')}/{kwargs.get('db', 0)}"
+        yield (name, "in_use"), len(getattr(pool, "_in_use_connections", ()))
+        yield (name, "available"), len(getattr(pool, "_available_connections", ()))
+        yield (name, "max"), pool.max_connections
+
+
+def _cluster_connections(client: RedisCluster) -> Iterable[tuple[LabelValues, float]]:
+    for node in client.get_nodes():
+        free = len(getattr(node, "_free", ()))
+        yield (node.name, "in_use"), len(getattr(node, "_connections", ())) - free
+        yield (node.name, "available"), free
+        yield (node.name, "max"), node.max_connections
+
+
+registry.register(
+    Gauge(
+        "redis_pool_connections",
+        "Redis connection pool connections by state.",
+        ("pool", "state"),
+        collect=_pool_connections,
+    )
+)
 
 
 def _resolve_url(url: str | None) -> str:
     return url if url is not None else get_settings().redis_url
 
 
-def get_client(url: str | None = None) -> Redis:
+def _connection_options(settings: Settings) -> dict[str, Any]:
+    return {
+        "decode_responses": True,
+        "socket_timeout": settings.redis_socket_timeout,
+        "socket_connect_timeout": settings.redis_socket_connect_timeout,
+        "socket_keepalive": settings.redis_socket_keepalive,
+        "health_check_interval": settings.redis_health_check_interval,
+    }
+
+
+def _async_options(settings: Settings) -> dict[str, Any]:
+    options = _connection_options(settings)
+    # Retries stop early when the shared budget or the request deadline runs out.
+    options["retry"] = BudgetedRetry(
+        ExponentialBackoff(
+            cap=settings.redis_retry_backoff_cap, base=RETRY_BACKOFF_BASE
+        ),
+        settings.redis_retries,
+        RetryBudget(settings.redis_retry_budget),
+    )
+    options["retry_on_error"] = [ConnectionError, TimeoutError, ConnectionResetError]
+    return options
+
+
+def create_connection_pool(url: str, settings: Settings) -> ConnectionPool:
+    """Builds the async pool for `url`, bounded and blocking if a size is set"""
+    options = _async_options(settings)
+
+    if settings.redis_pool_size is None:
+        return ConnectionPool.from_url(url, **options)
+
+    # A bounded pool that raised on exhaustion would turn bursts into errors,
+    # so callers wait up to `redis_pool_timeout` for a connection instead.
+    return BlockingConnectionPool.from_url(
+        url,
+        max_connections=settings.redis_pool_size,
+        timeout=settings.redis_pool_timeout,
+        **options,
+    )
+
+
+def create_cluster_client(url: str, settings: Settings) -> InstrumentedRedisCluster:
+    """Builds a cluster client that discovers the other nodes from `url`"""
+    options = _async_options(settings)
+
+    if settings.redis_pool_size is not None:
+        options["max_connections"] = settings.redis_pool_size
+
+    return cast(
+        InstrumentedRedisCluster, InstrumentedRedisCluster.from_url(url, **options)
+    )
+
+
+def get_client(url: str | None = None) -> RedisClient:
     redis_url = _resolve_url(url)
 
     if redis_url in async_clients:
         return async_clients[redis_url]
 
-    async_clients[redis_url] = Redis.from_url(
-        redis_url,
-        decode_responses=True,
-        retry=Retry(ExponentialBackoff(cap=10, base=1), 25),
-        retry_on_error=[ConnectionError, TimeoutError, ConnectionResetError],
-        health_check_interval=1,
+    settings = get_settings()
+    client: InstrumentedRedis | InstrumentedRedisCluster
+
+    if settings.redis_cluster:
+        client = create_cluster_client(redis_url, settings)
+    else:
+        pool = create_connection_pool(redis_url, settings)
+        client = cast(InstrumentedRedis, InstrumentedRedis.from_pool(pool))
+
+    client.breaker = CircuitBreaker(
+        settings.circuit_breaker_failures,
+        settings.circuit_breaker_reset_timeout,
     )
+    async_clients[redis_url] = client
 
     return async_clients[redis_url]
 
 
-def get_sync_client(url: str | None = None) -> SyncRedis:
+async def warm_connection_pool(client: RedisClient, count: int) -> None:
+    """Opens up to `count` pooled connections ahead of the first requests"""
+    if isinstance(client, RedisCluster):
+        # Discovering the cluster opens a connection to every node.
+        await client.initialize()
+        return
+
+    pool = client.connection_pool
+    count = min(count, pool.max_connections)
+
+    if count <= 0:
+        return
+
+    results = await asyncio.gather(
+        *(pool.get_connection() for _ in range(count)),
+        return_exceptions=True,
+    )
+    connections = [
+        result for result in results if not isinstance(result, BaseException)
+    ]
+
+    for connection in connections:
+        await pool.release(connection)
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+
+    if len(errors) > 0:
+        raise errors[0]
+
+
+def create_sync_client(url: str, settings: Settings) -> SyncRedisClient:
+    if settings.redis_cluster:
+        return SyncRedisCluster.from_url(url, **_connection_options(settings))
+
+    return SyncRedis.from_url(url, **_connection_options(settings))
+
+
+def get_sync_client(url: str | None = None) -> SyncRedisClient:
     redis_url = _resolve_url(url)
 
     if redis_url in sync_clients:
         return sync_clients[redis_url]
 
-    sync_clients[redis_url] = SyncRedis.from_url(
-        redis_url,
-        decode_responses=True,
-        health_check_interval=1,
-    )
+    sync_clients[redis_url] = create_sync_client(redis_url, get_settings())
 
     return sync_clients[redis_url]
 
@@ -0,0 +1,63 @@
+"""Routes reads to replicas while writes stay on the primary.
+
+Reads pick a replica per call, either in turn (`round_robin`) or by the lowest
+recent command latency (`least_latency`). Replicas whose circuit breaker is
+open are skipped, and the primary serves reads when none are left. Within a
+request that set `read_from_primary` (a client that wrote recently), reads go
+to the primary so they see that write.
+"""
+
+from contextvars import ContextVar
+from itertools import count
+
+from app.config import ReadStrategy
+from app.redis import RedisClient
+
+# With `least_latency`, every Nth read goes to a replica other than the fastest.
+# Averages only move when a replica serves a command, so without these probes
+# one slow sample would keep a replica from ever being picked again.
+LATENCY_PROBE_INTERVAL = 20
+
+read_from_primary: ContextVar[bool] = ContextVar("read_from_primary", default=False)
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        primary: RedisClient,
+        replicas: list[RedisClient] | None = None,
+        strategy: ReadStrategy = "round_robin",
+    ):
+        self.primary = primary
+        self.replicas = replicas or []
+        self.strategy = strategy
+        self._turns = count()
+
+    def _healthy(self, client: RedisClient) -> bool:
+        breaker = getattr(client, "breaker", None)
+        return breaker is None or breaker.state != "open" or breaker.retry_after() == 0
+
+    def reader(self) -> RedisClient:
+        if len(self.replicas) == 0 or read_from_primary.get():
+            return self.primary
+
+        healthy = [client for client in self.replicas if self._healthy(client)]
+
+        if len(healthy) == 0:
+            return self.primary
+
+        turn = next(self._turns)
+
+        if self.strategy == "least_latency":
+            # Replicas that have not served a command yet report 0 and go first.
+            fastest = min(healthy, key=lambda client: getattr(client, "latency", 0.0))
+            others = [client for client in healthy if client is not fastest]
+
+            if len(others) > 0 and turn % LATENCY_PROBE_INTERVAL == (
+                LATENCY_PROBE_INTERVAL - 1
+            ):
+                return others[turn // LATENCY_PROBE_INTERVAL % len(others)]
+
+            return fastest
+
+        return healthy[turn % len(healthy)]
@@ -0,0 +1,193 @@
+"""Keeps a Redis outage from tying up every request.
+
+- Each request carries a deadline (`request_deadline`) that bounds every Redis
+  call made on its behalf, retries and backoff included.
+- `RetryBudget` caps retries across the process to a fraction of commands, so a
+  blip does not multiply the load on a struggling server.
+- `CircuitBreaker` fails calls fast once Redis keeps failing, and lets a single
+  trial call through after a cool-down to detect recovery.
+"""
+
+from asyncio import sleep
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from time import monotonic
+from typing import Any, Literal, TypeVar
+
+from redis.asyncio.retry import Retry
+from redis.backoff import AbstractBackoff
+from redis.exceptions import ConnectionError, TimeoutError
+
+from app.errors import ServiceUnavailableError
+
+T = TypeVar("T")
+CircuitState = Literal["closed", "open", "half_open"]
+
+# Failures that say Redis is unreachable or unhealthy, as opposed to errors it
+# replied with (like a bad query), which mean it is up.
+UNHEALTHY_ERRORS: tuple[type[BaseException], ...] = (
+    ConnectionError,
+    TimeoutError,
+    OSError,
+)
+
+request_deadline: ContextVar[float | None] = ContextVar(
+    "request_deadline", default=None
+)
+
+
+def set_request_deadline(timeout: float | None) -> None:
+    request_deadline.set(None if timeout is None else monotonic() + timeout)
+
+
+def remaining_time() -> float | None:
+    """Seconds left before the current request's deadline, if it has one"""
+    deadline = request_deadline.get()
+    return None if deadline is None else deadline - monotonic()
+
+
+class RetryBudget:
+    """Token bucket that earns `ratio` of a retry per call, up to `reserve`"""
+
+    def __init__(self, ratio: float, reserve: float = 10.0):
+        self.ratio = ratio
+        self.reserve = reserve
+        self.tokens = reserve
+
+    def deposit(self) -> None:
+        self.tokens = min(self.reserve, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+
+class BudgetedRetry(Retry):
+    """Retries only while the budget and the request deadline allow it"""
+
+    def __init__(
+        self,
+        backoff: AbstractBackoff,
+        retries: int,
+        budget: RetryBudget,
+        supported_errors: tuple[type[Exception], ...] = (
+            ConnectionError,
+            TimeoutError,
+        ),
+    ):
+        super().__init__(backoff, retries, supported_errors)  # type: ignore[arg-type]
+        self.budget = budget
+
+    async def call_with_retry(
+        self,
+        do: Callable[[], Awaitable[T]],
+        fail: Callable[..., Any],
+        is_retryable: Callable[[Exception], bool] | None = None,
+        with_failure_count: bool = False,
+    ) -> T:
+        self._backoff.reset()
+        self.budget.deposit()
+        failures = 0
+
+        while True:
+            try:
+                return await do()
+            except self._supported_errors as error:
+                if is_retryable is not None and not is_retryable(error):
+                    raise
+
+                failures += 1
+
+                if with_failure_count:
+                    await fail(error, failures)
+                else:
+                    await fail(error)
+
+                if self._retries >= 0 and failures > self._retries:
+                    raise error
+
+                backoff = self._backoff.compute(failures)
+                remaining = remaining_time()
+
+                if remaining is not None and backoff >= remaining:
+                    raise error
+
+                if not self.budget.withdraw():
+                    raise error
+
+                if backoff > 0:
+                    await sleep(backoff)
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive unhealthy failures.
+
+    While open, calls raise `ServiceUnavailableError` without touching Redis.
+    Once `reset_timeout` seconds pass the breaker half-opens and lets one trial
+    call through: success closes it, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state: CircuitState = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - monotonic())
+
+    def before_call(self) -> None:
+        if self.state == "closed":
+            return
+
+        if self.state == "open":
+            if self.retry_after() > 0:
+                raise ServiceUnavailableError("Service Unavailable", self.retry_after())
+
+            self.state = "half_open"
+            self.trial_in_flight = False
+
+        if self.trial_in_flight:
+            raise ServiceUnavailableError("Service Unavailable", self.reset_timeout)
+
+        self.trial_in_flight = True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self.trial_in_flight = False
+
+    def record_failure(self, exc: BaseException) -> None:
+        if not isinstance(exc, Exception):
+            # Cancelled calls say nothing about Redis either way.
+            self.trial_in_flight = False
+            return
+
+        if not isinstance(exc, UNHEALTHY_ERRORS):
+            # Redis answered, so it is healthy even if the command failed.
+            self.record_success()
+            return
+
+        self.failures += 1
+        self.trial_in_flight = False
+
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = monotonic()
+
+    async def call(self, do: Callable[[], Awaitable[T]]) -> T:
+        self.before_call()
+
+        try:
+            result = await do()
+        except BaseException as exc:
+            self.record_failure(exc)
+            raise
+
+        self.record_success()
+        return result